@@ -22,6 +22,8 @@ from tsn_config_parser.tc_command import (
     show_qdisc,
     show_tc_egress_filters,
 )
+from tsn_config_parser.tc_backend import get_tc_backend
+from tsn_config_parser.tc_state import snapshot_interfaces
 from tsn_config_parser.universal_parser import UniversalParser
 
 if __name__ == "__main__":
@@ -183,8 +185,18 @@ if __name__ == "__main__":
                     f"Earliest: {t['earliest_transmit_offset']}, Latest: {t['latest_transmit_offset']}"
                 )
 
+    # Read the tc state of every talker interface once, before generating
+    states = snapshot_interfaces(
+        get_tc_backend(),
+        [
+            t["interface_name"]
+            for talkers in time_aware_vlan_talkers.values()
+            for t in talkers
+            if t.get("interface_name")
+        ],
+    )
     time_aware_vlan_commands = create_tc_filter_commands_for_time_aware_talkers(
-        time_aware_vlan_talkers
+        time_aware_vlan_talkers, states
     )
 
     print("\n=== Generated smart tc filter [TIME-AWARE] commands ===")
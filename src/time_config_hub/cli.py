@@ -58,19 +58,21 @@ def cli():
 @click.argument("config_file", type=click.Path(exists=True))
 @click.option("--interface", "-i", help="Network interface to configure")
 @click.option("--dry-run", is_flag=True, help="Show commands without executing")
+@click.option("--full", is_flag=True, help="Reset interfaces and re-program everything")
 @click.pass_context
-def apply(ctx, config_file: str, interface: Optional[str], dry_run: bool):
+def apply(ctx, config_file: str, interface: Optional[str], dry_run: bool, full: bool):
     """
     Apply TSN configuration from XML/YAML file.
 
     Example usage:
         tch apply /path/to/config.yaml -i eth0 --dry-run
-        tch apply /path/to/config.xml
+        tch apply /path/to/config.xml --full
 
     :param ctx: Click context object
     :param str config_file: Path to configuration file
     :param Optional[str] interface: Network interface to configure
     :param bool dry_run: Show commands without executing
+    :param bool full: Reset interfaces instead of applying only the changes
     :raises TSNConfigError: If configuration application fails
     """
     logger.info(f"Applying configuration from file: {config_file}")
@@ -87,7 +89,7 @@ def apply(ctx, config_file: str, interface: Optional[str], dry_run: bool):
         if dry_run:
             click.echo("DRY RUN MODE - No changes will be applied")
 
-        config_hub.apply_config(config_file, dry_run=dry_run)
+        config_hub.apply_config(config_file, dry_run=dry_run, full=full or None)
         result = True
 
     except TSNConfigError as e:
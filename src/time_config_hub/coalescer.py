@@ -0,0 +1,148 @@
+"""
+Event Coalescer Module for Time Config Hub.
+
+This module implements trailing-edge debouncing of file events:
+
+- Every event for a path restarts that path's quiet timer
+- The path fires once, with its latest event type, after it has been
+  quiet for ``interval`` seconds
+- A path that never goes quiet still fires ``max_delay`` seconds after
+  its first event
+- A path is forgotten as soon as it fired or was discarded, so state
+  only exists for paths with a pending event
+
+Interval and upper bound are set by ``General/DebounceInterval`` and
+``General/DebounceMaxDelay`` in ``tch_app.conf``.
+"""
+
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_DEBOUNCE_INTERVAL = 0.5  # seconds of quiet before firing
+DEFAULT_DEBOUNCE_MAX_DELAY = 5.0  # seconds after the first event at most
+
+
+@dataclass
+class _PendingEvent:
+    first: float
+    last: float
+    event_type: str
+
+
+class EventCoalescer:
+    """
+    Collapse bursts of events per path into one trailing call.
+
+    ``callback(path, event_type)`` is called from the coalescer thread.
+    """
+
+    def __init__(
+        self,
+        callback: Callable[[str, str], None],
+        interval: float = DEFAULT_DEBOUNCE_INTERVAL,
+        max_delay: float = DEFAULT_DEBOUNCE_MAX_DELAY,
+    ):
+        """
+        Initialize the coalescer and start its thread.
+
+        :param callback: Called with ``(path, event_type)`` once per burst
+        :param float interval: Quiet time before a path fires
+        :param float max_delay: Upper bound between the first event of a
+            burst and the call
+        """
+        self.callback = callback
+        self.interval = float(interval)
+        self.max_delay = max(float(max_delay), self.interval)
+        self._pending: Dict[str, _PendingEvent] = {}
+        self._closed = False
+        self._cond = threading.Condition()
+        self._thread = threading.Thread(
+            target=self._run, name="tch-coalescer", daemon=True
+        )
+        self._thread.start()
+
+    @property
+    def pending(self) -> int:
+        """Number of paths waiting to fire."""
+        with self._cond:
+            return len(self._pending)
+
+    def add(self, path: str, event_type: str) -> None:
+        """
+        Record an event for ``path``.
+
+        :param str path: File path
+        :param str event_type: Type of event (e.g. "created", "modified")
+        """
+        now = time.monotonic()
+        with self._cond:
+            entry = self._pending.get(path)
+            if entry is None:
+                self._pending[path] = _PendingEvent(now, now, event_type)
+            else:
+                logger.debug(f"Coalesced {event_type} event for: {path}")
+                entry.last = now
+                entry.event_type = event_type
+            self._cond.notify()
+
+    def discard(self, path: str) -> bool:
+        """
+        Drop the pending event of ``path``, if any.
+
+        :param str path: File path
+        :return: True if an event was pending
+        :rtype: bool
+        """
+        with self._cond:
+            return self._pending.pop(path, None) is not None
+
+    def close(self, flush: bool = True) -> None:
+        """
+        Stop the coalescer thread.
+
+        :param bool flush: Fire the pending events now instead of dropping them
+        """
+        with self._cond:
+            self._closed = True
+            if not flush:
+                self._pending.clear()
+            self._cond.notify()
+        self._thread.join()
+
+    def _due(self, entry: _PendingEvent) -> float:
+        return min(entry.last + self.interval, entry.first + self.max_delay)
+
+    def _take_due(self, now: float) -> Tuple[List[Tuple[str, str]], Optional[float]]:
+        """Remove the due paths; return them and the next deadline."""
+        fired = []
+        next_due = None
+        for path, entry in list(self._pending.items()):
+            due = self._due(entry)
+            if due <= now or self._closed:
+                fired.append((path, entry.event_type))
+                del self._pending[path]
+            elif next_due is None or due < next_due:
+                next_due = due
+        return fired, next_due
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                fired, next_due = self._take_due(time.monotonic())
+                while not fired:
+                    if self._closed:
+                        return
+                    timeout = None if next_due is None else next_due - time.monotonic()
+                    self._cond.wait(timeout)
+                    fired, next_due = self._take_due(time.monotonic())
+
+            for path, event_type in fired:
+                try:
+                    self.callback(path, event_type)
+                except Exception:
+                    logger.exception(f"Failed to dispatch {event_type} event: {path}")
@@ -461,6 +461,16 @@ def load_app_config() -> Dict[str, Any]:
         "Verbosity": False,
         "ConfigDirectory": "/etc/tch/tsn_configs",
         "ListeningFolder": [],
+        "TCBackend": "netlink",
+        "ApplyMode": "reconcile",
+        "InterfaceWorkers": 4,
+        "WatchWorkers": 4,
+        "WatchQueueDepth": 64,
+        "DebounceInterval": 0.5,
+        "DebounceMaxDelay": 5.0,
+        "ShutdownTimeout": 10.0,
+        "BaseTimeClock": "tai",
+        "BaseTimeLead": 1.0,
     }
 
     try:
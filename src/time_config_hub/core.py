@@ -13,28 +13,78 @@ The core module serves as the primary interface between the CLI
 and the underlying system configuration mechanisms.
 """
 
+import json
 import logging
+import os
+import re
+import threading
+from functools import partial
 from pathlib import Path
-from typing import Any, Dict, Iterable, List
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple, Type
 
 from time_config_hub.service_manager import ServiceManager
 from tsn_config_parser import UniversalParser
-from tsn_config_parser.tc_command import (
-    create_tc_filter_commands_for_non_time_aware_talkers,
-    create_tc_filter_commands_for_time_aware_talkers,
-    create_tc_qdisc_gcl_command,
-    reset_clsact_qdisc_interface,
-    reset_egress_filter_interface,
-    reset_root_qdisc_interface,
-    run_tc_command,
-    show_qdisc,
-    show_tc_egress_filters,
+from tsn_config_parser.parse_cache import parse_cache
+from tsn_config_parser.tc_backend import Qdisc, get_tc_backend
+from tsn_config_parser.tc_basetime import (
+    CLOCK_TAI,
+    DEFAULT_BASE_TIME_LEAD,
+    align_base_time,
+    read_clock_ns,
+)
+from tsn_config_parser.tc_gcl import GCLError, GCLLimits, Schedule
+from tsn_config_parser.tc_layout import (
+    MODE_SOFTWARE,
+    LayoutError,
+    QdiscLayout,
+    default_capabilities,
+    offload_mode,
+    plan_qdisc_layout,
+)
+from tsn_config_parser.tc_command import create_tc_qdisc_gcl_command
+from tsn_config_parser.tc_filters import compile_filters
+from tsn_config_parser.tc_reconcile import (
+    AppliedRecord,
+    DesiredInterface,
+    ReconcilePlan,
+    desired_from_commands,
+    plan_reconcile,
+    plan_software_filters,
+)
+from tsn_config_parser.tc_settle import (
+    LinkReset,
+    LinkState,
+    link_settled,
+    link_state,
+    wait_for_settle,
+)
+from tsn_config_parser.tc_state import (
+    InterfaceState,
+    plan_interface_reset,
+    snapshot_interface,
 )
 
-from .exceptions import TSNConfigError
+from .devices import Device
+from .exceptions import TCCommandError, TSNConfigError
+from .metrics import metrics
+from .utils.discovery import device_discovery
+from .scheduler import (
+    DEFAULT_INTERFACE_WORKERS,
+    InterfaceOutcome,
+    InterfaceScheduler,
+)
 
 logger = logging.getLogger(__name__)
 
+APPLY_MODE_RECONCILE = "reconcile"
+APPLY_MODE_REPLACE = "replace"
+
+# Record of what was last programmed, kept next to the configuration backups
+APPLIED_STATE_FILE = ".applied_state.json"
+
+_FLAGS_RE = re.compile(r"\bflags (\S+)")
+_applied_state_lock = threading.Lock()
+
 
 class TIMEConfigHub:
     """
@@ -43,6 +93,11 @@ class TIMEConfigHub:
     Handles configuration application, status retrieval, and reset operations
     for Time-Sensitive Networking (TSN) configurations.
     It should be stateless or hold minimal state only
+
+    The CLI creates one hub per command. The daemon keeps a single hub for
+    its lifetime (see :meth:`start` and :meth:`close`), shared by the
+    watcher workers, so the tc backend connection and the per-interface
+    device lookups are set up once.
     """
 
     def __init__(self, app_config: dict):
@@ -60,17 +115,84 @@ class TIMEConfigHub:
         self.verbose = app_config.get("General", {}).get("Verbosity")
         self.service_manager = ServiceManager()
 
+        # Parsed configuration files, shared with the watcher
+        self.parse_cache = parse_cache
+
+        # Netlink (or tc CLI fallback) backend used to read and change tc state
+        self.tc_backend = get_tc_backend(app_config.get("General", {}).get("TCBackend"))
+        # Device class per interface (None if not a known NIC), and the
+        # settle upper bound it declares
+        self._device_classes: Dict[str, Optional[Type[Device]]] = {}
+        self._settle_timeouts: Dict[str, float] = {}
+        # Interfaces whose kernel/driver rejected taprio full offload
+        self._no_full_offload: Set[str] = set()
+        # Interfaces whose NIC rejected hardware-only (skip_sw) filters
+        self._no_filter_offload: Set[str] = set()
+        # base-time: clock read ("tai" or "phc") and lead time in seconds
+        self.base_time_clock = (
+            app_config.get("General", {}).get("BaseTimeClock") or CLOCK_TAI
+        ).lower()
+        lead = app_config.get("General", {}).get("BaseTimeLead")
+        self.base_time_lead = (
+            DEFAULT_BASE_TIME_LEAD if lead is None else int(float(lead) * 1e9)
+        )
+        self.apply_mode = (
+            app_config.get("General", {}).get("ApplyMode") or APPLY_MODE_RECONCILE
+        ).lower()
+
+        # Independent interfaces are reset and programmed concurrently
+        self.scheduler = InterfaceScheduler(
+            app_config.get("General", {}).get("InterfaceWorkers")
+            or DEFAULT_INTERFACE_WORKERS
+        )
+
         # Ensure config directory exists
         self.config_dir.mkdir(parents=True, exist_ok=True)
 
         logger.debug(f"Time Config Hub initialized with config_dir: {self.config_dir}")
 
-    def apply_config(self, config_file: str, dry_run: bool = False):
+    def start(self) -> None:
+        """
+        Prepare the hub for a long-lived owner such as the daemon.
+
+        Drops what earlier runs may have cached, so configuration files and
+        devices are looked up afresh.
+        """
+        logger.debug("Starting Time Config Hub...")
+        self.config_dir.mkdir(parents=True, exist_ok=True)
+        self.parse_cache.invalidate()
+        device_discovery.invalidate()
+        self._device_classes.clear()
+        self._settle_timeouts.clear()
+        self._no_full_offload.clear()
+        self._no_filter_offload.clear()
+
+    def close(self) -> None:
+        """
+        Release the shared resources (tc backend connection).
+
+        The hub must not be used afterwards.
+        """
+        logger.debug("Closing Time Config Hub...")
+        self.tc_backend.close()
+        self._device_classes.clear()
+        self._settle_timeouts.clear()
+
+    def apply_config(
+        self, config_file: str, dry_run: bool = False, full: Optional[bool] = None
+    ):
         """
         Apply configuration from a file.
 
+        In ``reconcile`` mode (default) only the difference between the
+        desired and the installed tc state is programmed. In ``replace``
+        mode, or when ``full`` is True, interfaces are reset first and
+        programmed from scratch.
+
         :param str config_file: Path to configuration file (XML or YAML)
         :param bool dry_run: If True, show commands without executing
+        :param Optional[bool] full: Force (True) or disable (False) a full
+            reset and re-program; None follows the ``ApplyMode`` setting
         :return: True if successful, False otherwise
         :rtype: None
         :raises TSNConfigError: If configuration application fails
@@ -88,8 +210,18 @@ class TIMEConfigHub:
             # Extract stream configuration
             interfaces = ge_dict.get_interface_names()
             streams = ge_dict.get_stream_ids()
-            gcl = ge_dict.get_gate_control_entries_formatted()
-            logger.info(f"Interfaces: {interfaces}, Stream IDs: {streams}, gcl: {gcl}")
+            # Malformed gate control lists are refused before any tc call
+            try:
+                schedule = ge_dict.get_gate_schedule()
+                config_limits = ge_dict.get_gcl_limits()
+            except GCLError as e:
+                raise TSNConfigError(f"Invalid gate control list: {e}") from e
+            logger.info(
+                f"Interfaces: {interfaces}, Stream IDs: {streams}, "
+                f"gcl: {schedule.sched_entries}, cycle-time: {schedule.cycle_time}"
+            )
+            if schedule.merged:
+                logger.info(f"Merged {schedule.merged} adjacent gate control entries")
 
             # Validate interfaces
             for iface in interfaces:
@@ -98,27 +230,46 @@ class TIMEConfigHub:
                         f"Invalid or non-TSN-capable interface: {iface}"
                     )
 
-            # TODO: Use Device.from_interface to determine TSN capabilities
+            if full is None:
+                full = self.apply_mode == APPLY_MODE_REPLACE
 
-            # Reset existing configuration before applying new config
-            if not dry_run:
-                logger.info("Resetting existing TSN configuration on interfaces...")
-                self._reset_interfaces(interfaces)
-
-            # Apply qdisc and filter configurations
-            self._apply_qdisc_configuration(
-                interfaces=interfaces,
-                gcl=gcl,
-                config_file=config_file,
-                dry_run=dry_run,
+            # Generate qdisc and filter configurations
+            # Interfaces that rejected full offload or skip_sw filters
+            # before are planned without them right away
+            stored = self._load_applied_records()
+            self._no_full_offload.update(
+                iface for iface, r in stored.items() if r.offload_fallback
             )
+            self._no_filter_offload.update(
+                iface for iface, r in stored.items() if r.filter_offload_fallback
+            )
+            records = {} if full else stored
 
-            self._apply_filter_configuration(
-                interfaces=interfaces,
-                ge_dict=ge_dict,
-                config_file=config_file,
-                dry_run=dry_run,
+            base_time = self._plan_base_time(interfaces, schedule)
+            qdisc_cmds, fallback_cmds = self._generate_qdisc_commands(
+                interfaces, schedule, config_limits, base_time
             )
+            filter_cmds = self._generate_filter_commands(ge_dict, interfaces)
+            desired = desired_from_commands(qdisc_cmds, filter_cmds)
+            for iface in interfaces:
+                desired.setdefault(iface, DesiredInterface(iface))
+
+            # Each interface is reset (full mode), planned and programmed by its
+            # own job; independent interfaces run concurrently
+            outcomes = self.scheduler.run(
+                {
+                    iface: partial(
+                        self._apply_interface,
+                        desired[iface],
+                        records.get(iface),
+                        full,
+                        dry_run,
+                        fallback_cmds.get(iface),
+                    )
+                    for iface in desired
+                }
+            )
+            self._finish_apply(outcomes, config_file, dry_run)
 
         except TSNConfigError:
             logger.error(f"Failed to apply configuration: {config_file}")
@@ -136,7 +287,7 @@ class TIMEConfigHub:
         :rtype: UniversalParser
         :raises TSNConfigError: If parsing yields no documents
         """
-        uparser = UniversalParser()
+        uparser = UniversalParser(cache=self.parse_cache)
         docs = uparser.parse(config_file)
         if not docs:
             raise TSNConfigError("No valid configuration documents found.")
@@ -144,55 +295,126 @@ class TIMEConfigHub:
         return uparser
 
     def _reset_interfaces(self, interfaces: List[str]) -> None:
-        """Reset qdisc and filters for a list of interfaces."""
-        for interface in interfaces:
-            logger.info(f"Resetting qdisc and filters on interface: {interface}")
-            self.reset_config(interface)
+        """Reset qdisc and filters for a list of interfaces.
 
-    def _apply_qdisc_configuration(
-        self,
-        interfaces: List[str],
-        gcl: List[Any],
-        config_file: str,
-        dry_run: bool,
-    ) -> None:
-        """Generate and apply qdisc configuration."""
-        # Don't pass base_time -> defaults to current system time
-        # TODO: num_tc should be configurable according to device capabilities
-        # TODO: tc mapping and queues should be configurable
-        qdisc_cmds = create_tc_qdisc_gcl_command(
-            interfaces,
-            gcl,
-            num_tc=4,
-            map_str="0 0 0 0 1 1 2 3 0 0 0 0 0 0 0 0",
-            queues_str="1@0 1@1 1@2 1@3",
-        )
-        logger.debug(f"tc generated: {qdisc_cmds}")
+        Interfaces are reset concurrently by the interface scheduler.
 
-        fail_count = self._run_tc_commands(
-            qdisc_cmds,
-            dry_run=dry_run,
-            header="> Generated qdisc command:",
+        :param List[str] interfaces: Interfaces to reset
+        :raises TCCommandError: If any teardown step fails, with the errors
+            of every failed interface
+        """
+        outcomes = self.scheduler.run(
+            {iface: partial(self._reset_interface, iface) for iface in interfaces}
         )
+        self._update_applied_records({}, dropped=interfaces)
 
-        if dry_run:
-            logger.info("Dry-run enabled; skipping qdisc state display.")
-        else:
-            self.show_qdisc_state(interfaces)
+        failed = {
+            iface: [str(o.error)] if not o.ok else o.value
+            for iface, o in outcomes.items()
+            if not o.ok or o.value
+        }
+        if failed:
+            _raise_interface_failures("Failed to reset interfaces", failed)
 
-        if fail_count > 0:
-            raise TSNConfigError(f"Failed to apply qdisc config: {config_file}")
+    def _reset_interface(self, interface: str) -> List[str]:
+        """Reset qdisc and filters of one interface.
 
-        logger.info(f"qdisc configuration applied successfully: {config_file}")
+        The interface is read once and its teardown plan (at most two
+        steps) is executed in order.
+
+        :param str interface: Interface to reset
+        :return: One error message per failed teardown step
+        :rtype: List[str]
+        """
+        logger.info(f"Resetting qdisc and filters on interface: {interface}")
+        state = snapshot_interface(self.tc_backend, interface)
+        plan = plan_interface_reset(state)
+        if not plan:
+            logger.debug(f"Nothing to reset on {interface}")
+            return []
+
+        link_before = link_state(interface)
+        link_reset = _resets_offload(state, [step.command for step in plan])
+        result = self.tc_backend.execute_teardown(plan)
+
+        errors = []
+        for failure in result["failures"]:
+            errors.append(f"{failure['command']}: {failure['stderr']}")
+            logger.error(
+                f"Command failed at batch line {failure['line']}\n"
+                + f" command: {failure['command']}\n"
+                + f" stderr: {failure['stderr']}"
+            )
+
+        if not errors:
+            self._wait_for_settle(
+                interface,
+                link_before,
+                lambda qdiscs: InterfaceState(interface, qdiscs).is_reset,
+                operation="reset",
+                link_reset=link_reset,
+            )
+        return errors
 
-    def _apply_filter_configuration(
+    def _generate_qdisc_commands(
         self,
         interfaces: List[str],
-        ge_dict: Any,
-        config_file: str,
-        dry_run: bool,
-    ) -> None:
-        """Generate and apply tc filter configuration."""
+        schedule: Schedule,
+        config_limits: Optional[GCLLimits] = None,
+        base_time: Optional[int] = None,
+    ) -> Tuple[List[str], Dict[str, List[str]]]:
+        """Generate taprio/etf qdisc commands for all interfaces.
+
+        Each interface gets the layout its NIC can offload best.
+
+        :param interfaces: Interfaces to configure
+        :param Schedule schedule: Compiled gate control list
+        :param config_limits: Limits declared by the configuration itself
+        :param base_time: Common base-time of all interfaces
+        :return: The commands, and per interface planned in full-offload
+            mode the txtime-assist commands to fall back to
+        :raises TSNConfigError: If a NIC cannot run or offload the schedule
+        """
+        gcl = schedule.sched_entries
+        qdisc_cmds = []
+        fallback_cmds = {}
+        for iface in interfaces:
+            self._validate_schedule(iface, schedule, config_limits or GCLLimits())
+            layout = self._qdisc_layout(iface, gcl)
+            qdisc_cmds += create_tc_qdisc_gcl_command(
+                [iface],
+                gcl,
+                base_time=base_time,
+                **layout.command_args(),
+                **schedule.command_args(),
+            )
+            if layout.fallback is not None:
+                fallback_cmds[iface] = create_tc_qdisc_gcl_command(
+                    [iface],
+                    gcl,
+                    base_time=base_time,
+                    **layout.fallback.command_args(),
+                    **schedule.command_args(),
+                )
+        logger.debug(f"tc generated: {qdisc_cmds}")
+
+        for cmd in qdisc_cmds:
+            logger.info(f"> Generated qdisc command:\n{cmd}")
+
+        return qdisc_cmds, fallback_cmds
+
+    def _generate_filter_commands(
+        self, ge_dict: Any, interfaces: Iterable[str] = ()
+    ) -> List[str]:
+        """Generate tc filter commands for all VLAN-tagged talkers.
+
+        Rules of interfaces whose NIC offloads flower are hardware-only
+        (``skip_sw``).
+
+        :param ge_dict: Dictionary helper of the configuration
+        :param interfaces: Interfaces of the configuration
+        :return: The filter commands
+        """
         all_talker_info = ge_dict.get_all_talker_stream_info()
 
         # Extract talker info
@@ -205,84 +427,302 @@ class TIMEConfigHub:
             all_talker_info
         )
 
-        # Generate filter commands
-        time_aware_vlan_commands = create_tc_filter_commands_for_time_aware_talkers(
-            time_aware_vlan_talkers
-        )
-        non_time_aware_vlan_commands = (
-            create_tc_filter_commands_for_non_time_aware_talkers(vlan_non_time_aware)
+        # Talkers sharing a VLAN tag share their actions; duplicates are dropped
+        hw_offload = [iface for iface in interfaces if self._filter_offload(iface)]
+        rules = compile_filters(
+            time_aware_vlan_talkers, vlan_non_time_aware, hw_offload=hw_offload
         )
+        filter_cmds = [rule.command() for rule in rules]
 
-        # Run filter commands
-        logger.info("\n=== Generated smart tc filter [TIME-AWARE] commands ===")
-        fail_count = self._run_tc_commands(time_aware_vlan_commands, dry_run=dry_run)
+        logger.info("\n=== Generated smart tc filter commands ===")
+        for cmd in filter_cmds:
+            logger.info(cmd)
 
-        logger.info("\n=== Generated smart tc filter [NON-TIME-AWARE] commands ===")
-        fail_count += self._run_tc_commands(
-            non_time_aware_vlan_commands, dry_run=dry_run
-        )
+        return filter_cmds
 
-        if dry_run:
-            logger.info("Dry-run enabled; skipping egress filter state display.")
+    def _apply_interface(
+        self,
+        desired: DesiredInterface,
+        record: Optional[AppliedRecord],
+        full: bool,
+        dry_run: bool,
+        fallback_qdisc: Optional[List[str]] = None,
+    ) -> Tuple[ReconcilePlan, Dict[str, List[str]]]:
+        """Bring one interface to its desired tc state.
+
+        The qdisc commands of the plan are placed first in the interface's
+        ``tc -batch`` so that the taprio and clsact parents exist before
+        any filter is attached to them. An interface whose plan is empty
+        is left alone. If the kernel rejects a full-offload taprio and
+        ``fallback_qdisc`` is given, the qdisc tree is programmed again
+        with those (txtime-assist) commands.
+
+        :param DesiredInterface desired: Desired configuration
+        :param Optional[AppliedRecord] record: What was programmed last time
+        :param bool full: Reset the interface and program it from scratch
+        :param bool dry_run: If True, only log the commands
+        :param fallback_qdisc: Qdisc commands to use if full offload is
+            rejected
+        :return: The plan, and error messages keyed by section
+            (``reset``, ``qdisc`` or ``filter``)
+        :rtype: Tuple[ReconcilePlan, Dict[str, List[str]]]
+        """
+        iface = desired.interface
+        if full:
+            if not dry_run:
+                errors = self._reset_interface(iface)
+                if errors:
+                    return ReconcilePlan(iface), {"reset": errors}
+            state = InterfaceState(iface)
         else:
-            self._show_filter_state(interfaces)
+            state = snapshot_interface(self.tc_backend, iface)
+
+        plan = plan_reconcile(desired, state, record)
+        if plan.is_empty:
+            logger.info(f"{iface}: already up to date")
+        for cmd in plan.qdisc_commands + plan.filter_commands:
+            logger.info(f"{iface}: {cmd}")
+        if dry_run or plan.is_empty:
+            return plan, {}
+
+        link_before = link_state(iface)
+        failures = self._run_tc_batch(plan.qdisc_commands + plan.filter_commands)
+        sections = {
+            "qdisc": [f for f in failures if f["line"] <= len(plan.qdisc_commands)],
+            "filter": [f for f in failures if f["line"] > len(plan.qdisc_commands)],
+        }
+        if fallback_qdisc and _full_offload_rejected(sections["qdisc"]):
+            sections["qdisc"] = self._fall_back_from_full_offload(plan, fallback_qdisc)
+        if any(" skip_sw " in f["command"] for f in sections["filter"]):
+            sections["filter"] = self._fall_back_to_software_filters(
+                plan, sections["filter"]
+            )
 
-        if fail_count > 0:
-            raise TSNConfigError(f"Failed to apply filters config: {config_file}")
+        errors = {
+            section: [f"{f['command']}: {f['stderr']}" for f in section_failures]
+            for section, section_failures in sections.items()
+            if section_failures
+        }
+
+        plan.record.offload_fallback = iface in self._no_full_offload
+        plan.record.filter_offload_fallback = iface in self._no_filter_offload
+        if plan.qdisc_commands and not errors:
+            self._wait_for_settle(
+                iface,
+                link_before,
+                lambda qdiscs: any(q.is_root and q.kind == "taprio" for q in qdiscs),
+                operation="apply",
+                link_reset=_resets_offload(state, plan.qdisc_commands),
+            )
+        return plan, errors
 
-        logger.info(f"tc filter configuration applied successfully: {config_file}")
+    def _fall_back_from_full_offload(
+        self, plan: ReconcilePlan, fallback_qdisc: List[str]
+    ) -> List[Dict[str, Any]]:
+        """Replace a rejected full-offload qdisc tree by its fallback.
 
-    def _run_tc_commands(
-        self,
-        commands: Iterable[str],
-        dry_run: bool,
-        header: str = "",
-    ) -> int:
-        """Log and run a list of tc commands.
-
-        :param Iterable[str] commands: Commands to run
-        :param bool dry_run: If True, commands are logged but not executed
-        :param str header: Optional header prefix to log before each command
-        :return: Number of failed commands
-        :rtype: int
+        The plan is updated with the commands run and the record of the
+        fallback tree. Once the fallback succeeded, later applies plan the
+        interface without full offload directly.
+
+        :param ReconcilePlan plan: Plan whose full-offload taprio failed
+        :param fallback_qdisc: Qdisc commands of the fallback layout
+        :return: Failures of the fallback commands
+        :rtype: List[Dict[str, Any]]
         """
-        # TODO: create library for tc command under commands/tc_command.py
-        fail_count = 0
-        for cmd in commands:
-            if header:
-                logger.info(f"{header}\n{cmd}")
-            else:
-                logger.info(cmd)
+        iface = plan.interface
+        logger.warning(f"{iface}: taprio full offload rejected, trying txtime-assist")
+        fallback = desired_from_commands(fallback_qdisc, [])[iface]
+        state = snapshot_interface(self.tc_backend, iface)
+        commands = (
+            [f"tc qdisc del dev {iface} root"] if state.has_configured_root else []
+        )
+        commands += fallback.qdisc_commands
+
+        failures = self._run_tc_batch(commands)
+        plan.qdisc_commands += commands
+        if not failures:
+            self._no_full_offload.add(iface)
+            metrics.increment("taprio_offload_fallbacks", interface=iface)
+            plan.record.layout_key = fallback.layout_key
+            plan.record.schedule_key = fallback.schedule_key
+        return failures
+
+    def _fall_back_to_software_filters(
+        self, plan: ReconcilePlan, failures: List[Dict[str, Any]]
+    ) -> List[Dict[str, Any]]:
+        """Reprogram the skip_sw filters of an interface in software.
+
+        The plan is updated with the commands run and the software rules.
+        Once this succeeded, later applies plan the interface's filters in
+        software directly.
+
+        :param ReconcilePlan plan: Plan whose skip_sw filters were rejected
+        :param failures: Failed filter commands of the plan
+        :return: Failures left after the fallback
+        :rtype: List[Dict[str, Any]]
+        """
+        iface = plan.interface
+        logger.warning(f"{iface}: hardware filter offload rejected, using software")
+        commands, software = plan_software_filters(
+            iface, plan.record.filters, [f["command"] for f in failures]
+        )
+        others = [f for f in failures if " skip_sw " not in f["command"]]
+
+        fallback_failures = self._run_tc_batch(commands)
+        plan.filter_commands += commands
+        if not fallback_failures:
+            self._no_filter_offload.add(iface)
+            metrics.increment("filter_offload_fallbacks", interface=iface)
+            plan.record.filters = software
+        return others + fallback_failures
+
+    def _finish_apply(
+        self, outcomes: Dict[str, InterfaceOutcome], config_file: str, dry_run: bool
+    ) -> None:
+        """Record, display and report the result of every interface job.
+
+        The applied record is only updated for interfaces whose commands
+        all succeeded.
 
-            if dry_run:
-                # Skip execution in dry-run mode
+        :param outcomes: Outcome of :meth:`_apply_interface` per interface
+        :param str config_file: Configuration file, for messages
+        :param bool dry_run: If True, nothing was executed
+        :raises TCCommandError: If any interface failed, with the errors of
+            every failed interface
+        """
+        failed: Dict[str, Dict[str, List[str]]] = {}
+        applied: Dict[str, AppliedRecord] = {}
+        for iface, outcome in outcomes.items():
+            if not outcome.ok:
+                failed[iface] = {"error": [str(outcome.error)]}
                 continue
+            plan, errors = outcome.value
+            if errors:
+                failed[iface] = errors
+            elif not plan.is_empty:
+                applied[iface] = plan.record
 
-            result = run_tc_command(cmd)
-            if result["returncode"] != 0:
-                fail_count += 1
-                logger.error(
-                    f"Command failed with return code: {result['returncode']}\n"
-                    + f" command: {cmd}\n"
-                    + f" stderr: {result['stderr']}"
-                )
+        if dry_run:
+            logger.info("Dry-run enabled; skipping tc execution and state display.")
+            return
+
+        if not applied and not failed:
+            logger.info(f"tc configuration already applied: {config_file}")
+            return
+
+        self._update_applied_records(applied, dropped=list(failed))
+
+        touched = list(applied) + list(failed)
+        self.show_qdisc_state(touched)
+        self._show_filter_state(touched)
 
-        return fail_count
+        if failed:
+            errors = {
+                iface: [e for section in sections.values() for e in section]
+                for iface, sections in failed.items()
+            }
+            if any(set(sections) - {"filter"} for sections in failed.values()):
+                message = f"Failed to apply qdisc config: {config_file}"
+            else:
+                message = f"Failed to apply filters config: {config_file}"
+            _raise_interface_failures(message, errors)
+
+        logger.info(f"tc configuration applied successfully: {config_file}")
+
+    def _load_applied_records(self) -> Dict[str, AppliedRecord]:
+        """Load the per-interface record of what was last programmed.
+
+        A missing or unreadable file yields no record, which makes the
+        next apply re-program the interfaces.
+
+        :return: Records keyed by interface name
+        :rtype: Dict[str, AppliedRecord]
+        """
+        path = self.config_dir / APPLIED_STATE_FILE
+        with _applied_state_lock:
+            try:
+                data = json.loads(path.read_text())
+            except FileNotFoundError:
+                return {}
+            except (OSError, ValueError) as e:
+                logger.warning(f"Ignoring unreadable applied state {path}: {e}")
+                return {}
+        return {iface: AppliedRecord.from_dict(rec) for iface, rec in data.items()}
+
+    def _update_applied_records(
+        self, records: Dict[str, AppliedRecord], dropped: Iterable[str] = ()
+    ) -> None:
+        """Store records for some interfaces and forget others.
+
+        :param records: New records keyed by interface name
+        :param dropped: Interfaces whose record is no longer trustworthy
+        """
+        path = self.config_dir / APPLIED_STATE_FILE
+        with _applied_state_lock:
+            try:
+                data = json.loads(path.read_text())
+            except (OSError, ValueError):
+                data = {}
+            for iface in dropped:
+                data.pop(iface, None)
+            data.update({iface: rec.to_dict() for iface, rec in records.items()})
+
+            tmp = path.with_name(path.name + ".tmp")
+            try:
+                tmp.write_text(json.dumps(data, indent=2, sort_keys=True))
+                os.replace(tmp, path)
+            except OSError as e:
+                logger.warning(f"Could not store applied state {path}: {e}")
+
+    def _run_tc_batch(self, commands: List[str]) -> List[Dict[str, Any]]:
+        """Run commands with the tc backend batch and log every failure.
+
+        :param List[str] commands: Commands to run
+        :return: One ``{"line", "command", "stderr"}`` dict per failed command
+        :rtype: List[Dict[str, Any]]
+        """
+        if not commands:
+            return []
+
+        result = self.tc_backend.run_batch(commands)
+        failures = result["failures"]
+
+        if result["returncode"] != 0 and not failures:
+            # tc itself could not run (e.g. sudo/tc missing): nothing was applied
+            failures = [
+                {"line": i, "command": cmd, "stderr": result["stderr"]}
+                for i, cmd in enumerate(commands, start=1)
+            ]
+
+        for failure in failures:
+            logger.error(
+                f"Command failed at batch line {failure['line']}\n"
+                + f" command: {failure['command']}\n"
+                + f" stderr: {failure['stderr']}"
+            )
+
+        return failures
 
     def show_qdisc_state(self, interfaces: Iterable[str]) -> None:
         """Show qdisc state for all interfaces."""
-        for iface in interfaces:
-            logger.info(f"> qdisc state for {iface}:")
-            qdisc_state = show_qdisc(iface)
-            logger.info(qdisc_state["stdout"].strip())
-            logger.info("-" * 40)
+        self._show_state(interfaces, "qdisc state", self.tc_backend.get_qdiscs)
 
     def _show_filter_state(self, interfaces: Iterable[str]) -> None:
         """Show egress filter state for all interfaces."""
-        for iface in interfaces:
-            logger.info(f"> tc egress filters for {iface}:")
-            filter_state = show_tc_egress_filters(iface)
-            logger.info(filter_state["stdout"].strip())
+        self._show_state(interfaces, "tc egress filters", self.tc_backend.get_filters)
+
+    def _show_state(
+        self, interfaces: Iterable[str], title: str, read: Callable[[str], List[Any]]
+    ) -> None:
+        """Read the state of the interfaces concurrently, then log it in order."""
+        outcomes = self.scheduler.run(
+            {iface: partial(read, iface) for iface in interfaces}
+        )
+        for iface, outcome in outcomes.items():
+            logger.info(f"> {title} for {iface}:")
+            for entry in outcome.value if outcome.ok else []:
+                logger.info(str(entry))
             logger.info("-" * 40)
 
     def _log_time_aware_vlan_talkers(
@@ -316,15 +756,25 @@ class TIMEConfigHub:
         :raises TSNConfigError: If status retrieval fails
         """
         try:
-            qdisc_state = show_qdisc(interface)
-            logger.debug(f"qdisc state: {qdisc_state}")
+            qdiscs = self.tc_backend.get_qdiscs(interface)
+            logger.debug(f"qdisc state: {qdiscs}")
 
-            filter_state = show_tc_egress_filters(interface)
-            logger.debug(f"egress filter state: {filter_state}")
+            filters = self.tc_backend.get_filters(interface)
+            logger.debug(f"egress filter state: {filters}")
 
+            taprio = next((q for q in qdiscs if q.is_root and q.kind == "taprio"), None)
             status = {
-                "qdisc": qdisc_state["stdout"].strip(),
-                "egress_filters": filter_state["stdout"].strip(),
+                "qdisc": "\n".join(str(q) for q in qdiscs),
+                "egress_filters": "\n".join(str(f) for f in filters),
+                # full-offload, txtime-assist or software
+                "offload_mode": (
+                    offload_mode(taprio.options.get("flags")) if taprio else ""
+                ),
+                # in_hw / not_in_hw of every egress filter
+                "filter_offload": "\n".join(
+                    f"chain {f.chain} pref {f.pref}: {_offload_state(f.in_hw)}"
+                    for f in filters
+                ),
             }
             return status
 
@@ -342,17 +792,7 @@ class TIMEConfigHub:
         :raises TSNConfigError: If configuration reset fails
         """
         try:
-            results = []
-            results.append(reset_egress_filter_interface(interface))
-            results.append(reset_clsact_qdisc_interface(interface))
-            results.append(reset_root_qdisc_interface(interface))
-
-            for res in results:
-                if res["returncode"] != 0:
-                    raise TSNConfigError(
-                        f"Failed to reset qdisc on interface {interface}: "
-                        f"{res['stderr']}"
-                    )
+            self._reset_interfaces([interface])
             logger.info(
                 f"TSN configuration reset successfully for interface: {interface}"
             )
@@ -362,29 +802,206 @@ class TIMEConfigHub:
             logger.exception("Failed to reset configuration")
             raise TSNConfigError("Failed to reset configuration") from e
 
+    def _device_class(self, interface: str) -> Optional[Type[Device]]:
+        """Return the Device class of the interface's NIC, if it is a known one.
+
+        :param str interface: Network interface name
+        :return: Device subclass, or None
+        :rtype: Optional[Type[Device]]
+        """
+        if interface not in self._device_classes:
+            try:
+                device_cls = type(Device.from_interface(interface))
+            except Exception:
+                logger.debug(f"No device class for {interface}")
+                device_cls = None
+            self._device_classes[interface] = device_cls
+
+        return self._device_classes[interface]
+
+    def _plan_base_time(self, interfaces: List[str], schedule: Schedule) -> int:
+        """Return the base-time shared by all interfaces of an apply.
+
+        The first cycle boundary (``admin-base-time`` plus a multiple of the
+        cycle time, on the TAI timescale) at least ``BaseTimeLead`` ahead.
+
+        :param interfaces: Interfaces of the apply; the PHC of the first is
+            read if ``BaseTimeClock`` is "phc"
+        :param Schedule schedule: Compiled gate control list
+        :return: Base-time in nanoseconds
+        :rtype: int
+        """
+        now = read_clock_ns(self.base_time_clock, interfaces[0] if interfaces else None)
+        base_time = align_base_time(
+            now, schedule.cycle_time, self.base_time_lead, schedule.base_time
+        )
+        logger.info(
+            f"base-time {base_time} ({(base_time - now) / 1e6:.3f} ms ahead, "
+            f"phase {schedule.base_time % schedule.cycle_time} ns)"
+        )
+        return base_time
+
+    def _filter_offload(self, interface: str) -> bool:
+        """Whether the interface's filters are planned hardware-only.
+
+        :param str interface: Network interface name
+        :return: True if the NIC declares flower offload and has not
+            rejected it before
+        :rtype: bool
+        """
+        device_cls = self._device_class(interface)
+        return (
+            device_cls is not None
+            and device_cls.FLOWER_OFFLOAD
+            and interface not in self._no_filter_offload
+        )
+
+    def _validate_schedule(
+        self, interface: str, schedule: Schedule, config_limits: GCLLimits
+    ) -> None:
+        """Check the schedule against the limits of the interface's NIC.
+
+        :param str interface: Network interface name
+        :param Schedule schedule: Compiled gate control list
+        :param GCLLimits config_limits: Limits declared by the configuration
+        :raises TSNConfigError: If a limit is exceeded
+        """
+        device_cls = self._device_class(interface)
+        limits = config_limits
+        if device_cls is not None:
+            limits = limits.merge(device_cls.gcl_limits())
+        try:
+            schedule.validate(limits)
+        except GCLError as e:
+            name = device_cls.NAME if device_cls else "NIC"
+            raise TSNConfigError(f"{interface} ({name}): {e}") from e
+
+    def _qdisc_layout(self, interface: str, gcl: List[str]) -> QdiscLayout:
+        """Plan the qdisc layout from the capabilities of the interface's NIC.
+
+        NICs without a Device class get the default (txtime-assist) layout,
+        with one traffic class per discovered transmit queue.
+
+        :param str interface: Network interface name
+        :param gcl: Gate control list entries
+        :return: Layout to program
+        :rtype: QdiscLayout
+        :raises TSNConfigError: If the NIC cannot offload the schedule
+        """
+        device_cls = self._device_class(interface)
+        if device_cls is None:
+            try:
+                num_tx_queues = device_discovery.get(interface).num_tx_queues
+            except KeyError as e:
+                raise TSNConfigError(f"Interface {interface} does not exist") from e
+            logger.warning(
+                f"{interface}: unknown NIC, using the default qdisc layout on "
+                f"{num_tx_queues} transmit queues"
+            )
+            caps = default_capabilities(num_tx_queues)
+        else:
+            caps = device_cls.offload_capabilities()
+
+        try:
+            layout = plan_qdisc_layout(
+                caps, gcl, allow_full_offload=interface not in self._no_full_offload
+            )
+        except LayoutError as e:
+            name = device_cls.NAME if device_cls else "NIC"
+            raise TSNConfigError(f"{interface} ({name}): {e}") from e
+
+        logger.info(
+            f"{interface}: {layout.mode} layout, {layout.num_tc} traffic classes, "
+            f"ETF on classes {layout.etf_classes}"
+        )
+        return layout
+
+    def _settle_timeout(self, interface: str) -> float:
+        """Return the settle upper bound declared by the interface's Device class.
+
+        :param str interface: Network interface name
+        :return: Upper bound in seconds
+        :rtype: float
+        """
+        if interface not in self._settle_timeouts:
+            device_cls = self._device_class(interface)
+            if device_cls is None:
+                logger.debug(f"No device class for {interface}; default settle bound")
+            self._settle_timeouts[interface] = (device_cls or Device).SETTLE_TIMEOUT
+
+        return self._settle_timeouts[interface]
+
+    def _wait_for_settle(
+        self,
+        interface: str,
+        link_before: LinkState,
+        expect: Callable[[List[Qdisc]], bool],
+        operation: str,
+        link_reset: bool = False,
+    ) -> float:
+        """Wait until ``interface`` shows the expected qdiscs and its link is back.
+
+        If the change reconfigured offload (``link_reset``) on a NIC whose
+        driver then resets the link, the link must first go down and then
+        come back up; otherwise a link that kept its carrier is settled. The
+        time actually waited is recorded as the ``tc_settle_seconds`` metric.
+
+        :param str interface: Network interface name
+        :param LinkState link_before: Link state before the change
+        :param expect: Predicate over the interface qdiscs
+        :param str operation: Label for the metric (``apply`` or ``reset``)
+        :param bool link_reset: The change deleted the root taprio or changed
+            its offload mode, see :func:`_resets_offload`
+        :return: Seconds waited
+        :rtype: float
+        """
+        device_cls = self._device_class(interface)
+        if link_reset and device_cls is not None and device_cls.LINK_RESET_ON_OFFLOAD:
+            link_probe = LinkReset(interface, link_before)
+        else:
+            link_probe = partial(link_settled, interface, link_before.carrier)
+
+        def probe() -> bool:
+            # The link is polled every time so a short drop is not missed
+            link_back = link_probe()
+            return expect(self.tc_backend.get_qdiscs(interface)) and link_back
+
+        waited = wait_for_settle(probe, self._settle_timeout(interface))
+        metrics.observe(
+            "tc_settle_seconds", waited, interface=interface, operation=operation
+        )
+        logger.debug(f"{interface} settled after {operation} in {waited:.3f}s")
+        return waited
+
     def _validate_interface(self, interface: str) -> bool:
         """
         Validate that network interface exists and is TSN-capable.
 
+        The interface is resolved through the discovery map; taprio needs a
+        multiqueue device, so interfaces with a single transmit queue are
+        refused.
+
         :param str interface: Network interface name to validate
         :return: True if interface is valid and TSN-capable
         :rtype: bool
         """
         try:
-            # Check if interface exists
-            iface_path = Path(f"/sys/class/net/{interface}")
-            if not iface_path.exists():
-                logger.error(f"Interface {interface} does not exist.")
-                return False
-
-            # TODO: Additional TSN capability checks could be added here
-            # For now, we assume any interface can be used
-            return True
-
+            info = device_discovery.get(interface)
+        except KeyError:
+            logger.error(f"Interface {interface} does not exist.")
+            return False
         except Exception:
             logger.exception(f"Interface validation failed for {interface}")
             return False
 
+        if info.num_tx_queues < 2:
+            logger.error(
+                f"Interface {interface} has {info.num_tx_queues} transmit queue(s); "
+                "taprio needs a multiqueue device."
+            )
+            return False
+        return True
+
     def file_event_handler(self, event_type: str, file_path: str):
         """
         Handle file system events, such as configuration file changes.
@@ -417,3 +1034,54 @@ class TIMEConfigHub:
                 raise
 
         return
+
+
+def _offload_state(in_hw: Optional[bool]) -> str:
+    if in_hw is None:
+        return "unknown"
+    return "in_hw" if in_hw else "not_in_hw"
+
+
+def _resets_offload(state: InterfaceState, qdisc_commands: List[str]) -> bool:
+    """True if the commands delete the root taprio or change its offload mode.
+
+    Only those make a NIC with ``LINK_RESET_ON_OFFLOAD`` reset its link; a
+    clsact change or a new schedule for an unchanged layout do not.
+
+    :param InterfaceState state: Snapshot taken before the commands
+    :param qdisc_commands: Qdisc commands run on the interface
+    :rtype: bool
+    """
+    root = state.root
+    if root is None or root.kind != "taprio":
+        installed = MODE_SOFTWARE
+    else:
+        installed = offload_mode(root.options.get("flags"))
+
+    for cmd in qdisc_commands:
+        if cmd == f"tc qdisc del dev {state.interface} root":
+            if root is not None and root.kind == "taprio":
+                return True
+        elif " taprio" in cmd:
+            match = _FLAGS_RE.search(cmd)
+            if offload_mode(match.group(1) if match else None) != installed:
+                return True
+    return False
+
+
+def _full_offload_rejected(failures: List[Dict[str, Any]]) -> bool:
+    """True if a full-offload taprio command is among the failed commands."""
+    return any(
+        " taprio" in f["command"] and "flags 0x2" in f["command"] for f in failures
+    )
+
+
+def _raise_interface_failures(message: str, failures: Dict[str, List[str]]) -> None:
+    """Raise a :class:`TCCommandError` that lists the errors of each interface.
+
+    :param str message: Summary of the failed operation
+    :param failures: Error messages keyed by interface name
+    :raises TCCommandError: Always
+    """
+    details = "; ".join(f"{i}: {', '.join(e)}" for i, e in failures.items())
+    raise TCCommandError(f"{message} ({details})", failures=failures)
@@ -2,16 +2,28 @@
 
 This module provides a base Device class for network device implementations.
 All device-specific subclasses must define VALID_PCI_IDS as a list of supported
-PCI ID strings in the format 'VENDOR:DEVICE' (e.g., '8086:125B').
+PCI ID strings in the format 'VENDOR:DEVICE' (e.g., '8086:125B'). Subclasses
+register these IDs when they are defined, so resolving a PCI ID to its class
+is a dictionary lookup.
 """
 
 import logging
-from typing import List, Type
+import threading
+from importlib import import_module
+from typing import Dict, List, Optional, Tuple, Type
 
-from ..utils.pci_utils import PCIUtils
+from tsn_config_parser.tc_gcl import GCLLimits
+from tsn_config_parser.tc_layout import OffloadCapabilities
+
+from ..utils.discovery import device_discovery
 
 logger = logging.getLogger(__name__)
 
+# Device class per normalized PCI ID, filled by Device.__init_subclass__
+_registry: Dict[str, Type["Device"]] = {}
+_modules_loaded = False
+_modules_lock = threading.Lock()
+
 
 class Device:
     """Base class for network device implementations.
@@ -24,12 +36,64 @@ class Device:
     :type NUM_TX_QUEUES: int
     :ivar NUM_RX_QUEUES: Number of receive queues supported by the device
     :type NUM_RX_QUEUES: int
+    :ivar SETTLE_TIMEOUT: Upper bound in seconds to wait for the device to settle
+        after its tc configuration changed
+    :type SETTLE_TIMEOUT: float
+    :ivar LINK_RESET_ON_OFFLOAD: The driver resets the adapter, dropping the
+        link, when taprio/etf offload is (re)configured; settling then waits
+        for the link to go down and come back
+    :type LINK_RESET_ON_OFFLOAD: bool
+    :ivar TAPRIO_FULL_OFFLOAD: The NIC executes the taprio gate control list
+        (taprio ``flags 0x2``)
+    :type TAPRIO_FULL_OFFLOAD: bool
+    :ivar TAPRIO_TXTIME_ASSIST: taprio may run in txtime-assist mode
+        (``flags 0x1``)
+    :type TAPRIO_TXTIME_ASSIST: bool
+    :ivar ETF_OFFLOAD: ETF qdiscs can be offloaded (LaunchTime)
+    :type ETF_OFFLOAD: bool
+    :ivar LAUNCH_TIME_QUEUES: Transmit queues supporting per-packet launch time
+    :type LAUNCH_TIME_QUEUES: Tuple[int, ...]
+    :ivar FLOWER_OFFLOAD: The NIC offloads egress flower filters with their
+        VLAN push and skbedit actions (``skip_sw``)
+    :type FLOWER_OFFLOAD: bool
+    :ivar GCL_MAX_ENTRIES: Maximum number of gate control list entries, None if
+        unlimited
+    :type GCL_MAX_ENTRIES: Optional[int]
+    :ivar GCL_MIN_INTERVAL: Shortest gate control list interval in nanoseconds,
+        None if unlimited
+    :type GCL_MIN_INTERVAL: Optional[int]
     """
 
     NAME: str = "GenericDevice"
     VALID_PCI_IDS: List[str]  # Must be overridden in subclasses
     NUM_TX_QUEUES = 1
     NUM_RX_QUEUES = 1
+    SETTLE_TIMEOUT = 1.0
+    LINK_RESET_ON_OFFLOAD = False
+    TAPRIO_FULL_OFFLOAD = False
+    TAPRIO_TXTIME_ASSIST = True
+    ETF_OFFLOAD = False
+    LAUNCH_TIME_QUEUES: Tuple[int, ...] = ()
+    FLOWER_OFFLOAD = False
+    GCL_MAX_ENTRIES: Optional[int] = None
+    GCL_MIN_INTERVAL: Optional[int] = None
+
+    def __init_subclass__(cls, **kwargs):
+        """Register the PCI IDs the subclass declares itself.
+
+        :raises ValueError: if a PCI ID is malformed or already registered by
+            another class
+        """
+        super().__init_subclass__(**kwargs)
+        for pci_id in cls.__dict__.get("VALID_PCI_IDS", []):
+            key = _normalize_pci_id(pci_id)
+            owner = _registry.get(key)
+            if owner is not None and owner.__qualname__ != cls.__qualname__:
+                raise ValueError(
+                    f"PCI ID {key} of {cls.__name__} is already "
+                    f"registered by {owner.__name__}"
+                )
+            _registry[key] = cls
 
     def __init__(self, interface: str):
         """Initialize a Device instance.
@@ -132,6 +196,20 @@ class Device:
         """
         return self.__str__()
 
+    def _discovered(self, field: str) -> str:
+        """Return ``field`` of the interface's entry in the discovery map.
+
+        :param str field: :class:`~time_config_hub.utils.discovery.NetDeviceInfo`
+            attribute name
+        :return: Field value
+        :rtype: str
+        :raises RuntimeError: if the interface is not a PCI device
+        """
+        value = getattr(device_discovery.get(self.interface), field)
+        if value is None:
+            raise RuntimeError(f"Interface {self.interface} is not a PCI device")
+        return value
+
     @property
     def bus_info(self) -> str:
         """Lazy-loaded bus information.
@@ -142,7 +220,7 @@ class Device:
         """
         if self._bus_info is None:
             try:
-                self._bus_info = PCIUtils.get_bus_address(self.interface)
+                self._bus_info = self._discovered("bus_address")
                 logger.debug(f"Cached bus info for {self.interface}: {self._bus_info}")
             except Exception as e:
                 logger.error(f"Failed to get bus info for {self.interface}: {e}")
@@ -161,7 +239,7 @@ class Device:
         """
         if self._vendor_id is None:
             try:
-                self._vendor_id = PCIUtils.get_vendor_id(self.interface)
+                self._vendor_id = self._discovered("vendor_id")
                 logger.debug(
                     f"Cached vendor ID for {self.interface}: {self._vendor_id}"
                 )
@@ -182,7 +260,7 @@ class Device:
         """
         if self._device_id is None:
             try:
-                self._device_id = PCIUtils.get_device_id(self.interface)
+                self._device_id = self._discovered("device_id")
                 logger.debug(
                     f"Cached device ID for {self.interface}: {self._device_id}"
                 )
@@ -210,6 +288,32 @@ class Device:
                 f"Could not compute PCI ID for interface {self.interface}"
             ) from e
 
+    @classmethod
+    def offload_capabilities(cls) -> OffloadCapabilities:
+        """Capabilities used to plan the qdisc layout of the device.
+
+        :return: Offload capabilities declared by the device class
+        :rtype: OffloadCapabilities
+        """
+        return OffloadCapabilities(
+            num_tx_queues=cls.NUM_TX_QUEUES,
+            taprio_full_offload=cls.TAPRIO_FULL_OFFLOAD,
+            taprio_txtime_assist=cls.TAPRIO_TXTIME_ASSIST,
+            etf_offload=cls.ETF_OFFLOAD,
+            launch_time_queues=tuple(cls.LAUNCH_TIME_QUEUES),
+        )
+
+    @classmethod
+    def gcl_limits(cls) -> GCLLimits:
+        """Gate control list limits of the device.
+
+        :return: Limits declared by the device class
+        :rtype: GCLLimits
+        """
+        return GCLLimits(
+            max_entries=cls.GCL_MAX_ENTRIES, min_interval=cls.GCL_MIN_INTERVAL
+        )
+
     @classmethod
     def _get_device_class_by_pci_id(cls, pci_id: str) -> Type["Device"]:
         """Helper method to retrieve the device class for a given PCI ID.
@@ -220,56 +324,17 @@ class Device:
         :raises ValueError: if PCI ID format is invalid
         :raises NameError: if the PCI ID is not recognized by any device class
         """
-        if not pci_id or not pci_id.strip():
-            raise ValueError("PCI ID cannot be empty")
-
-        pci_id = pci_id.strip().upper()
-
-        # Validate PCI ID format
-        if ":" not in pci_id:
-            raise ValueError(
-                f"Invalid PCI ID format: {pci_id}. Expected format: VENDOR:DEVICE"
-            )
-
-        parts = pci_id.split(":")
-        if len(parts) != 2:
-            raise ValueError(
-                f"Invalid PCI ID format: {pci_id}. Expected format: VENDOR:DEVICE"
-            )
-
-        vendor, device = parts
-        if not vendor or not device:
-            raise ValueError(
-                f"Invalid PCI ID format: {pci_id}. "
-                "Vendor and device parts cannot be empty"
-            )
-
+        pci_id = _normalize_pci_id(pci_id)
         logger.debug(f"Looking for device class for PCI ID: {pci_id}")
 
-        device_classes: List[Type[Device]] = cls.__subclasses__()
-
-        if not device_classes:
-            logger.warning("No device subclasses found")
-
-        for device_class in device_classes:
-            if not hasattr(device_class, "VALID_PCI_IDS"):
-                logger.warning(
-                    f"Device class {device_class.__name__} "
-                    "missing VALID_PCI_IDS attribute"
-                )
-                continue
-
-            if pci_id in device_class.VALID_PCI_IDS:
-                logger.debug(f"Found matching device class: {device_class.__name__}")
-                return device_class
-
-        available_ids = []
-        for device_class in device_classes:
-            if hasattr(device_class, "VALID_PCI_IDS"):
-                available_ids.extend(device_class.VALID_PCI_IDS)
+        _load_device_modules()
+        device_class = _registry.get(pci_id)
+        if device_class is not None and issubclass(device_class, cls):
+            logger.debug(f"Found matching device class: {device_class.__name__}")
+            return device_class
 
         logger.error(
-            f"Unrecognized PCI ID: {pci_id}. Available PCI IDs: {available_ids}"
+            f"Unrecognized PCI ID: {pci_id}. Available PCI IDs: {sorted(_registry)}"
         )
         raise NameError(f"Unrecognized PCI ID: {pci_id}")
 
@@ -291,7 +356,7 @@ class Device:
         logger.debug(f"Creating device from bus address: {bus_address}")
 
         try:
-            interface = PCIUtils.get_interface_by_bus_address(bus_address)
+            interface = device_discovery.by_bus_address(bus_address).interface
             logger.debug(f"Found interface {interface} for bus address {bus_address}")
             return cls.from_interface(interface)
         except Exception as e:
@@ -318,7 +383,9 @@ class Device:
         logger.debug(f"Creating device from interface: {interface}")
 
         try:
-            pci_id = PCIUtils.get_pci_id(interface)
+            pci_id = device_discovery.get(interface).pci_id
+            if pci_id is None:
+                raise RuntimeError(f"Interface {interface} is not a PCI device")
             logger.debug(f"Found PCI ID {pci_id} for interface {interface}")
 
             device_cls = cls._get_device_class_by_pci_id(pci_id)
@@ -335,3 +402,46 @@ class Device:
             raise RuntimeError(
                 f"Could not create device from interface {interface}"
             ) from e
+
+
+def _normalize_pci_id(pci_id: str) -> str:
+    """Return ``pci_id`` as uppercase 'VENDOR:DEVICE' without '0x' prefixes.
+
+    :param str pci_id: PCI ID string (e.g., '8086:125b', '0x8086:0x125B')
+    :return: Normalized PCI ID (e.g., '8086:125B')
+    :rtype: str
+    :raises ValueError: if PCI ID format is invalid
+    """
+    if not pci_id or not pci_id.strip():
+        raise ValueError("PCI ID cannot be empty")
+
+    parts = pci_id.strip().upper().replace("0X", "").split(":")
+    if len(parts) != 2:
+        raise ValueError(
+            f"Invalid PCI ID format: {pci_id}. Expected format: VENDOR:DEVICE"
+        )
+
+    vendor, device = parts
+    if not vendor or not device:
+        raise ValueError(
+            f"Invalid PCI ID format: {pci_id}. "
+            "Vendor and device parts cannot be empty"
+        )
+    return f"{vendor}:{device}"
+
+
+def _load_device_modules() -> None:
+    """Import the device modules of the manifest, once."""
+    global _modules_loaded
+    if _modules_loaded:
+        return
+
+    with _modules_lock:
+        if _modules_loaded:
+            return
+        from . import DEVICE_MODULES
+
+        for module_name in DEVICE_MODULES:
+            import_module(f".{module_name}", __package__)
+        _modules_loaded = True
+        logger.debug(f"Loaded device modules: {DEVICE_MODULES}")
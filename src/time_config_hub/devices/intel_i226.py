@@ -36,12 +36,27 @@ class IntelI226(Device):
     :type NUM_TX_QUEUES: int
     :cvar NUM_RX_QUEUES: Number of receive queues (4 for I226)
     :type NUM_RX_QUEUES: int
+    :cvar SETTLE_TIMEOUT: Upper bound for the adapter reset igc performs when
+        taprio/etf offload is (re)configured
+    :type SETTLE_TIMEOUT: float
+    :cvar LINK_RESET_ON_OFFLOAD: igc drops the link for that reset
+    :type LINK_RESET_ON_OFFLOAD: bool
+    :cvar TAPRIO_FULL_OFFLOAD: igc executes the gate control list in hardware
+    :type TAPRIO_FULL_OFFLOAD: bool
+    :cvar LAUNCH_TIME_QUEUES: LaunchTime is available on every queue
+    :type LAUNCH_TIME_QUEUES: Tuple[int, ...]
     """
 
     NAME: str = "Intel I226"
     VALID_PCI_IDS = ["8086:125B", "8086:125D"]
     NUM_TX_QUEUES = 4
     NUM_RX_QUEUES = 4
+    SETTLE_TIMEOUT = 1.0
+    LINK_RESET_ON_OFFLOAD = True
+    TAPRIO_FULL_OFFLOAD = True
+    TAPRIO_TXTIME_ASSIST = True
+    ETF_OFFLOAD = True
+    LAUNCH_TIME_QUEUES = (0, 1, 2, 3)
 
     def __init__(self, interface: str):
         """Initialize an Intel I226 device instance.
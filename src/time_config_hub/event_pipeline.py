@@ -0,0 +1,205 @@
+"""
+Event Pipeline Module for Time Config Hub.
+
+This module runs watcher events on a pool of worker threads while keeping
+conflicting events apart:
+
+- Every job carries a set of keys (the configuration file path and the
+  interfaces it configures)
+- Jobs sharing a key never run at the same time and start in submission
+  order; jobs with disjoint keys run in parallel
+- A job submitted with a supersede key replaces the queued job with the
+  same key, so at most one job per file is pending; replaced jobs are
+  counted in the ``watch_events_superseded`` counter
+- The number of queued jobs is bounded and exposed as the
+  ``watch_queue_backlog`` gauge
+
+Worker count and queue depth are set by ``General/WatchWorkers`` and
+``General/WatchQueueDepth`` in ``tch_app.conf``.
+"""
+
+import logging
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import (
+    Any,
+    Callable,
+    Deque,
+    Dict,
+    FrozenSet,
+    Iterable,
+    List,
+    Optional,
+    Set,
+)
+
+from .metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_WATCH_WORKERS = 4
+DEFAULT_WATCH_QUEUE_DEPTH = 64
+
+
+@dataclass
+class _Job:
+    """A queued call and the keys it must hold while running."""
+
+    keys: FrozenSet[str]
+    func: Callable[..., Any]
+    args: tuple
+    supersede: Optional[str] = None
+
+
+class EventPipeline:
+    """
+    Worker pool that serializes jobs sharing a key.
+
+    A job is picked by the first idle worker if none of its keys is held
+    by a running job or by an older queued job.
+    """
+
+    def __init__(
+        self,
+        workers: int = DEFAULT_WATCH_WORKERS,
+        max_queue: int = DEFAULT_WATCH_QUEUE_DEPTH,
+    ):
+        """
+        Initialize the pipeline and start its workers.
+
+        :param int workers: Number of worker threads
+        :param int max_queue: Maximum number of queued (not running) jobs
+        """
+        self.max_queue = max(1, int(max_queue))
+        self._pending: Deque[_Job] = deque()
+        self._pending_by_key: Dict[str, _Job] = {}
+        self._busy: Set[str] = set()
+        self._closed = False
+        self._cond = threading.Condition()
+        self._threads: List[threading.Thread] = []
+
+        for i in range(max(1, int(workers))):
+            thread = threading.Thread(
+                target=self._worker, name=f"tch-event-{i}", daemon=True
+            )
+            thread.start()
+            self._threads.append(thread)
+
+        logger.debug(
+            f"EventPipeline started with {len(self._threads)} workers, "
+            f"queue depth {self.max_queue}"
+        )
+
+    @property
+    def backlog(self) -> int:
+        """Number of queued jobs that are not running yet."""
+        with self._cond:
+            return len(self._pending)
+
+    def submit(
+        self,
+        keys: Iterable[str],
+        func: Callable[..., Any],
+        *args,
+        supersede: Optional[str] = None,
+    ) -> bool:
+        """
+        Queue ``func(*args)``.
+
+        :param keys: Keys the job holds while running (e.g. file path and
+            interface names); must not be empty
+        :param func: Callable to run
+        :param supersede: If a queued job was submitted with the same
+            supersede key, replace it (in its queue position) with this one.
+            A job that already started is not affected.
+        :type supersede: str, optional
+        :return: True if queued, False if the queue is full or closed
+        :rtype: bool
+        """
+        job = _Job(frozenset(keys), func, args, supersede)
+        with self._cond:
+            if self._closed:
+                logger.warning(f"Pipeline closed, dropping job for {sorted(job.keys)}")
+                return False
+            old = self._pending_by_key.get(supersede) if supersede else None
+            if old is not None:
+                old.keys, old.func, old.args = job.keys, job.func, job.args
+                logger.info(f"Superseded queued job for {supersede}")
+                metrics.increment("watch_events_superseded")
+                self._cond.notify_all()
+                return True
+            if len(self._pending) >= self.max_queue:
+                logger.warning(
+                    f"Event queue full ({self.max_queue}), "
+                    f"dropping job for {sorted(job.keys)}"
+                )
+                metrics.increment("watch_events_dropped")
+                return False
+            self._pending.append(job)
+            if supersede:
+                self._pending_by_key[supersede] = job
+            self._publish_backlog()
+            self._cond.notify_all()
+        return True
+
+    def shutdown(self, wait: bool = True, timeout: Optional[float] = None) -> bool:
+        """
+        Stop accepting jobs; workers exit once the queue is drained.
+
+        :param bool wait: Wait for the workers to finish
+        :param timeout: Upper bound in seconds for the wait
+        :type timeout: float, optional
+        :return: True if every worker finished
+        :rtype: bool
+        """
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+        if wait:
+            deadline = None if timeout is None else time.monotonic() + timeout
+            for thread in self._threads:
+                if deadline is None:
+                    thread.join()
+                else:
+                    thread.join(max(0.0, deadline - time.monotonic()))
+        return not any(thread.is_alive() for thread in self._threads)
+
+    def _next_runnable(self) -> Optional[_Job]:
+        """Pop the oldest job whose keys are free; caller holds the lock."""
+        blocked: Set[str] = set(self._busy)
+        for job in self._pending:
+            if not job.keys & blocked:
+                self._pending.remove(job)
+                if job.supersede:
+                    del self._pending_by_key[job.supersede]
+                return job
+            # Younger jobs sharing a key with this one must wait behind it
+            blocked |= job.keys
+        return None
+
+    def _worker(self) -> None:
+        while True:
+            with self._cond:
+                job = self._next_runnable()
+                while job is None:
+                    if self._closed and not self._pending:
+                        return
+                    self._cond.wait()
+                    job = self._next_runnable()
+                self._busy |= job.keys
+                self._publish_backlog()
+
+            try:
+                job.func(*job.args)
+            except Exception:
+                logger.exception(f"Event job failed for {sorted(job.keys)}")
+            finally:
+                with self._cond:
+                    self._busy -= job.keys
+                    self._cond.notify_all()
+
+    def _publish_backlog(self) -> None:
+        metrics.set_gauge("watch_queue_backlog", len(self._pending))
@@ -54,9 +54,14 @@ class TCCommandError(TSNConfigError):
 
     Indicates that a traffic control (tc) command failed to execute
     or returned an error status.
+
+    :ivar dict failures: Error messages keyed by interface name, when the
+        command was part of a multi-interface operation
     """
 
-    pass
+    def __init__(self, message: str, failures: dict = None):
+        super().__init__(message)
+        self.failures = failures or {}
 
 
 class InterfaceError(TSNConfigError):
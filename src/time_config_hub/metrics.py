@@ -0,0 +1,138 @@
+"""
+Metrics Module for Time Config Hub.
+
+This module provides a small in-process metrics registry used to expose
+runtime measurements such as:
+
+- Time spent waiting for interfaces to settle after tc changes
+- Counters for processed, dropped or superseded events
+- Gauges such as the current event queue backlog
+
+Metrics are kept in memory, are thread-safe, and can be read back with
+:meth:`Metrics.snapshot` (e.g. for logging or status output).
+"""
+
+import logging
+import threading
+from typing import Any, Dict, Tuple
+
+logger = logging.getLogger(__name__)
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+
+def _label_key(labels: Dict[str, Any]) -> LabelKey:
+    """Return a hashable, order-independent key for a label set."""
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def _format_name(name: str, key: LabelKey) -> str:
+    """Format ``name{label="value",...}`` for snapshots."""
+    if not key:
+        return name
+    labels = ",".join(f'{k}="{v}"' for k, v in key)
+    return f"{name}{{{labels}}}"
+
+
+class Metrics:
+    """
+    Thread-safe registry of counters, gauges and observations.
+
+    Observations keep count, sum, min, max and the last value, which is
+    enough to report average and worst-case latencies without storing
+    every sample.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters: Dict[Tuple[str, LabelKey], float] = {}
+        self._gauges: Dict[Tuple[str, LabelKey], float] = {}
+        self._observations: Dict[Tuple[str, LabelKey], Dict[str, float]] = {}
+
+    def increment(self, name: str, value: float = 1, **labels: Any) -> None:
+        """
+        Increase a counter.
+
+        :param str name: Metric name
+        :param float value: Amount to add (default: 1)
+        :param labels: Optional labels (e.g. ``interface="eth0"``)
+        """
+        key = (name, _label_key(labels))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def set_gauge(self, name: str, value: float, **labels: Any) -> None:
+        """
+        Set a gauge to its current value.
+
+        :param str name: Metric name
+        :param float value: Current value
+        :param labels: Optional labels
+        """
+        with self._lock:
+            self._gauges[(name, _label_key(labels))] = value
+
+    def observe(self, name: str, value: float, **labels: Any) -> None:
+        """
+        Record one sample of a measurement (e.g. a duration in seconds).
+
+        :param str name: Metric name
+        :param float value: Sampled value
+        :param labels: Optional labels
+        """
+        key = (name, _label_key(labels))
+        with self._lock:
+            stats = self._observations.get(key)
+            if stats is None:
+                stats = {"count": 0, "sum": 0.0, "min": value, "max": value}
+                self._observations[key] = stats
+            stats["count"] += 1
+            stats["sum"] += value
+            stats["min"] = min(stats["min"], value)
+            stats["max"] = max(stats["max"], value)
+            stats["last"] = value
+        logger.debug(f"metric {_format_name(name, key[1])} = {value}")
+
+    def get(self, name: str, **labels: Any) -> Any:
+        """
+        Return the current value of a metric, or None if never recorded.
+
+        Counters and gauges return a number, observations return their
+        statistics dictionary.
+        """
+        key = (name, _label_key(labels))
+        with self._lock:
+            if key in self._counters:
+                return self._counters[key]
+            if key in self._gauges:
+                return self._gauges[key]
+            stats = self._observations.get(key)
+            return dict(stats) if stats is not None else None
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Return every metric keyed by its formatted name.
+
+        :return: Dictionary of metric name (with labels) to value
+        :rtype: Dict[str, Any]
+        """
+        with self._lock:
+            result: Dict[str, Any] = {}
+            for (name, key), value in self._counters.items():
+                result[_format_name(name, key)] = value
+            for (name, key), value in self._gauges.items():
+                result[_format_name(name, key)] = value
+            for (name, key), stats in self._observations.items():
+                result[_format_name(name, key)] = dict(stats)
+            return result
+
+    def reset(self) -> None:
+        """Drop every recorded metric."""
+        with self._lock:
+            self._counters.clear()
+            self._gauges.clear()
+            self._observations.clear()
+
+
+# Process-wide registry
+metrics = Metrics()
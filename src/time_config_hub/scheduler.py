@@ -0,0 +1,89 @@
+"""
+Interface Scheduler Module for Time Config Hub.
+
+This module runs per-interface work concurrently:
+
+- Independent interfaces are processed in parallel by a bounded thread pool
+- The work of one interface is a single job, so its steps stay strictly
+  ordered
+- The outcome (result or exception) of every interface is collected so
+  callers can report failures per interface
+
+The pool size is set by ``General/InterfaceWorkers`` in ``tch_app.conf``.
+"""
+
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_INTERFACE_WORKERS = 4
+
+
+@dataclass
+class InterfaceOutcome:
+    """
+    Outcome of the job of one interface.
+
+    :ivar str interface: Network interface name
+    :ivar Any value: Value returned by the job
+    :ivar Optional[BaseException] error: Exception raised by the job, if any
+    """
+
+    interface: str
+    value: Any = None
+    error: Optional[BaseException] = None
+
+    @property
+    def ok(self) -> bool:
+        """True if the job returned without raising."""
+        return self.error is None
+
+
+class InterfaceScheduler:
+    """
+    Run one job per interface on a bounded worker pool.
+
+    A job is a callable that performs every step for its interface in
+    order; jobs of different interfaces run concurrently.
+    """
+
+    def __init__(self, max_workers: int = DEFAULT_INTERFACE_WORKERS):
+        """
+        Initialize the scheduler.
+
+        :param int max_workers: Maximum number of interfaces handled at once
+        """
+        self.max_workers = max(1, int(max_workers))
+
+    def run(self, jobs: Dict[str, Callable[[], Any]]) -> Dict[str, InterfaceOutcome]:
+        """
+        Run the jobs and wait for all of them.
+
+        :param jobs: Job per interface name
+        :return: Outcome per interface name, in the order of ``jobs``
+        :rtype: Dict[str, InterfaceOutcome]
+        """
+        if len(jobs) <= 1 or self.max_workers == 1:
+            return {iface: self._run_one(iface, job) for iface, job in jobs.items()}
+
+        workers = min(self.max_workers, len(jobs))
+        with ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="tch-iface"
+        ) as executor:
+            futures = {
+                iface: executor.submit(self._run_one, iface, job)
+                for iface, job in jobs.items()
+            }
+            return {iface: future.result() for iface, future in futures.items()}
+
+    @staticmethod
+    def _run_one(interface: str, job: Callable[[], Any]) -> InterfaceOutcome:
+        try:
+            return InterfaceOutcome(interface, value=job())
+        except Exception as e:
+            logger.error(f"{interface}: {e}")
+            logger.debug(f"{interface}: job failed", exc_info=True)
+            return InterfaceOutcome(interface, error=e)
@@ -4,21 +4,34 @@ Time Config Hub Service Module
 This module provides core service logic for the Time Config Hub,
 including service orchestration, configuration management,
 and integration with other TSN components.
+
+The service loop sleeps until a signal arrives:
+
+- SIGTERM / SIGINT stop the service; queued applies are drained for at
+  most ``General/ShutdownTimeout`` seconds
+- SIGHUP re-reads ``tch_app.conf`` and reschedules the watches without
+  restarting the process (``systemctl reload tch``)
 """
 
 import logging
 import os
-import time
+import select
+import signal
+import socket
+import threading
 
 from watchdog.observers import Observer
 
 from time_config_hub.config_reader import load_app_config
 from time_config_hub.logging_setup import setup_logging
 
+from .core import TIMEConfigHub
 from .watch_handler import WatchHandler
 
 logger = logging.getLogger("tch")
 
+DEFAULT_SHUTDOWN_TIMEOUT = 10.0  # seconds to drain queued applies
+
 
 class Service:
     """
@@ -37,20 +50,43 @@ class Service:
         """
         self.app_config = app_config
         self.observer = Observer()
+        self.hub = None
+        self.handler = None
+        self._watches = []
+
+        # Set from signal handlers, consumed by run_forever. The loop waits
+        # on a socket pair that is also the signal wakeup fd: a signal may
+        # hit another thread, and a handler must not take locks the main
+        # thread may hold, which rules out threading.Event
+        self._wakeup = None
+        self._stop_requested = False
+        self._reload_requested = False
 
     def start(self):
         """
         Start the Time Config Hub service.
 
-        Schedules the WatchHandler for each configured listening folder and
-        starts the observer.
+        Starts the hub shared by all file events, schedules the
+        WatchHandler for each configured listening folder and starts the
+        observer.
 
         :raises OSError: If a directory cannot be created.
         :raises Exception: If scheduling a handler fails.
         """
         logger.debug("[daemon] Starting service...")
+        self._start_watches()
+        self.observer.start()
+        logger.debug("[daemon] Service started successfully")
+
+    def _start_watches(self):
+        """
+        Create the hub and handler and schedule the listening folders.
 
-        handler = WatchHandler(self.app_config)
+        :raises Exception: If scheduling a handler fails.
+        """
+        self.hub = TIMEConfigHub(self.app_config)
+        self.hub.start()
+        handler = self.handler = WatchHandler(self.app_config, self.hub)
         paths = self.app_config.get("General", {}).get("ListeningFolder", [])
         auto_create_dir = self.app_config.get("General", {}).get(
             "AutoCreateListeningFolder", False
@@ -72,53 +108,156 @@ class Service:
                     continue  # Skip scheduling if path doesn't exist
 
             try:
-                self.observer.schedule(handler, path, recursive=False)
+                watch = self.observer.schedule(handler, path, recursive=False)
+                self._watches.append(watch)
                 logger.info(f"[daemon] Watching {path}")
 
             except Exception:
                 logger.exception(f"[daemon] Unexpected error watching: {path}")
                 raise
 
-        self.observer.start()
-        logger.debug("[daemon] Service started successfully")
+    def request_stop(self):
+        """Ask the service loop to shut down. Safe to call from any thread."""
+        self._stop_requested = True
+        self._wake()
+
+    def request_reload(self):
+        """Ask the service loop to reload its configuration."""
+        self._reload_requested = True
+        self._wake()
+
+    def _wake(self):
+        if self._wakeup is None:
+            return  # the loop checks the flags before it waits
+        try:
+            self._wakeup[1].send(b"\0")
+        except OSError:
+            pass  # a wakeup is already pending, or the loop has exited
+
+    def _handle_signal(self, signum, frame):
+        logger.info(f"[daemon] Received {signal.Signals(signum).name}")
+        if signum == signal.SIGHUP:
+            self.request_reload()
+        else:
+            self.request_stop()
+
+    def _install_signal_handlers(self) -> dict:
+        """
+        Route SIGTERM, SIGINT and SIGHUP to the service loop.
+
+        :return: Previous handler per signal (and wakeup fd under the key
+            None), to restore on exit
+        :rtype: dict
+        """
+        if threading.current_thread() is not threading.main_thread():
+            logger.debug("[daemon] Not in the main thread, signals not handled")
+            return {}
+
+        previous = {None: signal.set_wakeup_fd(self._wakeup[1].fileno())}
+        for signum in (signal.SIGTERM, signal.SIGINT, signal.SIGHUP):
+            previous[signum] = signal.signal(signum, self._handle_signal)
+        return previous
+
+    @staticmethod
+    def _restore_signal_handlers(previous: dict) -> None:
+        for signum, handler in previous.items():
+            if signum is None:
+                signal.set_wakeup_fd(handler)
+            else:
+                signal.signal(signum, handler)
 
     def run_forever(self):
         """
-        Run the service loop indefinitely.
+        Run the service loop until a stop is requested.
 
-        Keeps the service running until interrupted.
-        Handles graceful shutdown on KeyboardInterrupt and logs unexpected errors.
+        Waits for SIGTERM/SIGINT (stop) or SIGHUP (reload) instead of
+        polling. On exit the observer is stopped and the queued applies
+        are drained within the shutdown timeout.
 
-        :raises KeyboardInterrupt: If interrupted by user.
         :raises Exception: For unexpected runtime errors.
         """
         logger.debug("[daemon] Running service loop...")
+        self._wakeup = socket.socketpair()
+        self._wakeup[1].setblocking(False)
+        previous = self._install_signal_handlers()
         try:
-            while True:
-                time.sleep(1)
+            while not self._stop_requested:
+                select.select([self._wakeup[0]], [], [])
+                self._wakeup[0].recv(4096)
+                if self._reload_requested and not self._stop_requested:
+                    self._reload_requested = False
+                    self.reload()
 
         except KeyboardInterrupt:
             logger.debug("[daemon] KeyboardInterrupt received, stopping service.")
-            self.observer.stop()
 
         except Exception:
             logger.exception("[daemon] Unexpected error in run_forever")
-            self.observer.stop()
 
-        self.observer.join()
+        finally:
+            self._restore_signal_handlers(previous)
+            for sock in self._wakeup:
+                sock.close()
+            self._wakeup = None
+
+        self.stop()
         logger.debug("[daemon] Service exited run loop.")
 
+    def reload(self):
+        """
+        Re-read ``tch_app.conf`` and reschedule the watches.
+
+        The current watches are removed and their queued applies drained
+        before the new configuration takes effect. Logging settings are
+        kept until the next restart. If the file cannot be loaded the
+        current configuration stays active.
+        """
+        logger.info("[daemon] Reloading configuration...")
+        try:
+            app_config = load_app_config()
+        except Exception:
+            logger.exception("[daemon] Failed to reload configuration")
+            return
+
+        for watch in self._watches:
+            self.observer.unschedule(watch)
+        self._watches = []
+        self._close_handler()
+
+        self.app_config = app_config
+        self._start_watches()
+        logger.info("[daemon] Configuration reloaded")
+
     def stop(self):
         """
         Stop the Time Config Hub service.
 
-        Stops the observer and waits for its thread to finish.
+        Stops the observer and waits for its thread to finish, then drains
+        the queued applies within the shutdown timeout.
         """
         logger.debug("[daemon] Stopping service...")
-        self.observer.stop()
-        self.observer.join()
+        if self.observer.is_alive():
+            self.observer.stop()
+            self.observer.join()
+        self._close_handler()
         logger.debug("[daemon] Service stopped.")
 
+    def _close_handler(self):
+        """Finish the queued events, then release the hub."""
+        if self.handler is not None:
+            timeout = (
+                self.app_config.get("General", {}).get("ShutdownTimeout")
+                or DEFAULT_SHUTDOWN_TIMEOUT
+            )
+            if not self.handler.close(timeout=timeout):
+                logger.warning(
+                    f"[daemon] Queued applies not finished after {timeout} seconds"
+                )
+            self.handler = None
+        if self.hub is not None:
+            self.hub.close()
+            self.hub = None
+
 
 def main():
     """
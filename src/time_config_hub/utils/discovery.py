@@ -0,0 +1,195 @@
+"""
+Device Discovery Module for Time Config Hub.
+
+This module maps network interfaces to their PCI identity by reading
+sysfs directly, without spawning ``ethtool``, ``cat`` or ``ls``:
+
+- One walk of ``/sys/class/net`` resolves every interface's PCI device
+  (``device`` link), from which vendor, device, driver and the bus address
+  are read; queue counts come from ``/sys/class/net/<if>/queues``
+- The map is cached and rebuilt when it is older than its TTL, when an
+  unknown interface or bus address is looked up, or on :meth:`invalidate`
+
+The module is designed to work with Linux systems.
+"""
+
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_DISCOVERY_TTL = 30.0  # seconds a scan stays valid
+
+
+@dataclass(frozen=True)
+class NetDeviceInfo:
+    """
+    Identity of one network interface.
+
+    PCI fields are None for interfaces without a PCI device (loopback,
+    virtual devices).
+
+    :ivar str interface: Network interface name
+    :ivar Optional[str] bus_address: PCI bus address 'DOMAIN:BUS:DEVICE.FUNCTION'
+    :ivar Optional[str] vendor_id: PCI vendor ID, uppercase hex without '0x'
+    :ivar Optional[str] device_id: PCI device ID, uppercase hex without '0x'
+    :ivar Optional[str] driver: Kernel driver name
+    :ivar int num_tx_queues: Number of transmit queues
+    :ivar int num_rx_queues: Number of receive queues
+    """
+
+    interface: str
+    bus_address: Optional[str] = None
+    vendor_id: Optional[str] = None
+    device_id: Optional[str] = None
+    driver: Optional[str] = None
+    num_tx_queues: int = 0
+    num_rx_queues: int = 0
+
+    @property
+    def pci_id(self) -> Optional[str]:
+        """PCI ID in format 'VENDOR:DEVICE', or None without a PCI device."""
+        if self.vendor_id is None or self.device_id is None:
+            return None
+        return f"{self.vendor_id}:{self.device_id}"
+
+
+class DeviceDiscovery:
+    """Thread-safe, TTL-bound cache of the interface → device map."""
+
+    def __init__(self, ttl: float = DEFAULT_DISCOVERY_TTL, sysfs_root: str = "/sys"):
+        """
+        :param float ttl: Seconds before the map is scanned again
+        :param str sysfs_root: Mount point of sysfs
+        """
+        self.ttl = ttl
+        self.sysfs_root = sysfs_root
+        self._interfaces: Dict[str, NetDeviceInfo] = {}
+        self._by_bus: Dict[str, NetDeviceInfo] = {}
+        self._scanned_at: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def get(self, interface: str) -> NetDeviceInfo:
+        """
+        Return the identity of ``interface``.
+
+        :param str interface: Network interface name
+        :return: Device information
+        :rtype: NetDeviceInfo
+        :raises KeyError: If no such interface exists
+        """
+        info = self._lookup(lambda: self._interfaces.get(interface))
+        if info is None:
+            raise KeyError(f"Interface not found: {interface}")
+        return info
+
+    def by_bus_address(self, bus_address: str) -> NetDeviceInfo:
+        """
+        Return the interface at PCI ``bus_address``.
+
+        :param str bus_address: PCI bus address 'DOMAIN:BUS:DEVICE.FUNCTION'
+        :return: Device information of the (first) interface
+        :rtype: NetDeviceInfo
+        :raises KeyError: If no interface exists at that address
+        """
+        bus_address = bus_address.lower()
+        info = self._lookup(lambda: self._by_bus.get(bus_address))
+        if info is None:
+            raise KeyError(f"No network interface at bus address: {bus_address}")
+        return info
+
+    def invalidate(self) -> None:
+        """Drop the map; the next lookup scans sysfs again."""
+        with self._lock:
+            self._scanned_at = None
+
+    def _lookup(
+        self, find: Callable[[], Optional[NetDeviceInfo]]
+    ) -> Optional[NetDeviceInfo]:
+        """Run ``find`` on a valid map, scanning again once on a miss."""
+        with self._lock:
+            scanned = False
+            if (
+                self._scanned_at is None
+                or time.monotonic() - self._scanned_at > self.ttl
+            ):
+                self._rescan()
+                scanned = True
+            info = find()
+            if info is None and not scanned:
+                # Hot-plugged or renamed since the last scan
+                self._rescan()
+                info = find()
+        return info
+
+    def _rescan(self) -> None:
+        self._interfaces = self._scan()
+        self._by_bus = {}
+        for info in sorted(self._interfaces.values(), key=lambda i: i.interface):
+            if info.bus_address:
+                self._by_bus.setdefault(info.bus_address, info)
+        self._scanned_at = time.monotonic()
+        logger.debug(f"Discovered {len(self._interfaces)} network interfaces")
+
+    def _scan(self) -> Dict[str, NetDeviceInfo]:
+        net_dir = os.path.join(self.sysfs_root, "class", "net")
+        try:
+            names = os.listdir(net_dir)
+        except OSError as e:
+            logger.error(f"Cannot list {net_dir}: {e}")
+            return {}
+
+        return {name: self._read_interface(net_dir, name) for name in names}
+
+    def _read_interface(self, net_dir: str, name: str) -> NetDeviceInfo:
+        iface_dir = os.path.join(net_dir, name)
+        tx_queues = rx_queues = 0
+        try:
+            for queue in os.listdir(os.path.join(iface_dir, "queues")):
+                if queue.startswith("tx-"):
+                    tx_queues += 1
+                elif queue.startswith("rx-"):
+                    rx_queues += 1
+        except OSError:
+            pass
+
+        device_dir = os.path.join(iface_dir, "device")
+        subsystem = _link_name(os.path.join(device_dir, "subsystem"))
+        if subsystem != "pci":
+            return NetDeviceInfo(name, num_tx_queues=tx_queues, num_rx_queues=rx_queues)
+
+        return NetDeviceInfo(
+            interface=name,
+            bus_address=os.path.basename(os.path.realpath(device_dir)).lower(),
+            vendor_id=_read_hex_id(os.path.join(device_dir, "vendor")),
+            device_id=_read_hex_id(os.path.join(device_dir, "device")),
+            driver=_link_name(os.path.join(device_dir, "driver")),
+            num_tx_queues=tx_queues,
+            num_rx_queues=rx_queues,
+        )
+
+
+def _link_name(path: str) -> Optional[str]:
+    """Return the last component of the symlink target at ``path``."""
+    try:
+        return os.path.basename(os.readlink(path))
+    except OSError:
+        return None
+
+
+def _read_hex_id(path: str) -> Optional[str]:
+    """Read a sysfs ID such as '0x8086' as '8086'."""
+    try:
+        with open(path) as f:
+            value = f.read().strip()
+    except OSError:
+        return None
+    return value.replace("0x", "").upper() or None
+
+
+# Process-wide map used by Device
+device_discovery = DeviceDiscovery()
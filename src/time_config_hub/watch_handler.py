@@ -1,22 +1,27 @@
 import logging
-import time
-from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from typing import List, Optional
 
 from watchdog.events import FileSystemEventHandler
 
+from tsn_config_parser import UniversalParser
+
+from .coalescer import (
+    DEFAULT_DEBOUNCE_INTERVAL,
+    DEFAULT_DEBOUNCE_MAX_DELAY,
+    EventCoalescer,
+)
 from .core import TIMEConfigHub
+from .event_pipeline import (
+    DEFAULT_WATCH_QUEUE_DEPTH,
+    DEFAULT_WATCH_WORKERS,
+    EventPipeline,
+)
 
 logger = logging.getLogger(__name__)
 
-# Executor for handling file events asynchronously
-TOTAL_WORKER = 1  # Adjust based on expected load
-DEBOUNCE_INTERVAL = 0.5  # seconds
 SUPPORTED_EXT = [".yaml", ".yml", ".xml"]
-executor = ThreadPoolExecutor(max_workers=TOTAL_WORKER)  # adjust workers
 
-logger.debug(f"ThreadPoolExecutor initialized with {TOTAL_WORKER} workers")
-logger.debug(f"Debounce interval set to {DEBOUNCE_INTERVAL} seconds")
 logger.debug(f"Supported configuration file extensions: {SUPPORTED_EXT}")
 
 
@@ -28,12 +33,77 @@ class WatchHandler(FileSystemEventHandler):
     Filters out unwanted files.
     """
 
-    def __init__(self, app_config: dict):
+    def __init__(self, app_config: dict, hub: Optional[TIMEConfigHub] = None):
+        """
+        Initialize the handler.
+
+        :param dict app_config: Application configuration dictionary
+        :param hub: Hub that applies the events; the owner (the service)
+            starts and closes it. One is created if not given.
+        :type hub: TIMEConfigHub, optional
+        """
         logger.debug("Initializing WatchHandler...")
         super().__init__()
         self.app_config = app_config  # This ensures app_config state is preserved
-        self.debounce_interval = DEBOUNCE_INTERVAL
-        self._last_event_time = {}
+        self.hub = hub or TIMEConfigHub(app_config)
+        general = app_config.get("General", {})
+
+        # Events of different files run in parallel; events of one file,
+        # or of files configuring the same interface, run one at a time
+        self.pipeline = EventPipeline(
+            workers=general.get("WatchWorkers") or DEFAULT_WATCH_WORKERS,
+            max_queue=general.get("WatchQueueDepth") or DEFAULT_WATCH_QUEUE_DEPTH,
+        )
+
+        # Bursts of events for a file are applied once the file is quiet
+        self.coalescer = EventCoalescer(
+            self._submit_coalesced,
+            interval=general.get("DebounceInterval") or DEFAULT_DEBOUNCE_INTERVAL,
+            max_delay=general.get("DebounceMaxDelay") or DEFAULT_DEBOUNCE_MAX_DELAY,
+        )
+        logger.debug(
+            f"Debounce interval set to {self.coalescer.interval} seconds "
+            f"(max delay {self.coalescer.max_delay} seconds)"
+        )
+
+    def close(self, timeout: Optional[float] = None) -> bool:
+        """
+        Stop accepting events and wait for the queued ones to finish.
+
+        Events still waiting for their file to go quiet are submitted first.
+
+        :param float timeout: Upper bound in seconds for the wait
+        :return: True if every queued event was processed
+        :rtype: bool
+        """
+        self.coalescer.close(flush=True)
+        return self.pipeline.shutdown(wait=True, timeout=timeout)
+
+    def _submit_coalesced(self, file_path: str, event_type: str) -> None:
+        """Coalescer callback: queue the last event of a burst."""
+        self._submit(event_type, file_path)
+
+    def _submit(self, event_type: str, file_path: str) -> None:
+        """
+        Queue a file event for processing.
+
+        :param str event_type: Type of event ("created", "modified", "deleted")
+        :param str file_path: Path of the configuration file
+        """
+        keys = [f"file:{file_path}"]
+        if event_type != "deleted":
+            keys += [f"iface:{i}" for i in _config_interfaces(file_path)]
+
+        logger.info(f"Submitting {event_type} event for processing: {file_path}")
+        # Only the latest content matters: a newer event replaces the
+        # queued one of the same file
+        self.pipeline.submit(
+            keys,
+            self.hub.file_event_handler,
+            event_type,
+            file_path,
+            supersede=file_path,
+        )
 
     def _is_valid_config_file(self, file_path: str) -> bool:
         """
@@ -91,6 +161,18 @@ class WatchHandler(FileSystemEventHandler):
         logger.debug(f"on_modified event: {event}")
         self._handle_event(event, "modified")
 
+    def on_moved(self, event):
+        """
+        Handle file move events.
+
+        Editors often save by writing a temporary file and renaming it over
+        the configuration file; the destination is handled as modified.
+
+        :param event: File system event object
+        """
+        logger.debug(f"on_moved event: {event}")
+        self._handle_event(event, "modified", str(event.dest_path))
+
     def on_deleted(self, event):
         """
         Handle file deletion events.
@@ -100,41 +182,55 @@ class WatchHandler(FileSystemEventHandler):
         logger.debug(f"on_deleted event: {event}")
         file_path = str(event.src_path)
         if not event.is_directory and self._is_valid_config_file(file_path):
-            logger.info(f"Submitting deleted event for processing: {file_path}")
-            executor.submit(
-                TIMEConfigHub(self.app_config).file_event_handler,
-                "deleted",
-                file_path,
-            )
+            # A pending apply of the deleted file is pointless
+            if self.coalescer.discard(file_path):
+                logger.debug(f"Dropped pending event for deleted file: {file_path}")
+            self._submit("deleted", file_path)
 
-    def _handle_event(self, event, event_type):
+    def _handle_event(self, event, event_type, file_path=None):
         """
-        Internal handler to debounce duplicate events for the same file.
+        Internal handler to coalesce bursts of events for the same file.
+
+        The file is submitted once it has been quiet for the debounce
+        interval (or at the latest after the maximum delay), with the
+        type of its last event.
 
         :param event: File system event object
         :param event_type: Type of event ("created" or "modified")
+        :param file_path: Path to handle instead of ``event.src_path``
         """
-        file_path = str(event.src_path)
+        file_path = file_path or str(event.src_path)
         # Ignore events for directories or invalid files
         if event.is_directory or not self._is_valid_config_file(file_path):
             return
 
-        # Debounce logic, ignore events occurring within debounce_interval
-        # If 2 events for the same file occur within debounce_interval,
-        # only process the first one
-        now = time.time()
-        last_time = self._last_event_time.get(file_path, 0)
-        if now - last_time < self.debounce_interval:
-            logger.debug(f"Debounced duplicate {event_type} event for: {file_path}")
-            return
+        self.coalescer.add(file_path, event_type)
 
-        # Update last event time
-        self._last_event_time[file_path] = now
 
-        # Log and process the event
-        logger.info(f"Submitting {event_type} event for processing: {file_path}")
-        executor.submit(
-            TIMEConfigHub(self.app_config).file_event_handler,
-            event_type,
-            file_path,
-        )
+def _config_interfaces(file_path: str) -> List[str]:
+    """
+    Return the interfaces a configuration file programs.
+
+    The parse is served from the parse cache when the file is applied
+    afterwards. A file that cannot be parsed yields no interface; its
+    apply will fail on its own.
+
+    :param str file_path: Path of the configuration file
+    :return: Interface names (qdisc interfaces and talker interfaces)
+    :rtype: List[str]
+    """
+    try:
+        uparser = UniversalParser()
+        uparser.parse(file_path)
+        ge_dict = uparser.get_dictionary_helper()
+    except Exception as e:
+        logger.debug(f"Cannot read interfaces of {file_path}: {e}")
+        return []
+
+    if ge_dict is None:
+        return []
+
+    interfaces = set(ge_dict.get_interface_names())
+    for talkers in ge_dict.get_all_talker_stream_info().values():
+        interfaces.update(t["interface_name"] for t in talkers if t["interface_name"])
+    return sorted(interfaces)
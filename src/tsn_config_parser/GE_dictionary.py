@@ -1,9 +1,46 @@
 # File: GE_Dictionary.py
 """
 GE Dictionary Helper for TSN XML/YAML/JSON configuration.
+
+The documents are indexed once, on first access: interfaces, streams,
+talkers and gate-control entries are collected in a single traversal and
+every getter is then a lookup into that index.
 """
 
-from typing import Any, Dict, List
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from .tc_gcl import GCLError, GCLLimits, Schedule, compile_gcl
+
+
+def _as_list(value: Any) -> List[Any]:
+    """Return ``value`` as a list (single XML/YAML elements are not lists)."""
+    if value is None:
+        return []
+    return value if isinstance(value, list) else [value]
+
+
+def _text(value: Any) -> str:
+    """Return the text of a leaf, which may carry attributes (``#text``)."""
+    if isinstance(value, dict) and "#text" in value:
+        return value["#text"]
+    return str(value)
+
+
+@dataclass
+class _GEIndex:
+    """Normalized view of the documents, built in one pass."""
+
+    interface_names: List[str] = field(default_factory=list)
+    interfaces: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    stream_ids: List[str] = field(default_factory=list)
+    # (stream-id, talkers) of every cnc-config stream, in document order
+    streams: List[Tuple[Any, List[Dict[str, Any]]]] = field(default_factory=list)
+    streams_by_id: Dict[Any, List[List[Dict[str, Any]]]] = field(default_factory=dict)
+    stream_id_set: Set[str] = field(default_factory=set)
+    gate_entries: List[Dict[str, Any]] = field(default_factory=list)
+    # gate-parameter-table holding the admin-control-list (the first one)
+    gate_table: Optional[Dict[str, Any]] = None
 
 
 class GE_Dictionary:
@@ -12,111 +49,51 @@ class GE_Dictionary:
     def __init__(self, documents: List[Dict[str, Any]]):
         self.documents = documents
 
+    @property
+    def documents(self) -> List[Dict[str, Any]]:
+        """The parsed documents; assigning new ones drops the index."""
+        return self._documents
+
+    @documents.setter
+    def documents(self, documents: List[Dict[str, Any]]) -> None:
+        self._documents = documents
+        self._index_cache: Optional[_GEIndex] = None
+
+    @property
+    def _index(self) -> _GEIndex:
+        if self._index_cache is None:
+            self._index_cache = self._build_index()
+        return self._index_cache
+
     def get_interface_names(self) -> List[str]:
         """Return all interface names under <interfaces>."""
-        names: List[str] = []
-        for doc in self.documents:
-            interfaces_section = self._find_key(doc, "interfaces")
-            if interfaces_section:
-                interface_list = interfaces_section.get("interface")
-                if not interface_list:
-                    continue
-                if not isinstance(interface_list, list):
-                    interface_list = [interface_list]
-                for iface in interface_list:
-                    name_entry = iface.get("name")
-                    if name_entry:
-                        if isinstance(name_entry, dict) and "#text" in name_entry:
-                            names.append(name_entry["#text"])
-                        else:
-                            names.append(str(name_entry))
-        return names
+        return list(self._index.interface_names)
 
     def get_stream_ids(self) -> List[str]:
         """Return all <stream-id> values in documents."""
-        stream_ids: List[str] = []
-        for doc in self.documents:
-            streams = self._find_all_keys(doc, "stream-id")
-            stream_ids.extend(
-                [
-                    str(s["#text"] if isinstance(s, dict) and "#text" in s else s)
-                    for s in streams
-                ]
-            )
-        return stream_ids
+        return list(self._index.stream_ids)
 
     def get_talker_vlan_info(self) -> Dict[str, List[Dict[str, str]]]:
         """Return dict of stream-id -> list of talker info dicts."""
         result = {}
 
-        for doc in self.documents:
-            domains = doc.get("cnc-config", {}).get("domain", [])
-            if not isinstance(domains, list):
-                domains = [domains]
-
-            for domain in domains:
-                cucs = domain.get("cuc", [])
-                if not isinstance(cucs, list):
-                    cucs = [cucs]
-
-                for cuc in cucs:
-                    streams = cuc.get("stream", [])
-                    if not isinstance(streams, list):
-                        streams = [streams]
-
-                    for stream in streams:
-                        stream_id = stream.get("stream-id")
-                        if stream_id not in self.get_stream_ids():
-                            continue  # safeguard
-
-                        talkers_info = []
-                        talkers = stream.get("talker", [])
-                        if not isinstance(talkers, list):
-                            talkers = [talkers]
-
-                        for talker in talkers:
-                            mac = talker.get("end-station-interfaces", {}).get(
-                                "mac-address"
-                            )
-
-                            iface_cfg = talker.get("interface-configuration", {})
-                            iface_list = iface_cfg.get("interface-list", {})
-                            iface_name = iface_list.get("interface-name")
-
-                            vlan_id = None
-                            pcp = None
-                            cfg_lists = iface_list.get("config-list", [])
-                            if not isinstance(cfg_lists, list):
-                                cfg_lists = [cfg_lists]
-
-                            for cfg in cfg_lists:
-                                vlan_tag = cfg.get("ieee802-vlan-tag")
-                                if vlan_tag:
-                                    vlan_id = vlan_tag.get("vlan-id")
-                                    pcp = vlan_tag.get("priority-code-point")
-
-                            talkers_info.append(
-                                {
-                                    "mac": mac,
-                                    "interface": iface_name,
-                                    "vlan": vlan_id,
-                                    "pcp": pcp,
-                                }
-                            )
-
-                        result[stream_id] = talkers_info
+        for stream_id, talkers in self._index.streams:
+            if not self._is_known_stream(stream_id):
+                continue  # safeguard
+            result[stream_id] = [self._talker_vlan(t) for t in talkers]
+
         return result
 
     def get_talker_vlan_info_by_stream(self, stream_id: str) -> List[str]:
         """
         Return formatted talker VLAN info for a given stream-id.
-        Reuses get_stream_ids() to ensure valid input.
+        Only ids listed by get_stream_ids() are valid input.
         """
-        if stream_id not in self.get_stream_ids():
+        if not self._is_known_stream(stream_id):
             return [f"Stream ID '{stream_id}' not found."]
 
-        all_info = self.get_talker_vlan_info()
-        talkers = all_info.get(stream_id, [])
+        streams = self._index.streams_by_id.get(stream_id)
+        talkers = [self._talker_vlan(t) for t in streams[-1]] if streams else []
 
         return [
             f"MAC: {t['mac']}, IF: {t['interface']}, VLAN: {t['vlan']}, PCP: {t['pcp']}"
@@ -170,70 +147,12 @@ class GE_Dictionary:
         """
         result: Dict[str, List[Dict[str, str]]] = {}
 
-        for doc in self.documents:
-            domains = doc.get("cnc-config", {}).get("domain", [])
-            if not isinstance(domains, list):
-                domains = [domains]
-
-            for domain in domains:
-                cucs = domain.get("cuc", [])
-                if not isinstance(cucs, list):
-                    cucs = [cucs]
-
-                for cuc in cucs:
-                    streams = cuc.get("stream", [])
-                    if not isinstance(streams, list):
-                        streams = [streams]
-
-                    for stream in streams:
-                        stream_id = stream.get("stream-id")
-                        if not stream_id:
-                            continue
-
-                        talkers = stream.get("talker", [])
-                        if not isinstance(talkers, list):
-                            talkers = [talkers]
-
-                        for talker in talkers:
-                            mac = talker.get("end-station-interfaces", {}).get(
-                                "mac-address"
-                            )
-
-                            iface_cfg = talker.get("interface-configuration", {})
-                            iface_list = iface_cfg.get("interface-list", {})
-                            iface_name = iface_list.get("interface-name")
-
-                            cfg_lists = iface_list.get("config-list", [])
-                            if not isinstance(cfg_lists, list):
-                                cfg_lists = [cfg_lists]
-
-                            # Look for time-aware-offset entries
-                            time_offsets = [
-                                cfg.get("time-aware-offset")
-                                for cfg in cfg_lists
-                                if "time-aware-offset" in cfg
-                            ]
-                            if not time_offsets:
-                                continue  # Skip talkers without offset
-
-                            vlan_id = None
-                            pcp = None
-                            for cfg in cfg_lists:
-                                vlan_tag = cfg.get("ieee802-vlan-tag")
-                                if vlan_tag:
-                                    vlan_id = vlan_tag.get("vlan-id")
-                                    pcp = vlan_tag.get("priority-code-point")
-
-                            for offset in time_offsets:
-                                result.setdefault(stream_id, []).append(
-                                    {
-                                        "mac": str(mac),
-                                        "interface": str(iface_name),
-                                        "vlan": str(vlan_id),
-                                        "pcp": str(pcp),
-                                        "time-aware-offset": str(offset),
-                                    }
-                                )
+        for stream_id, talkers in self._index.streams:
+            if not stream_id:
+                continue
+            entries = self._time_aware_vlan_entries(talkers)
+            if entries:
+                result.setdefault(stream_id, []).extend(entries)
 
         return result
 
@@ -241,9 +160,10 @@ class GE_Dictionary:
         """
         Retrieve all ``<time-aware-offset>`` values for a specific stream ID.
 
-        This function reuses :meth:`get_all_time_aware_talker_vlan_info`
-        to ensure consistent filtering and data structure. It extracts only
-        the time-aware offset values corresponding to the given ``stream-id``.
+        This function applies the same filtering as
+        :meth:`get_all_time_aware_talker_vlan_info`, restricted to the
+        streams with the given ``stream-id``, and extracts only the
+        time-aware offset values.
 
         Parameters
         ----------
@@ -263,49 +183,25 @@ class GE_Dictionary:
         >>> ge.get_time_aware_offsets_by_stream_id("de-ad-be-ef-00-01:00-05")
         ['78600']
         """
-        time_aware_info = self.get_all_time_aware_talker_vlan_info()
+        entries = []
+        if stream_id:
+            for talkers in self._index.streams_by_id.get(stream_id, []):
+                entries.extend(self._time_aware_vlan_entries(talkers))
 
-        if stream_id not in time_aware_info:
+        if not entries:
             print(f"No <time-aware-offset> found for stream '{stream_id}'.")
             return []
 
         offsets = [
             entry["time-aware-offset"]
-            for entry in time_aware_info[stream_id]
+            for entry in entries
             if "time-aware-offset" in entry
         ]
         return offsets
 
     def get_gate_control_entries(self) -> List[Dict[str, Any]]:
         """Return all gate-control-entry dictionaries under interfaces."""
-        entries: List[Dict[str, Any]] = []
-
-        for doc in self.documents:
-            interfaces_section = self._find_key(doc, "interfaces")
-            if not interfaces_section:
-                continue
-
-            interface_list = interfaces_section.get("interface")
-            if not interface_list:
-                continue
-            if not isinstance(interface_list, list):
-                interface_list = [interface_list]
-
-            for iface in interface_list:
-                gate_table = self._find_key(iface, "gate-parameter-table")
-                if not gate_table:
-                    continue
-                admin_list = self._find_key(gate_table, "admin-control-list")
-                if not admin_list:
-                    continue
-                gate_entries = admin_list.get("gate-control-entry")
-                if not gate_entries:
-                    continue
-                if not isinstance(gate_entries, list):
-                    gate_entries = [gate_entries]
-                entries.extend(gate_entries)
-
-        return entries
+        return list(self._index.gate_entries)
 
     def get_gate_control_entries_formatted(self) -> List[str]:
         """Return gate-control-entries as formatted sched-entry strings."""
@@ -331,10 +227,212 @@ class GE_Dictionary:
 
         return formatted_entries
 
+    def get_gate_schedule(self) -> Schedule:
+        """
+        Compile the admin-control-list into a taprio schedule.
+
+        Adjacent entries with the same gate states are merged up to
+        ``supported-interval-max``, the cycle time is taken from
+        ``admin-cycle-time`` if present and the phase from
+        ``admin-base-time``.
+
+        :raises GCLError: If the gate control list is malformed.
+        """
+        table = self._index.gate_table or {}
+        extension = table.get("admin-cycle-time-extension")
+        return compile_gcl(
+            self._index.gate_entries,
+            cycle_time=self._rational_ns(table.get("admin-cycle-time")),
+            cycle_time_extension=(
+                None if extension is None else self._integer(extension)
+            ),
+            base_time=self._ptp_time_ns(table.get("admin-base-time")),
+            limits=self.get_gcl_limits(),
+        )
+
+    def get_gcl_limits(self) -> GCLLimits:
+        """Return the ``supported-*`` limits declared by the gate parameter table."""
+        table = self._index.gate_table or {}
+        list_max = table.get("supported-list-max")
+        interval_max = table.get("supported-interval-max")
+        return GCLLimits(
+            max_entries=None if list_max is None else self._integer(list_max),
+            max_interval=None if interval_max is None else self._integer(interval_max),
+            max_cycle_time=self._rational_ns(table.get("supported-cycle-max")),
+        )
+
     # -----------------------
     # Internal helper methods
     # -----------------------
 
+    @staticmethod
+    def _integer(value: Any) -> int:
+        try:
+            return int(_text(value))
+        except ValueError:
+            raise GCLError(f"invalid integer {_text(value)!r}") from None
+
+    @classmethod
+    def _rational_ns(cls, value: Any) -> Optional[int]:
+        """Convert a YANG rational number of seconds to nanoseconds."""
+        if not isinstance(value, dict):
+            return None
+        numerator = cls._integer(value.get("numerator"))
+        denominator = cls._integer(value.get("denominator", 1))
+        if denominator <= 0:
+            raise GCLError(f"invalid denominator {denominator}")
+        return numerator * 1_000_000_000 // denominator
+
+    @classmethod
+    def _ptp_time_ns(cls, value: Any) -> int:
+        """Convert a PTP time (seconds, nanoseconds) to nanoseconds."""
+        if not isinstance(value, dict):
+            return 0
+        seconds = cls._integer(value.get("seconds", 0))
+        nanoseconds = cls._integer(value.get("nanoseconds", 0))
+        return seconds * 1_000_000_000 + nanoseconds
+
+    def _build_index(self) -> _GEIndex:
+        """Index every document in a single traversal."""
+        index = _GEIndex()
+
+        for doc in self._documents:
+            interfaces_section = self._scan(doc, index)
+            if isinstance(interfaces_section, dict):
+                self._index_interfaces(interfaces_section, index)
+            if isinstance(doc, dict) and isinstance(doc.get("cnc-config"), dict):
+                self._index_streams(doc["cnc-config"], index)
+
+        index.stream_id_set = set(index.stream_ids)
+        return index
+
+    def _scan(self, doc: Any, index: _GEIndex) -> Any:
+        """
+        Walk ``doc`` once, collecting every <stream-id> into ``index``.
+
+        :return: The first <interfaces> section in document order, if any
+        """
+        interfaces_section = None
+        stack = [doc]
+        while stack:
+            node = stack.pop()
+            if isinstance(node, dict):
+                for k, v in node.items():
+                    if k == "interfaces" and interfaces_section is None:
+                        interfaces_section = v
+                    elif k == "stream-id":
+                        index.stream_ids.append(_text(v))
+                # Reversed so that children are visited in document order
+                stack.extend(reversed(list(node.values())))
+            elif isinstance(node, list):
+                stack.extend(reversed(node))
+
+        return interfaces_section
+
+    def _index_interfaces(
+        self, interfaces_section: Dict[str, Any], index: _GEIndex
+    ) -> None:
+        """Index interface names, nodes and gate-control entries."""
+        for iface in _as_list(interfaces_section.get("interface")):
+            if not isinstance(iface, dict):
+                continue
+
+            name_entry = iface.get("name")
+            if name_entry:
+                name = _text(name_entry)
+                index.interface_names.append(name)
+                index.interfaces.setdefault(name, iface)
+
+            gate_table = self._find_key(iface, "gate-parameter-table")
+            if not gate_table:
+                continue
+            admin_list = self._find_key(gate_table, "admin-control-list")
+            if not admin_list:
+                continue
+            index.gate_entries.extend(_as_list(admin_list.get("gate-control-entry")))
+            if index.gate_table is None:
+                index.gate_table = gate_table
+
+    def _index_streams(self, cnc_config: Dict[str, Any], index: _GEIndex) -> None:
+        """Index the streams (and their talkers) of every domain and CUC."""
+        for domain in _as_list(cnc_config.get("domain")):
+            for cuc in _as_list(domain.get("cuc")):
+                for stream in _as_list(cuc.get("stream")):
+                    stream_id = stream.get("stream-id")
+                    talkers = _as_list(stream.get("talker"))
+                    index.streams.append((stream_id, talkers))
+                    try:
+                        index.streams_by_id.setdefault(stream_id, []).append(talkers)
+                    except TypeError:
+                        pass  # Unhashable id (element with attributes)
+
+    def _is_known_stream(self, stream_id: Any) -> bool:
+        """True if ``stream_id`` is one of :meth:`get_stream_ids`."""
+        try:
+            return stream_id in self._index.stream_id_set
+        except TypeError:
+            return False
+
+    @staticmethod
+    def _talker_config(talker: Dict[str, Any]) -> Tuple[Any, Any, List[Any]]:
+        """Return MAC, interface name and config-list of a talker."""
+        mac = talker.get("end-station-interfaces", {}).get("mac-address")
+        iface_cfg = talker.get("interface-configuration", {})
+        iface_list = iface_cfg.get("interface-list", {})
+        return (
+            mac,
+            iface_list.get("interface-name"),
+            _as_list(iface_list.get("config-list", [])),
+        )
+
+    @staticmethod
+    def _vlan_of(cfg_lists: List[Any]) -> Tuple[Any, Any]:
+        """Return VLAN id and PCP of the last VLAN tag in a config-list."""
+        vlan_id = None
+        pcp = None
+        for cfg in cfg_lists:
+            vlan_tag = cfg.get("ieee802-vlan-tag")
+            if vlan_tag:
+                vlan_id = vlan_tag.get("vlan-id")
+                pcp = vlan_tag.get("priority-code-point")
+        return vlan_id, pcp
+
+    def _talker_vlan(self, talker: Dict[str, Any]) -> Dict[str, Any]:
+        """Return the MAC/interface/VLAN/PCP summary of one talker."""
+        mac, iface_name, cfg_lists = self._talker_config(talker)
+        vlan_id, pcp = self._vlan_of(cfg_lists)
+        return {"mac": mac, "interface": iface_name, "vlan": vlan_id, "pcp": pcp}
+
+    def _time_aware_vlan_entries(
+        self, talkers: List[Dict[str, Any]]
+    ) -> List[Dict[str, str]]:
+        """Return one entry per <time-aware-offset> of the given talkers."""
+        entries = []
+        for talker in talkers:
+            mac, iface_name, cfg_lists = self._talker_config(talker)
+
+            # Look for time-aware-offset entries
+            time_offsets = [
+                cfg.get("time-aware-offset")
+                for cfg in cfg_lists
+                if "time-aware-offset" in cfg
+            ]
+            if not time_offsets:
+                continue  # Skip talkers without offset
+
+            vlan_id, pcp = self._vlan_of(cfg_lists)
+            for offset in time_offsets:
+                entries.append(
+                    {
+                        "mac": str(mac),
+                        "interface": str(iface_name),
+                        "vlan": str(vlan_id),
+                        "pcp": str(pcp),
+                        "time-aware-offset": str(offset),
+                    }
+                )
+        return entries
+
     def _find_key(self, node: Any, key: str) -> Any:
         """Recursive find first occurrence of a key."""
         if isinstance(node, dict):
@@ -351,19 +449,6 @@ class GE_Dictionary:
                     return found
         return None
 
-    def _find_all_keys(self, node: Any, key: str) -> List[Any]:
-        """Recursive find all occurrences of a key."""
-        results: List[Any] = []
-        if isinstance(node, dict):
-            for k, v in node.items():
-                if k == key:
-                    results.append(v)
-                results.extend(self._find_all_keys(v, key))
-        elif isinstance(node, list):
-            for item in node:
-                results.extend(self._find_all_keys(item, key))
-        return results
-
     def get_all_talker_stream_info(self) -> Dict[str, List[Dict[str, Any]]]:
         """
         Extract detailed stream information for each talker in all streams,
@@ -398,147 +483,119 @@ class GE_Dictionary:
 
         result: Dict[str, List[Dict[str, Any]]] = {}
 
-        for doc in self.documents:
-            domains = doc.get("cnc-config", {}).get("domain", [])
-            if not isinstance(domains, list):
-                domains = [domains]
-
-            for domain in domains:
-                cucs = domain.get("cuc", [])
-                if not isinstance(cucs, list):
-                    cucs = [cucs]
-
-                for cuc in cucs:
-                    streams = cuc.get("stream", [])
-                    if not isinstance(streams, list):
-                        streams = [streams]
-
-                    for stream in streams:
-                        stream_id = stream.get("stream-id")
-                        if not stream_id:
-                            continue
-
-                        talkers = stream.get("talker", [])
-                        if not isinstance(talkers, list):
-                            talkers = [talkers]
-
-                        for talker in talkers:
-                            # --- Default values ---
-                            interface_name = None
-                            interface_mac = None
-                            src_mac = None
-                            dst_mac = None
-                            vlan_id = None
-                            pcp = None
-                            vlan_tag = False
-                            src_ip = None
-                            dst_ip = None
-                            dscp = None
-                            ip_protocol = None
-                            src_port = None
-                            dst_port = None
-                            time_aware = False
-                            time_aware_offset = None
-                            earliest_tx_offset = None
-                            latest_tx_offset = None
-
-                            # --- End-station interface info ---
-                            end_iface = talker.get("end-station-interfaces", {})
-                            src_mac = end_iface.get("mac-address")
-                            src_mac = src_mac.replace("-", ":") if src_mac else None
-
-                            # --- Interface configuration ---
-                            iface_cfg = talker.get("interface-configuration", {})
-                            iface_list = iface_cfg.get("interface-list", {})
-
-                            # Interface-level info (mac-address, interface-name)
-                            interface_mac = iface_list.get("mac-address")
-                            interface_mac = (
-                                interface_mac.replace("-", ":")
-                                if interface_mac
-                                else None
-                            )
-                            interface_name = iface_list.get("interface-name")
-
-                            cfg_lists = iface_list.get("config-list", [])
-                            if not isinstance(cfg_lists, list):
-                                cfg_lists = [cfg_lists]
-
-                            for cfg in cfg_lists:
-                                # Destination MAC
-                                if "ieee802-mac-addresses" in cfg:
-                                    macs = cfg["ieee802-mac-addresses"]
-                                    dst_mac = macs.get("destination-mac-address")
-                                    dst_mac = (
-                                        dst_mac.replace("-", ":") if dst_mac else None
-                                    )
-                                # VLAN info
-                                if "ieee802-vlan-tag" in cfg:
-                                    vlan_tag = True
-                                    vlan = cfg["ieee802-vlan-tag"]
-                                    vlan_id = vlan.get("vlan-id")
-                                    pcp = vlan.get("priority-code-point")
-
-                                # IPv4 info
-                                if "ipv4-tuple" in cfg:
-                                    ipv4 = cfg["ipv4-tuple"]
-                                    src_ip = ipv4.get("source-ip-address")
-                                    dst_ip = ipv4.get("destination-ip-address")
-                                    dscp = ipv4.get("dscp")
-                                    ip_protocol = ipv4.get("protocol")
-                                    src_port = ipv4.get("source-port")
-                                    dst_port = ipv4.get("destination-port")
-
-                                # time-aware-offset
-                                if "time-aware-offset" in cfg:
-                                    offset_val = cfg.get("time-aware-offset")
-                                    if offset_val and str(offset_val).strip() not in (
-                                        "0",
-                                        "0.0",
-                                        "",
-                                    ):
-                                        time_aware = True
-                                        time_aware_offset = offset_val
-
-                                # time-aware block
-                                if "time-aware" in cfg:
-                                    time_block = cfg["time-aware"]
-                                    earliest_tx_offset = time_block.get(
-                                        "earliest-transmit-offset"
-                                    )
-                                    latest_tx_offset = time_block.get(
-                                        "latest-transmit-offset"
-                                    )
-
-                                    for val in [earliest_tx_offset, latest_tx_offset]:
-                                        if val and str(val).strip() not in (
-                                            "0",
-                                            "0.0",
-                                            "",
-                                        ):
-                                            time_aware = True
-
-                            talker_entry = {
-                                "interface_name": interface_name,
-                                "interface_mac": interface_mac,
-                                "source_mac": src_mac,
-                                "destination_mac": dst_mac,
-                                "source_ip": src_ip,
-                                "destination_ip": dst_ip,
-                                "dscp": dscp,
-                                "ip_protocol": ip_protocol,
-                                "source_port": src_port,
-                                "destination_port": dst_port,
-                                "vlan_tag": vlan_tag,
-                                "vlan_id": vlan_id,
-                                "vlan_priority": pcp,
-                                "time_aware": time_aware,
-                                "time_aware_offset": time_aware_offset,
-                                "earliest_transmit_offset": earliest_tx_offset,
-                                "latest_transmit_offset": latest_tx_offset,
-                            }
-
-                            result.setdefault(stream_id, []).append(talker_entry)
+        for stream_id, talkers in self._index.streams:
+            if not stream_id:
+                continue
+
+            for talker in talkers:
+                # --- Default values ---
+                interface_name = None
+                interface_mac = None
+                src_mac = None
+                dst_mac = None
+                vlan_id = None
+                pcp = None
+                vlan_tag = False
+                src_ip = None
+                dst_ip = None
+                dscp = None
+                ip_protocol = None
+                src_port = None
+                dst_port = None
+                time_aware = False
+                time_aware_offset = None
+                earliest_tx_offset = None
+                latest_tx_offset = None
+
+                # --- End-station interface info ---
+                end_iface = talker.get("end-station-interfaces", {})
+                src_mac = end_iface.get("mac-address")
+                src_mac = src_mac.replace("-", ":") if src_mac else None
+
+                # --- Interface configuration ---
+                iface_cfg = talker.get("interface-configuration", {})
+                iface_list = iface_cfg.get("interface-list", {})
+
+                # Interface-level info (mac-address, interface-name)
+                interface_mac = iface_list.get("mac-address")
+                interface_mac = (
+                    interface_mac.replace("-", ":") if interface_mac else None
+                )
+                interface_name = iface_list.get("interface-name")
+
+                cfg_lists = iface_list.get("config-list", [])
+                if not isinstance(cfg_lists, list):
+                    cfg_lists = [cfg_lists]
+
+                for cfg in cfg_lists:
+                    # Destination MAC
+                    if "ieee802-mac-addresses" in cfg:
+                        macs = cfg["ieee802-mac-addresses"]
+                        dst_mac = macs.get("destination-mac-address")
+                        dst_mac = dst_mac.replace("-", ":") if dst_mac else None
+                    # VLAN info
+                    if "ieee802-vlan-tag" in cfg:
+                        vlan_tag = True
+                        vlan = cfg["ieee802-vlan-tag"]
+                        vlan_id = vlan.get("vlan-id")
+                        pcp = vlan.get("priority-code-point")
+
+                    # IPv4 info
+                    if "ipv4-tuple" in cfg:
+                        ipv4 = cfg["ipv4-tuple"]
+                        src_ip = ipv4.get("source-ip-address")
+                        dst_ip = ipv4.get("destination-ip-address")
+                        dscp = ipv4.get("dscp")
+                        ip_protocol = ipv4.get("protocol")
+                        src_port = ipv4.get("source-port")
+                        dst_port = ipv4.get("destination-port")
+
+                    # time-aware-offset
+                    if "time-aware-offset" in cfg:
+                        offset_val = cfg.get("time-aware-offset")
+                        if offset_val and str(offset_val).strip() not in (
+                            "0",
+                            "0.0",
+                            "",
+                        ):
+                            time_aware = True
+                            time_aware_offset = offset_val
+
+                    # time-aware block
+                    if "time-aware" in cfg:
+                        time_block = cfg["time-aware"]
+                        earliest_tx_offset = time_block.get("earliest-transmit-offset")
+                        latest_tx_offset = time_block.get("latest-transmit-offset")
+
+                        for val in [earliest_tx_offset, latest_tx_offset]:
+                            if val and str(val).strip() not in (
+                                "0",
+                                "0.0",
+                                "",
+                            ):
+                                time_aware = True
+
+                talker_entry = {
+                    "interface_name": interface_name,
+                    "interface_mac": interface_mac,
+                    "source_mac": src_mac,
+                    "destination_mac": dst_mac,
+                    "source_ip": src_ip,
+                    "destination_ip": dst_ip,
+                    "dscp": dscp,
+                    "ip_protocol": ip_protocol,
+                    "source_port": src_port,
+                    "destination_port": dst_port,
+                    "vlan_tag": vlan_tag,
+                    "vlan_id": vlan_id,
+                    "vlan_priority": pcp,
+                    "time_aware": time_aware,
+                    "time_aware_offset": time_aware_offset,
+                    "earliest_transmit_offset": earliest_tx_offset,
+                    "latest_transmit_offset": latest_tx_offset,
+                }
+
+                result.setdefault(stream_id, []).append(talker_entry)
 
         return result
 
@@ -0,0 +1,225 @@
+# File: parse_cache.py
+"""
+parse_cache
+===========
+
+Process-wide cache of parsed configuration files.
+
+Entries are keyed by path and validated against the file's
+``(mtime, size)`` and, when those changed, the SHA-256 of its content, so
+a file that was touched or rewritten with identical content is not
+parsed again. Each entry keeps the parsed documents, the chronos-domain
+flag and the derived :class:`~tsn_config_parser.GE_dictionary.GE_Dictionary`
+(with its index). Entries are evicted least-recently-used first once the
+total size of the cached files exceeds a byte budget.
+
+Cached documents are shared between callers and must not be modified.
+
+Example
+-------
+
+.. code-block:: python
+
+    from parse_cache import Fingerprint, parse_cache
+
+    fingerprint = Fingerprint("config.xml")  # taken before parsing
+    entry = parse_cache.get("config.xml", fingerprint)
+    if entry is None:
+        fingerprint.compute_digest()  # hash the content before parsing it
+        documents = ...  # parse the file
+        entry = parse_cache.put("config.xml", fingerprint, documents, chronos)
+"""
+
+import hashlib
+import logging
+import os
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+from .GE_dictionary import GE_Dictionary
+
+__all__ = ["CacheEntry", "Fingerprint", "ParseCache", "parse_cache"]
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_BYTES = 32 * 1024 * 1024  # budget, in bytes of source files
+
+
+@dataclass
+class CacheEntry:
+    """Parsed form of one file."""
+
+    stat_key: Tuple[int, int]  # (mtime_ns, size)
+    digest: Optional[str]  # None: only the unchanged stat_key is a hit
+    documents: List[Dict[str, Any]]
+    has_chronos: bool
+    ge_dictionary: Optional[GE_Dictionary] = None
+
+    @property
+    def size(self) -> int:
+        """Cost of the entry against the byte budget."""
+        return self.stat_key[1]
+
+
+class Fingerprint:
+    """
+    Identity of a file's content at one point in time.
+
+    ``(mtime, size)`` is read immediately; the content hash is only
+    computed when first needed. To cache a parse under its hash, call
+    :meth:`compute_digest` before parsing, so the hash belongs to the
+    content that was (at the latest) parsed.
+    """
+
+    def __init__(self, path: str):
+        """
+        :param str path: File path
+        :raises OSError: If the file cannot be stat'ed
+        """
+        self.path = os.path.abspath(path)
+        st = os.stat(self.path)
+        self.stat_key: Tuple[int, int] = (st.st_mtime_ns, st.st_size)
+        self._digest: Optional[str] = None
+
+    @property
+    def digest(self) -> str:
+        """SHA-256 of the file content, computed on first access."""
+        return self.compute_digest()
+
+    def compute_digest(self) -> str:
+        """
+        Hash the file content now, unless it was already hashed.
+
+        :return: SHA-256 of the file content
+        :rtype: str
+        :raises OSError: If the file cannot be read
+        """
+        if self._digest is None:
+            sha = hashlib.sha256()
+            with open(self.path, "rb") as f:
+                for block in iter(lambda: f.read(1024 * 1024), b""):
+                    sha.update(block)
+            self._digest = sha.hexdigest()
+        return self._digest
+
+    @property
+    def known_digest(self) -> Optional[str]:
+        """SHA-256 of the file content if already computed, else None."""
+        return self._digest
+
+
+class ParseCache:
+    """Thread-safe LRU cache of parsed files with a byte budget."""
+
+    def __init__(self, max_bytes: int = DEFAULT_CACHE_BYTES):
+        """
+        :param int max_bytes: Maximum total size of the cached files
+        """
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[str, CacheEntry]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def get(
+        self, path: str, fingerprint: Optional[Fingerprint] = None
+    ) -> Optional[CacheEntry]:
+        """
+        Return the entry of ``path`` if the file content did not change.
+
+        :param str path: Configuration file path
+        :param fingerprint: Fingerprint of the file, taken now if not given
+        :type fingerprint: Fingerprint, optional
+        :return: The cached entry, or None on a miss
+        :rtype: Optional[CacheEntry]
+        """
+        key = os.path.abspath(path)
+        with self._lock:
+            entry = self._entries.get(key)
+
+        if entry is not None:
+            try:
+                fingerprint = fingerprint or Fingerprint(key)
+                # Touched or rewritten: only a different content is a miss
+                if entry.stat_key != fingerprint.stat_key and (
+                    entry.digest is None or entry.digest != fingerprint.digest
+                ):
+                    entry = None
+            except OSError:
+                entry = None
+
+        with self._lock:
+            if entry is None or self._entries.get(key) is not entry:
+                self.misses += 1
+                return None
+            self.hits += 1
+            if entry.stat_key != fingerprint.stat_key:
+                self._bytes += fingerprint.stat_key[1] - entry.size
+                entry.stat_key = fingerprint.stat_key
+            self._entries.move_to_end(key)
+        logger.debug(f"Parse cache hit: {path}")
+        return entry
+
+    def put(
+        self,
+        path: str,
+        fingerprint: Fingerprint,
+        documents: List[Dict[str, Any]],
+        has_chronos: bool,
+    ) -> CacheEntry:
+        """
+        Store the parsed documents of ``path``.
+
+        :param str path: Configuration file path
+        :param Fingerprint fingerprint: Fingerprint taken *before* parsing,
+            so a file changed meanwhile is not cached under its new identity.
+            Its digest is only used if it was computed before parsing too;
+            it is never computed here, as the file may have changed since.
+        :param documents: Parsed documents
+        :param bool has_chronos: Whether a chronos-domain was found
+        :return: The new entry
+        :rtype: CacheEntry
+        """
+        key = os.path.abspath(path)
+        entry = CacheEntry(
+            fingerprint.stat_key, fingerprint.known_digest, documents, has_chronos
+        )
+
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= old.size
+            if entry.size <= self.max_bytes:
+                self._entries[key] = entry
+                self._bytes += entry.size
+            self._evict()
+        return entry
+
+    def invalidate(self, path: Optional[str] = None) -> None:
+        """
+        Drop the entry of ``path``, or every entry if no path is given.
+
+        :param path: Configuration file path
+        :type path: str, optional
+        """
+        with self._lock:
+            if path is None:
+                self._entries.clear()
+                self._bytes = 0
+                return
+            entry = self._entries.pop(os.path.abspath(path), None)
+            if entry is not None:
+                self._bytes -= entry.size
+
+    def _evict(self) -> None:
+        while self._bytes > self.max_bytes and self._entries:
+            path, entry = self._entries.popitem(last=False)
+            self._bytes -= entry.size
+            logger.debug(f"Parse cache evicted: {path}")
+
+
+# Process-wide cache used by UniversalParser
+parse_cache = ParseCache()
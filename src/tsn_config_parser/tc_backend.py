@@ -0,0 +1,658 @@
+# File: tc_backend.py
+"""
+tc_backend
+==========
+
+Pluggable backends for reading and changing traffic-control state.
+
+Two backends share the same interface and return the same structured
+:class:`Qdisc` / :class:`TCFilter` objects:
+
+- :class:`CLIBackend` runs the ``tc`` binary (JSON output, ``tc -batch``).
+- :class:`NetlinkBackend` talks rtnetlink over a persistent socket: it
+  lists and deletes, and programs the taprio/etf/clsact qdiscs and flower
+  filters Time Config Hub generates by encoding their ``tc`` commands
+  itself. It falls back to :class:`CLIBackend` for commands it does not
+  encode or is not permitted to run.
+
+Example
+-------
+
+.. code-block:: python
+
+    from tc_backend import get_tc_backend
+
+    backend = get_tc_backend("netlink")
+    for qdisc in backend.get_qdiscs("enp170s0"):
+        print(qdisc)
+"""
+
+import ipaddress
+import json
+import logging
+import socket
+import struct
+import subprocess
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .tc_command import _privileged, run_tc_batch
+from .tc_netlink import (
+    ETH_P_ALL,
+    FLOWER_PORT_KEYS,
+    TC_H_CLSACT,
+    TC_H_EGRESS,
+    TC_H_ROOT,
+    TCA_CLS_FLAGS_SKIP_HW,
+    TCA_CLS_FLAGS_SKIP_SW,
+    TCA_FLOWER_KEY_ETH_DST,
+    TCA_FLOWER_KEY_ETH_DST_MASK,
+    TCA_FLOWER_KEY_ETH_SRC,
+    TCA_FLOWER_KEY_ETH_SRC_MASK,
+    TCA_FLOWER_KEY_IP_PROTO,
+    TCA_FLOWER_KEY_IPV4_DST,
+    TCA_FLOWER_KEY_IPV4_DST_MASK,
+    TCA_FLOWER_KEY_IPV4_SRC,
+    TCA_FLOWER_KEY_IPV4_SRC_MASK,
+    NetlinkSocket,
+    etf_options,
+    flower_options,
+    goto_chain_action,
+    is_permission_error,
+    skbedit_priority_action,
+    taprio_options,
+    vlan_push_action,
+)
+
+__all__ = [
+    "Qdisc",
+    "TCFilter",
+    "TCBackend",
+    "CLIBackend",
+    "NetlinkBackend",
+    "get_tc_backend",
+]
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BACKEND = "netlink"
+
+
+@dataclass
+class Qdisc:
+    """A qdisc attached to an interface."""
+
+    kind: str
+    handle: str
+    parent: str
+    options: Dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def is_root(self) -> bool:
+        """True if the qdisc is attached at the root of the interface."""
+        return self.parent == "root"
+
+    def __str__(self) -> str:
+        opts = " ".join(f"{k} {v}" for k, v in self.options.items())
+        return f"qdisc {self.kind} {self.handle} parent {self.parent} {opts}".strip()
+
+
+@dataclass
+class TCFilter:
+    """A classifier rule attached to an interface."""
+
+    kind: str
+    pref: int
+    protocol: str
+    handle: int
+    chain: int = 0
+    options: Dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def in_hw(self) -> Optional[bool]:
+        """Hardware offload state reported by the kernel, if any."""
+        if self.options.get("in_hw"):
+            return True
+        if self.options.get("not_in_hw"):
+            return False
+        return None
+
+    def __str__(self) -> str:
+        opts = " ".join(f"{k} {v}" for k, v in self.options.items())
+        return (
+            f"filter protocol {self.protocol} pref {self.pref} {self.kind} "
+            f"chain {self.chain} handle {self.handle:#x} {opts}"
+        ).strip()
+
+
+def _format_handle(value: int) -> str:
+    """Format a 32-bit tc handle the way ``tc`` prints it (``100:``/``100:1``)."""
+    if value == TC_H_ROOT:
+        return "root"
+    major, minor = value >> 16, value & 0xFFFF
+    return f"{major:x}:{minor:x}" if minor else f"{major:x}:"
+
+
+def _ok(stdout: str = "") -> Dict[str, Any]:
+    return {"stdout": stdout, "stderr": "", "returncode": 0}
+
+
+class TCBackend:
+    """Interface shared by every tc backend."""
+
+    NAME = "base"
+
+    def get_qdiscs(self, interface: str) -> List[Qdisc]:
+        """Return the qdiscs attached to ``interface``."""
+        raise NotImplementedError
+
+    def get_filters(self, interface: str) -> List[TCFilter]:
+        """Return the egress filters attached to ``interface``."""
+        raise NotImplementedError
+
+    def delete_qdisc(self, interface: str, parent: str) -> Dict[str, Any]:
+        """Delete the ``root`` or ``clsact`` qdisc of ``interface``."""
+        raise NotImplementedError
+
+    def delete_filters(self, interface: str) -> Dict[str, Any]:
+        """Delete every egress filter of ``interface``."""
+        raise NotImplementedError
+
+    def run_batch(self, commands: List[str]) -> Dict[str, Any]:
+        """Program ``tc`` commands; see :func:`run_tc_batch`."""
+        return run_tc_batch(commands)
+
+    def execute_teardown(self, steps: List[Any]) -> Dict[str, Any]:
+        """
+        Execute a teardown plan (see :mod:`tsn_config_parser.tc_state`).
+
+        The result has the same shape as :func:`run_tc_batch`; the ``line``
+        of a failure is the 1-based index of the step in ``steps``.
+        """
+        return self.run_batch([step.command for step in steps])
+
+    def close(self) -> None:
+        """Release resources held by the backend."""
+        return None
+
+
+class CLIBackend(TCBackend):
+    """Backend driving the ``tc`` binary."""
+
+    NAME = "cli"
+
+    def _run(self, argv: List[str], privileged: bool = False) -> Dict[str, Any]:
+        if privileged:
+            argv = _privileged(argv)
+        process = subprocess.run(argv, capture_output=True, text=True)
+        return {
+            "stdout": process.stdout.strip(),
+            "stderr": process.stderr.strip(),
+            "returncode": process.returncode,
+        }
+
+    def _show_json(self, argv: List[str]) -> List[Dict[str, Any]]:
+        result = self._run(["tc", "-j"] + argv)
+        if result["returncode"] != 0:
+            raise RuntimeError(f"tc {' '.join(argv)} failed: {result['stderr']}")
+        return json.loads(result["stdout"] or "[]")
+
+    def get_qdiscs(self, interface: str) -> List[Qdisc]:
+        qdiscs = []
+        for entry in self._show_json(["qdisc", "show", "dev", interface]):
+            qdiscs.append(
+                Qdisc(
+                    kind=entry.get("kind", ""),
+                    handle=entry.get("handle", "0:"),
+                    parent="root" if entry.get("root") else entry.get("parent", ""),
+                    options=entry.get("options") or {},
+                )
+            )
+        return qdiscs
+
+    def get_filters(self, interface: str) -> List[TCFilter]:
+        filters = []
+        for entry in self._show_json(["filter", "show", "dev", interface, "egress"]):
+            options = dict(entry.get("options") or {})
+            handle = options.pop("handle", None)
+            if handle is None:
+                # Per-pref header line, not a rule
+                continue
+            filters.append(
+                TCFilter(
+                    kind=entry.get("kind", ""),
+                    pref=entry.get("pref", 0),
+                    protocol=entry.get("protocol", ""),
+                    handle=int(str(handle), 0),
+                    chain=entry.get("chain", 0),
+                    options=options,
+                )
+            )
+        return filters
+
+    def delete_qdisc(self, interface: str, parent: str) -> Dict[str, Any]:
+        return self._run(
+            ["tc", "qdisc", "del", "dev", interface, parent], privileged=True
+        )
+
+    def delete_filters(self, interface: str) -> Dict[str, Any]:
+        return self._run(
+            ["tc", "filter", "del", "dev", interface, "egress"], privileged=True
+        )
+
+
+class NetlinkBackend(CLIBackend):
+    """
+    Backend using an in-process rtnetlink socket.
+
+    Listing, deletion and programming are done over netlink: the ``tc``
+    commands of a batch are encoded in-process (see
+    :func:`_netlink_request`). A batch holding a command that is not
+    encoded here goes to :meth:`CLIBackend.run_batch` as a whole, and any
+    netlink request the kernel refuses with EPERM (process without
+    ``CAP_NET_ADMIN``) is retried through the privileged CLI path.
+    """
+
+    NAME = "netlink"
+
+    def __init__(self):
+        self._nl = NetlinkSocket()
+
+    def close(self) -> None:
+        self._nl.close()
+
+    def get_qdiscs(self, interface: str) -> List[Qdisc]:
+        return [
+            Qdisc(
+                kind=msg["kind"],
+                handle=_format_handle(msg["handle"]),
+                parent=_format_handle(msg["parent"]),
+                options=msg["options"],
+            )
+            for msg in self._nl.dump_qdiscs(interface)
+        ]
+
+    def get_filters(self, interface: str) -> List[TCFilter]:
+        filters = []
+        for msg in self._nl.dump_filters(interface, TC_H_EGRESS):
+            if not msg["handle"]:
+                # Per-pref header entry, not a rule
+                continue
+            protocol = socket.ntohs(msg["info"] & 0xFFFF)
+            filters.append(
+                TCFilter(
+                    kind=msg["kind"],
+                    pref=msg["info"] >> 16,
+                    protocol=_PROTOCOL_NAMES.get(protocol, f"{protocol:#06x}"),
+                    handle=msg["handle"],
+                    chain=msg["chain"] or 0,
+                    options=msg["options"],
+                )
+            )
+        return filters
+
+    def delete_qdisc(self, interface: str, parent: str) -> Dict[str, Any]:
+        parent_id = TC_H_CLSACT if parent == "clsact" else TC_H_ROOT
+        try:
+            self._nl.del_qdisc(interface, parent_id)
+        except OSError as exc:
+            if is_permission_error(exc):
+                return super().delete_qdisc(interface, parent)
+            return {"stdout": "", "stderr": str(exc), "returncode": 1}
+        return _ok()
+
+    def run_batch(self, commands: List[str]) -> Dict[str, Any]:
+        """
+        Program ``tc`` commands over netlink, in order.
+
+        Like ``tc -force -batch``, a failing command does not stop the
+        following ones. The result has the shape of :func:`run_tc_batch`.
+        """
+        try:
+            requests = [_netlink_request(command) for command in commands]
+        except (ValueError, KeyError, IndexError, TypeError) as exc:
+            logger.debug(f"Not encoded over netlink ({exc}); using tc -batch")
+            return super().run_batch(commands)
+
+        failures: List[Dict[str, Any]] = []
+        for line, (command, request) in enumerate(zip(commands, requests), start=1):
+            try:
+                request(self._nl)
+            except OSError as exc:
+                if is_permission_error(exc):
+                    # Not allowed in-process: hand the rest to sudo tc
+                    failures += self._run_rest_with_cli(commands, line)
+                    break
+                failures.append({"line": line, "command": command, "stderr": str(exc)})
+
+        return {
+            "stdout": "",
+            "stderr": "\n".join(f["stderr"] for f in failures),
+            "returncode": 1 if failures else 0,
+            "failures": failures,
+        }
+
+    def _run_rest_with_cli(
+        self, commands: List[str], line: int
+    ) -> List[Dict[str, Any]]:
+        """Run ``commands`` from ``line`` on with ``tc -batch``; return failures."""
+        rest = commands[line - 1 :]
+        result = super().run_batch(rest)
+        failures = result["failures"]
+        if result["returncode"] != 0 and not failures:
+            # tc itself failed (e.g. sudo refused): nothing was programmed
+            failures = [
+                {"line": i, "command": cmd, "stderr": result["stderr"]}
+                for i, cmd in enumerate(rest, start=1)
+            ]
+        return [{**f, "line": f["line"] + line - 1} for f in failures]
+
+    def delete_filters(self, interface: str) -> Dict[str, Any]:
+        try:
+            self._nl.del_filter(interface, TC_H_EGRESS)
+        except OSError as exc:
+            if is_permission_error(exc):
+                return super().delete_filters(interface)
+            return {"stdout": "", "stderr": str(exc), "returncode": 1}
+        return _ok()
+
+
+_PROTOCOL_NAMES = {
+    0x0800: "ip",
+    0x86DD: "ipv6",
+    0x8100: "802.1Q",
+    0x0003: "all",
+}
+_PROTOCOLS = {name: number for number, name in _PROTOCOL_NAMES.items()}
+
+_CLOCK_IDS = {
+    "CLOCK_REALTIME": 0,
+    "CLOCK_MONOTONIC": 1,
+    "CLOCK_BOOTTIME": 7,
+    "CLOCK_TAI": 11,
+}
+_TAPRIO_COMMANDS = {"S": 0, "H": 1, "R": 2}
+_IP_PROTOS = {
+    "tcp": socket.IPPROTO_TCP,
+    "udp": socket.IPPROTO_UDP,
+    "sctp": socket.IPPROTO_SCTP,
+}
+_ETH_ADDR_KEYS = {
+    "src_mac": (TCA_FLOWER_KEY_ETH_SRC, TCA_FLOWER_KEY_ETH_SRC_MASK),
+    "dst_mac": (TCA_FLOWER_KEY_ETH_DST, TCA_FLOWER_KEY_ETH_DST_MASK),
+}
+_IPV4_ADDR_KEYS = {
+    "src_ip": (TCA_FLOWER_KEY_IPV4_SRC, TCA_FLOWER_KEY_IPV4_SRC_MASK),
+    "dst_ip": (TCA_FLOWER_KEY_IPV4_DST, TCA_FLOWER_KEY_IPV4_DST_MASK),
+}
+
+NetlinkRequest = Callable[[NetlinkSocket], Any]
+
+
+def _netlink_request(command: str) -> NetlinkRequest:
+    """
+    Encode one ``tc`` command as a netlink request.
+
+    Understands the commands Time Config Hub generates: ``qdisc
+    add|replace`` of taprio, etf and clsact, ``qdisc del`` of the root and
+    clsact qdiscs, and egress ``filter add|del`` of flower rules with vlan
+    push, skbedit priority and goto chain actions. Values are parsed the
+    way ``tc`` parses them.
+
+    :param str command: ``tc`` command, with or without the leading ``tc``
+    :return: Callable sending the request on a :class:`NetlinkSocket`
+    :raises ValueError: If the command is not one of those
+    """
+    words = command.split()
+    if words[:1] == ["tc"]:
+        words = words[1:]
+    if len(words) < 4 or words[2] != "dev":
+        raise ValueError(f"unsupported tc command: {command}")
+    obj, verb, _, interface, *args = words
+    if obj == "qdisc":
+        return _qdisc_request(verb, interface, args)
+    if obj == "filter":
+        return _filter_request(verb, interface, args)
+    raise ValueError(f"unsupported tc object: {obj}")
+
+
+def _classid(text: str) -> int:
+    """Parse a tc class id (``root``, ``100:1``, ``100:``) like ``tc``."""
+    if text == "root":
+        return TC_H_ROOT
+    major, sep, minor = text.partition(":")
+    if not sep:
+        return int(major, 16)
+    return (int(major or "0", 16) << 16) | int(minor or "0", 16)
+
+
+def _qdisc_handle(text: str) -> int:
+    """Parse a qdisc handle (``100`` or ``100:``) like ``tc``."""
+    major, _, minor = text.partition(":")
+    if minor:
+        raise ValueError(f"invalid qdisc handle: {text}")
+    return int(major, 16) << 16
+
+
+def _qdisc_request(verb: str, interface: str, args: List[str]) -> NetlinkRequest:
+    if verb in ("del", "delete"):
+        (parent,) = args
+        parent_id = {"root": TC_H_ROOT, "clsact": TC_H_CLSACT}[parent]
+        return lambda nl: nl.del_qdisc(interface, parent_id)
+    if verb not in ("add", "replace"):
+        raise ValueError(f"unsupported qdisc command: {verb}")
+    if args == ["clsact"] and verb == "add":
+        return lambda nl: nl.add_clsact(interface)
+
+    parent: Optional[int] = None
+    handle = 0
+    while args[0] in ("root", "parent", "handle"):
+        if args[0] == "root":
+            parent, args = TC_H_ROOT, args[1:]
+        elif args[0] == "parent":
+            parent, args = _classid(args[1]), args[2:]
+        else:
+            handle, args = _qdisc_handle(args[1]), args[2:]
+    if parent is None:
+        raise ValueError("qdisc without parent")
+
+    kind, options = args[0], {"taprio": _taprio, "etf": _etf}[args[0]](args[1:])
+    replace = verb == "replace"
+    return lambda nl: nl.new_qdisc(interface, parent, handle, kind, options, replace)
+
+
+def _taprio(args: List[str]) -> bytes:
+    """Encode the options of a ``taprio`` qdisc command."""
+    params: Dict[str, Any] = {"prio_map": [], "queues": [], "entries": []}
+    i = 0
+    while i < len(args):
+        word = args[i]
+        if word == "num_tc":
+            params["num_tc"] = int(args[i + 1])
+            i += 2
+        elif word == "map":
+            i += 1
+            while i < len(args) and args[i].isdigit():
+                params["prio_map"].append(int(args[i]))
+                i += 1
+        elif word == "queues":
+            i += 1
+            while i < len(args) and "@" in args[i]:
+                count, offset = args[i].split("@")
+                params["queues"].append((int(count), int(offset)))
+                i += 1
+        elif word == "sched-entry":
+            command, mask, interval = args[i + 1 : i + 4]
+            params["entries"].append(
+                (_TAPRIO_COMMANDS[command], int(mask, 16), int(interval, 0))
+            )
+            i += 4
+        else:
+            key, value = _TAPRIO_VALUES[word]
+            params[key] = value(args[i + 1])
+            i += 2
+    return taprio_options(**params)
+
+
+_TAPRIO_VALUES: Dict[str, Tuple[str, Callable[[str], int]]] = {
+    "base-time": ("base_time", int),
+    "cycle-time": ("cycle_time", int),
+    "cycle-time-extension": ("cycle_time_extension", int),
+    "flags": ("flags", lambda value: int(value, 0)),
+    "txtime-delay": ("txtime_delay", lambda value: int(value, 0)),
+    "clockid": ("clockid", _CLOCK_IDS.__getitem__),
+}
+
+
+def _etf(args: List[str]) -> bytes:
+    """Encode the options of an ``etf`` qdisc command."""
+    params: Dict[str, Any] = {}
+    i = 0
+    while i < len(args):
+        word = args[i]
+        if word in ("offload", "skip_sock_check", "deadline_mode"):
+            params[word] = True
+            i += 1
+        elif word == "delta":
+            params["delta"] = int(args[i + 1])
+            i += 2
+        elif word == "clockid":
+            params["clockid"] = _CLOCK_IDS[args[i + 1]]
+            i += 2
+        else:
+            raise ValueError(f"unsupported etf option: {word}")
+    return etf_options(**params)
+
+
+def _filter_request(verb: str, interface: str, args: List[str]) -> NetlinkRequest:
+    if args[:1] != ["egress"]:
+        raise ValueError("only egress filters are supported")
+    args = args[1:]
+    chain: Optional[int] = None
+    protocol = ETH_P_ALL if verb == "add" else 0
+    pref = handle = 0
+    while args and args[0] in ("chain", "protocol", "pref", "prio", "handle"):
+        word, value, args = args[0], args[1], args[2:]
+        if word == "chain":
+            chain = int(value, 0)
+        elif word == "protocol":
+            protocol = _PROTOCOLS[value]
+        elif word == "handle":
+            handle = int(value, 0)
+        else:
+            pref = int(value, 0)
+
+    if verb in ("del", "delete"):
+        kind = args[0] if args else None
+        if args[1:]:
+            raise ValueError("filter del with options")
+        return lambda nl: nl.del_filter(
+            interface, TC_H_EGRESS, pref, protocol, handle, kind, chain
+        )
+    if verb != "add" or args[:1] != ["flower"]:
+        raise ValueError(f"unsupported filter command: {verb}")
+    options = _flower(protocol, args[1:])
+    return lambda nl: nl.new_filter(
+        interface, TC_H_EGRESS, pref, protocol, handle, "flower", options, chain
+    )
+
+
+def _flower(eth_type: int, args: List[str]) -> bytes:
+    """Encode the match keys, flags and actions of a ``flower`` filter."""
+    flags = 0
+    keys: List[Tuple[int, bytes]] = []
+    actions: List[bytes] = []
+    ip_proto: Optional[int] = None
+    i = 0
+    while i < len(args):
+        word = args[i]
+        if word == "skip_sw":
+            flags |= TCA_CLS_FLAGS_SKIP_SW
+            i += 1
+        elif word == "skip_hw":
+            flags |= TCA_CLS_FLAGS_SKIP_HW
+            i += 1
+        elif word == "action":
+            action, i = _action(args, i + 1)
+            actions.append(action)
+        else:
+            value = args[i + 1]
+            i += 2
+            if word in _ETH_ADDR_KEYS:
+                addr = bytes.fromhex(value.replace(":", ""))
+                if len(addr) != 6:
+                    raise ValueError(f"invalid MAC address: {value}")
+                key, mask = _ETH_ADDR_KEYS[word]
+                keys += [(key, addr), (mask, b"\xff" * 6)]
+            elif word in _IPV4_ADDR_KEYS:
+                addr = ipaddress.IPv4Interface(value)
+                key, mask = _IPV4_ADDR_KEYS[word]
+                keys += [(key, addr.ip.packed), (mask, addr.netmask.packed)]
+            elif word == "ip_proto":
+                ip_proto = _IP_PROTOS.get(value)
+                if ip_proto is None:
+                    ip_proto = int(value, 16)
+                keys.append((TCA_FLOWER_KEY_IP_PROTO, struct.pack("=B", ip_proto)))
+            elif word in ("src_port", "dst_port"):
+                src_key, dst_key = FLOWER_PORT_KEYS[ip_proto]
+                key = src_key if word == "src_port" else dst_key
+                keys.append((key, struct.pack("!H", int(value))))
+            else:
+                raise ValueError(f"unsupported flower option: {word}")
+    return flower_options(eth_type, keys, actions, flags)
+
+
+def _action(args: List[str], i: int) -> Tuple[bytes, int]:
+    """Encode the action starting at ``args[i]``; return it and the next index."""
+    end = args.index("action", i) if "action" in args[i:] else len(args)
+    words = args[i:end]
+    if words[-1:] == ["pipe"]:
+        words = words[:-1]
+
+    if words[:2] == ["goto", "chain"] and len(words) == 3:
+        return goto_chain_action(int(words[2], 0)), end
+    if words[:1] == ["skbedit"] and words[1:2] == ["priority"] and len(words) == 3:
+        return skbedit_priority_action(_classid(words[2])), end
+    if words[:2] == ["vlan", "push"]:
+        options = dict(zip(words[2::2], words[3::2]))
+        if set(options) - {"id", "protocol", "priority"} or len(words) % 2:
+            raise ValueError(f"unsupported vlan action: {' '.join(words)}")
+        return (
+            vlan_push_action(
+                int(options["id"], 0),
+                int(options.get("priority", "0"), 0),
+                _PROTOCOLS[options.get("protocol", "802.1Q")],
+            ),
+            end,
+        )
+    raise ValueError(f"unsupported action: {' '.join(words)}")
+
+
+_BACKENDS = {
+    CLIBackend.NAME: CLIBackend,
+    NetlinkBackend.NAME: NetlinkBackend,
+}
+
+
+def get_tc_backend(name: Optional[str] = None) -> TCBackend:
+    """
+    Create the tc backend named ``name`` (``"netlink"`` or ``"cli"``).
+
+    If the netlink socket cannot be opened the CLI backend is returned.
+
+    :param name: Backend name. Defaults to ``"netlink"``.
+    :type name: str, optional
+    :return: A ready-to-use backend.
+    :rtype: TCBackend
+    :raises ValueError: If ``name`` is not a known backend.
+    """
+    name = (name or DEFAULT_BACKEND).lower()
+    backend_cls = _BACKENDS.get(name)
+    if backend_cls is None:
+        raise ValueError(f"Unknown tc backend: {name}")
+
+    try:
+        return backend_cls()
+    except OSError as exc:
+        logger.warning(f"tc backend '{name}' unavailable ({exc}); using tc CLI")
+        return CLIBackend()
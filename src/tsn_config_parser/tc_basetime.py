@@ -0,0 +1,123 @@
+# File: tc_basetime.py
+"""
+tc_basetime
+===========
+
+Choose the taprio ``base-time`` of an apply so schedules keep a fixed phase:
+
+- the current time is read from ``CLOCK_TAI`` (the clock taprio runs on),
+  or from the PTP hardware clock of an interface when asked to;
+- the base-time is the first cycle boundary at least ``lead`` nanoseconds
+  ahead, where boundaries are ``phase + k * cycle_time`` on the TAI
+  timescale and ``phase`` comes from ``admin-base-time``.
+
+Because boundaries only depend on the cycle time and the phase, every
+interface of one apply gets the same base-time and a re-apply with the same
+cycle lands on the same phase, so streams keep their position in the cycle.
+
+Example
+-------
+
+.. code-block:: python
+
+    now = read_clock_ns()
+    base = align_base_time(now, cycle_time=1000000, lead=10**9)
+"""
+
+import logging
+import os
+import time
+from typing import Optional
+
+__all__ = [
+    "CLOCK_PHC",
+    "CLOCK_TAI",
+    "DEFAULT_BASE_TIME_LEAD",
+    "align_base_time",
+    "phc_device",
+    "read_clock_ns",
+]
+
+logger = logging.getLogger(__name__)
+
+CLOCK_TAI = "tai"
+CLOCK_PHC = "phc"
+
+DEFAULT_BASE_TIME_LEAD = 1_000_000_000  # ns between now and the base-time
+
+_CLOCKFD = 3  # linux/posix-timers.h: dynamic clock of an open PHC device
+
+
+def align_base_time(now: int, cycle_time: int, lead: int = 0, phase: int = 0) -> int:
+    """
+    Return the first cycle boundary at or after ``now + lead``.
+
+    :param now: Current time in nanoseconds.
+    :type now: int
+    :param cycle_time: Cycle time in nanoseconds; 0 or less only adds ``lead``.
+    :type cycle_time: int
+    :param lead: Minimum distance from ``now`` in nanoseconds.
+    :type lead: int
+    :param phase: Offset of the boundaries from the epoch (``admin-base-time``).
+    :type phase: int
+    :return: Base-time in nanoseconds.
+    :rtype: int
+    """
+    earliest = now + max(0, lead)
+    if cycle_time <= 0:
+        return earliest
+    cycles = -(-(earliest - phase) // cycle_time)  # ceiling division
+    return phase + cycles * cycle_time
+
+
+def phc_device(interface: str, sysfs_root: str = "/sys") -> Optional[str]:
+    """
+    Return the PTP hardware clock device of an interface.
+
+    :param interface: Network interface name.
+    :type interface: str
+    :param sysfs_root: Mount point of sysfs.
+    :type sysfs_root: str
+    :return: Device path such as ``/dev/ptp0``, or None without a PHC.
+    :rtype: Optional[str]
+    """
+    ptp_dir = os.path.join(sysfs_root, "class", "net", interface, "device", "ptp")
+    try:
+        clocks = sorted(os.listdir(ptp_dir))
+    except OSError:
+        return None
+    return f"/dev/{clocks[0]}" if clocks else None
+
+
+def _read_phc_ns(device: str) -> int:
+    fd = os.open(device, os.O_RDONLY)
+    try:
+        return time.clock_gettime_ns((~fd << 3) | _CLOCKFD)
+    finally:
+        os.close(fd)
+
+
+def read_clock_ns(clock: str = CLOCK_TAI, interface: Optional[str] = None) -> int:
+    """
+    Read the current time used to plan the base-time.
+
+    :param clock: :data:`CLOCK_TAI`, or :data:`CLOCK_PHC` to read the PTP
+                  hardware clock of ``interface``; falls back to ``CLOCK_TAI``
+                  if the PHC cannot be read.
+    :type clock: str
+    :param interface: Interface whose PHC is read.
+    :type interface: str, optional
+    :return: Current time in nanoseconds on the TAI timescale.
+    :rtype: int
+    """
+    if clock == CLOCK_PHC and interface:
+        device = phc_device(interface)
+        if device:
+            try:
+                return _read_phc_ns(device)
+            except OSError as e:
+                logger.warning(f"Cannot read {device} of {interface}: {e}")
+        else:
+            logger.warning(f"{interface} has no PTP hardware clock")
+        logger.warning("Planning base-time with CLOCK_TAI")
+    return time.clock_gettime_ns(time.CLOCK_TAI)
@@ -28,17 +28,31 @@ Example
 
     for c in cmds:
         print(run_tc_command(c))
+
+    # Or program every command with one privileged process
+    result = run_tc_batch(cmds)
+    for failure in result["failures"]:
+        print(failure["line"], failure["command"], failure["stderr"])
 """
 
+import os
+import re
 import socket
 import subprocess
-import time
-from typing import Any, Dict, List, Optional
+from typing import TYPE_CHECKING, Any, Dict, List, Mapping, Optional
+
+from .tc_basetime import align_base_time, read_clock_ns
+from .tc_settle import (
+    DEFAULT_SETTLE_TIMEOUT,
+    link_has_carrier,
+    link_settled,
+    wait_for_settle,
+)
 
-__all__ = ["create_tc_qdisc_gcl_command", "run_tc_command"]
+if TYPE_CHECKING:  # tc_state imports tc_backend, which imports this module
+    from .tc_state import InterfaceState
 
-safety_delay = 1  # seconds , this will be replaced in the i226 hw file.
-current_chain_number = 0  # Global chain number tracker
+__all__ = ["create_tc_qdisc_gcl_command", "run_tc_command", "run_tc_batch"]
 
 # TODO: Wrap all functions into a class for better state management with Device context
 # TODO: Migrate to time_config_hub.commands.tc_command
@@ -53,8 +67,11 @@ def create_tc_qdisc_gcl_command(
     queues_str: Optional[str] = None,
     handle_id: Optional[str] = None,
     flags: str = "0x1",
-    txtime_delay: int = 200000,
+    txtime_delay: Optional[int] = 200000,
     delta: int = 175000,
+    etf_classes: Optional[List[int]] = None,
+    cycle_time: Optional[int] = None,
+    cycle_time_extension: Optional[int] = None,
 ) -> List[str]:
     """
     Create ``tc qdisc taprio`` commands with Gate Control List (GCL) entries.
@@ -66,8 +83,9 @@ def create_tc_qdisc_gcl_command(
     :type gcl: List[str]
     :param num_tc: Number of traffic classes to configure. Defaults to 4.
     :type num_tc: int
-    :param base_time: Base time in nanoseconds. If ``None``, the current system
-                      time is used (from :func:`time.time_ns`).
+    :param base_time: Base time in nanoseconds. If ``None``, the current
+                      ``CLOCK_TAI`` time, rounded up to a multiple of
+                      ``cycle_time`` if given.
     :type base_time: int, optional
     :param map_str: The traffic class mapping string. If ``None``, defaults to
                     ``"0 1 2 3 0 0 0 0 0 0 0 0 0 0 0 0"``.
@@ -78,14 +96,27 @@ def create_tc_qdisc_gcl_command(
     :param handle_id: unique identifier for taprio tc qdisc. If ``None``, defaults to
                        ``"100"``.
     :type handle_id: str, optional
-    :param flags: Flags value to pass to ``taprio`` (default: ``"0x2"``).
+    :param flags: Flags value to pass to ``taprio`` (default: ``"0x1"``).
     :type flags: str
+    :param txtime_delay: ``txtime-delay`` of txtime-assist mode; ``None`` omits it.
+    :type txtime_delay: int, optional
+    :param delta: ``delta`` of the ETF qdiscs in nanoseconds.
+    :type delta: int
+    :param etf_classes: Traffic classes (1-based) that get an ETF qdisc. If
+                        ``None``, every class gets one.
+    :type etf_classes: List[int], optional
+    :param cycle_time: ``cycle-time`` in nanoseconds. If ``None``, taprio uses
+                       the sum of the GCL intervals.
+    :type cycle_time: int, optional
+    :param cycle_time_extension: ``cycle-time-extension`` in nanoseconds; ``None``
+                                 omits it.
+    :type cycle_time_extension: int, optional
 
     :return: A list of complete ``tc qdisc taprio`` commands as multi-line strings.
     :rtype: List[str]
     """
     if base_time is None:
-        base_time = time.time_ns()  # default to "now"
+        base_time = align_base_time(read_clock_ns(), cycle_time or 0)
 
     if map_str is None:
         map_str = "0 1 2 3" + " 0" * 12
@@ -111,11 +142,17 @@ def create_tc_qdisc_gcl_command(
         for entry in gcl:
             cmd_lines.append(f" {entry} ")
 
+        if cycle_time is not None:
+            cmd_lines.append(f"cycle-time {cycle_time}")
+        if cycle_time_extension is not None:
+            cmd_lines.append(f"cycle-time-extension {cycle_time_extension}")
+
         # Add flags
         cmd_lines.append(f"flags {flags}")
 
         # Add txtime-delay
-        cmd_lines.append(f"txtime-delay {txtime_delay} ")
+        if txtime_delay is not None:
+            cmd_lines.append(f"txtime-delay {txtime_delay} ")
 
         # Add flags
         cmd_lines.append("clockid CLOCK_TAI ")
@@ -123,7 +160,7 @@ def create_tc_qdisc_gcl_command(
 
         # Enrol additional tc configuration for hybrid (SW Qbv + ETF LaunchTime)
         # Add ETF qdisc for each traffic class (1-based index)
-        for q in range(1, num_tc + 1):
+        for q in etf_classes if etf_classes is not None else range(1, num_tc + 1):
             commands.append(
                 f"tc qdisc replace dev {iface} parent {handle_id}:{q} etf "
                 f"skip_sock_check offload delta {delta} clockid CLOCK_TAI "
@@ -149,26 +186,129 @@ def run_tc_command(command: str) -> Dict[str, Any]:
         f"sudo {command}", shell=True, capture_output=True, text=True
     )
 
-    # Safety delay
-    time.sleep(safety_delay)
+    return {
+        "stdout": process.stdout.strip(),
+        "stderr": process.stderr.strip(),
+        "returncode": process.returncode,
+    }
+
+
+def _privileged(argv: List[str]) -> List[str]:
+    """Prefix ``argv`` with ``sudo`` unless we already run as root."""
+    if os.geteuid() == 0:
+        return argv
+    return ["sudo"] + argv
+
+
+# ``tc -batch`` reports each failing line as "Command failed <file>:<line>"
+_BATCH_FAILURE_RE = re.compile(r"^Command failed (?P<file>\S+):(?P<line>\d+)$")
+
+
+def run_tc_batch(commands: List[str]) -> Dict[str, Any]:
+    """
+    Execute several ``tc`` commands with a single ``tc -batch`` process.
+
+    Every command is written as one line of the batch stream (the leading
+    ``tc`` word is stripped). ``-force`` keeps ``tc`` going after a failing
+    line, so one bad rule does not prevent the rest from being programmed.
+    No safety delay is applied; the call returns as soon as the kernel has
+    processed the whole stream.
+
+    :param commands: Full ``tc`` command strings, as produced by
+                     :func:`create_tc_qdisc_gcl_command` and the
+                     ``create_tc_filter_commands_for_*`` helpers.
+    :type commands: List[str]
+
+    :return: A dictionary containing:
+             - ``stdout``: Standard output of the batch
+             - ``stderr``: Standard error of the batch
+             - ``returncode``: Exit status code (0 means every line succeeded)
+             - ``failures``: List of ``{"line", "command", "stderr"}`` dicts,
+               one per failed command, ``line`` being the 1-based index into
+               ``commands``
+    :rtype: Dict[str, Any]
+    """
+    if not commands:
+        return {"stdout": "", "stderr": "", "returncode": 0, "failures": []}
+
+    lines = []
+    for cmd in commands:
+        cmd = " ".join(cmd.split())
+        if cmd.startswith("tc "):
+            cmd = cmd[3:]
+        lines.append(cmd)
+
+    process = subprocess.run(
+        _privileged(["tc", "-force", "-batch", "-"]),
+        input="\n".join(lines) + "\n",
+        capture_output=True,
+        text=True,
+    )
+
+    failures = _parse_batch_failures(process.stderr, commands)
 
     return {
         "stdout": process.stdout.strip(),
         "stderr": process.stderr.strip(),
         "returncode": process.returncode,
+        "failures": failures,
     }
 
 
-def reset_root_qdisc_interface(interface: str) -> Dict[str, Dict[str, str]]:
+def _parse_batch_failures(stderr: str, commands: List[str]) -> List[Dict[str, Any]]:
+    """
+    Map ``tc -batch`` error output back to the commands that caused it.
+
+    ``tc`` prints the kernel/parser error for a line first and then the
+    ``Command failed -:<line>`` marker, so every message seen since the
+    previous marker belongs to the line named by the next one.
+
+    :param stderr: Standard error of the ``tc -batch`` process.
+    :type stderr: str
+    :param commands: Commands in the order they were written to the batch.
+    :type commands: List[str]
+    :return: One ``{"line", "command", "stderr"}`` dict per failed line.
+    :rtype: List[Dict[str, Any]]
+    """
+    failures: List[Dict[str, Any]] = []
+    pending: List[str] = []
+
+    for raw in stderr.splitlines():
+        text = raw.strip()
+        match = _BATCH_FAILURE_RE.match(text)
+        if not match:
+            if text:
+                pending.append(text)
+            continue
+
+        line = int(match.group("line"))
+        failures.append(
+            {
+                "line": line,
+                "command": commands[line - 1] if 0 < line <= len(commands) else "",
+                "stderr": "\n".join(pending),
+            }
+        )
+        pending = []
+
+    return failures
+
+
+def reset_root_qdisc_interface(
+    interface: str, settle_timeout: float = DEFAULT_SETTLE_TIMEOUT
+) -> Dict[str, Dict[str, str]]:
     """
     Reset the root qdisc (queue discipline) for a specified network interface.
 
     This function checks if a root qdisc exists on the given interface. If no root qdisc
     is found, it returns a success response. Otherwise, it deletes the root qdisc using
-    the tc (traffic control) command and applies a safety delay before returning.
+    the tc (traffic control) command and waits for the interface to settle before
+    returning.
 
     Args:
         interface (str): The name of the network interface (e.g., 'eth0', 'enp0s3').
+        settle_timeout (float): Upper bound in seconds to wait for the interface
+            to settle after the deletion.
 
     Returns:
         Dict[str, Dict[str, str]]: A dict with the command execution results with keys:
@@ -177,23 +317,26 @@ def reset_root_qdisc_interface(interface: str) -> Dict[str, Dict[str, str]]:
             - 'returncode' (int): The return code of the command (0 for success).
 
     Note:
-        A safety delay is applied after deleting the qdisc to ensure the system
-        has time to process the changes.
+        The settle wait returns as soon as the link is back to its previous
+        carrier state instead of sleeping a fixed delay.
     """
 
     output = show_qdisc(interface)
     if "root" in output["stdout"]:
         cmd = f"tc qdisc del dev {interface} root"
+        had_carrier = link_has_carrier(interface)
         res = run_tc_command(cmd)
-        # Safety delay
-        time.sleep(safety_delay)
+        # Wait for the NIC to finish reprogramming, bounded by settle_timeout
+        wait_for_settle(lambda: link_settled(interface, had_carrier), settle_timeout)
     # No qdisc exists, return success
     res = {"stdout": "", "stderr": "", "returncode": 0}
 
     return res
 
 
-def reset_clsact_qdisc_interface(interface: str) -> Dict[str, str]:
+def reset_clsact_qdisc_interface(
+    interface: str, settle_timeout: float = DEFAULT_SETTLE_TIMEOUT
+) -> Dict[str, str]:
     """
     Reset the clsact qdisc on a specific interface by deleting
     the clsact qdisc. This function is idempotent:
@@ -201,6 +344,9 @@ def reset_clsact_qdisc_interface(interface: str) -> Dict[str, str]:
 
     :param interface: The network interface to reset (e.g., ``"enp170s0"``).
     :type interface: str
+    :param settle_timeout: Upper bound in seconds to wait for the interface to
+                           settle after the deletion.
+    :type settle_timeout: float
 
     :return: A dictionary containing:
              - ``stdout``: Standard output of the command
@@ -220,15 +366,18 @@ def reset_clsact_qdisc_interface(interface: str) -> Dict[str, str]:
     output = show_qdisc(interface)
     if "clsact" in output["stdout"]:
         cmd = f"tc qdisc del dev {interface} clsact"
+        had_carrier = link_has_carrier(interface)
         res = run_tc_command(cmd)
-        # Safety delay
-        time.sleep(safety_delay)
+        # Wait for the NIC to finish reprogramming, bounded by settle_timeout
+        wait_for_settle(lambda: link_settled(interface, had_carrier), settle_timeout)
     # No clsact qdisc exists, return success
     res = {"stdout": "", "stderr": "", "returncode": 0}
     return res
 
 
-def reset_egress_filter_interface(interface: str) -> Dict[str, str]:
+def reset_egress_filter_interface(
+    interface: str, settle_timeout: float = DEFAULT_SETTLE_TIMEOUT
+) -> Dict[str, str]:
     """
     Reset all tc filters on a specific interface by deleting
     all egress filters. This function is idempotent:
@@ -236,6 +385,9 @@ def reset_egress_filter_interface(interface: str) -> Dict[str, str]:
 
     :param interface: The network interface to reset (e.g., ``"enp170s0"``).
     :type interface: str
+    :param settle_timeout: Upper bound in seconds to wait for the interface to
+                           settle after the deletion.
+    :type settle_timeout: float
 
     :return: A dictionary containing:
              - ``stdout``: Standard output of the command
@@ -255,9 +407,10 @@ def reset_egress_filter_interface(interface: str) -> Dict[str, str]:
     output = show_tc_egress_filters(interface)
     if "filter" in output["stdout"]:
         cmd = f"tc filter del dev {interface} egress"
+        had_carrier = link_has_carrier(interface)
         res = run_tc_command(cmd)
-        # Safety delay
-        time.sleep(safety_delay)
+        # Wait for the NIC to finish reprogramming, bounded by settle_timeout
+        wait_for_settle(lambda: link_settled(interface, had_carrier), settle_timeout)
     # No egress filters exist, return success
     res = {"stdout": "", "stderr": "", "returncode": 0}
 
@@ -308,6 +461,7 @@ def reset_qdisc_interface(interface: str) -> Dict[str, Any]:
         }
 
     # 2) clsact qdisc
+    qdisc_state: Optional[Dict[str, str]] = None
     try:
         qdisc_state = show_qdisc(interface)
         if qdisc_state.get("stdout") and "clsact" in qdisc_state["stdout"]:
@@ -319,9 +473,11 @@ def reset_qdisc_interface(interface: str) -> Dict[str, Any]:
             "returncode": 1,
         }
 
-    # 3) Root qdisc
+    # 3) Root qdisc (deleting clsact does not change the root, reuse the state)
     try:
-        qdisc_state = show_qdisc(interface)
+        if qdisc_state is None:
+            # Step 2 could not read it
+            qdisc_state = show_qdisc(interface)
         if qdisc_state.get("stdout") and "root" in qdisc_state["stdout"]:
             results["root"] = run_tc_command(f"tc qdisc del dev {interface} root")
     except Exception as exc:
@@ -566,24 +722,83 @@ def _get_ip_protocol_and_ports_filter_configuration(
     return protocol_port_cmd
 
 
+def flower_match(talker: Dict[str, Any]) -> str:
+    """
+    Build the ``flower`` match keys identifying a talker's traffic.
+
+    Only the fields present in the talker entry are used.
+
+    :param talker: Talker dictionary as returned by
+                   :meth:`GE_Dictionary.get_all_talker_stream_info`.
+    :type talker: Dict[str, Any]
+    :return: Match keys such as ``"src_mac aa:bb:cc:dd:ee:ff dst_port 8080"``,
+             empty if the talker has none.
+    :rtype: str
+    """
+    ip_proto = talker.get("ip_protocol")
+    dst_port = talker.get("destination_port")
+    src_port = talker.get("source_port")
+
+    # Safe conversions
+    proto_num = int(ip_proto) if ip_proto is not None else 65535
+    dst_port_num = int(dst_port) if dst_port is not None else 0
+    src_port_num = int(src_port) if src_port is not None else 0
+
+    keys = []
+    for key, field_name in (
+        ("src_mac", "source_mac"),
+        ("dst_mac", "destination_mac"),
+        ("src_ip", "source_ip"),
+        ("dst_ip", "destination_ip"),
+    ):
+        value = talker.get(field_name)
+        if value:
+            keys.append(f"{key} {value}")
+
+    layer3_proto_cmd = _get_ip_protocol_and_ports_filter_configuration(
+        proto_num, dst_port_num, src_port_num
+    )
+    if layer3_proto_cmd != "":
+        keys.append(layer3_proto_cmd.strip())
+    return " ".join(keys)
+
+
+def vlan_push_actions(vlan_id: Any, vlan_prio: Any) -> str:
+    """
+    Actions tagging a talker's frames and steering them to their traffic class.
+
+    :param vlan_id: VLAN ID to push.
+    :param vlan_prio: VLAN priority (PCP), also used as ``SO_PRIORITY``.
+    :return: ``action vlan push ... pipe action skbedit priority ...``
+    :rtype: str
+    """
+    return (
+        f"action vlan push id {vlan_id} protocol 802.1Q priority {vlan_prio} pipe "
+        f"action skbedit priority {vlan_prio}"
+    )
+
+
 def create_tc_filter_commands_for_time_aware_talkers(
     vlan_time_aware_info: Dict[str, List[Dict[str, Any]]],
+    interface_states: Optional[Mapping[str, "InterfaceState"]] = None,
 ) -> List[str]:
     """
-    Generate ``tc filter`` commands for VLAN-tagged, time-aware talkers with
-    automatic chain number increment and dynamic ``clsact`` detection.
+    Generate ``tc filter`` commands for VLAN-tagged, time-aware talkers,
+    adding a ``clsact`` qdisc where the interface snapshot has none.
 
     This function consumes the output from
     :meth:`GE_Dictionary.get_vlan_tagged_time_aware_talker_info`
     and generates two pipe ``tc filter`` rules per talker entry:
 
-    1. **IP chain (chain N)** — Matches traffic based on L2/L3 attributes
+    1. **IP rule** — Matches traffic based on L2/L3 attributes
        (e.g. MAC, IP, port), push VLAN ID and priority, maps the vlan priority to
        socket buffer priority (``SO_PRIORITY``) using the ``skbedit`` action.
 
-    Before creating any filters, the function checks whether the ``clsact``
-    qdisc is already attached to the target interface. If not, it automatically
-    adds one to enable egress filtering.
+    Before the filters of an interface, a ``clsact`` qdisc is added unless
+    its snapshot in ``interface_states`` shows one attached. Generation runs
+    no command: the snapshots are taken once per interface beforehand
+    (:func:`tc_state.snapshot_interfaces`), so the output only depends on
+    the arguments.
 
     **Example Output**
     
@@ -602,23 +817,27 @@ def create_tc_filter_commands_for_time_aware_talkers(
         :meth:`GE_Dictionary.get_vlan_tagged_time_aware_talker_info`, 
         where each key is a stream ID and each value is a list of talker dictionaries.
     :type vlan_time_aware_info: Dict[str, List[Dict[str, Any]]]
+    :param interface_states:
+        tc state snapshot per interface; interfaces without one are assumed
+        to have no ``clsact`` qdisc.
+    :type interface_states: Mapping[str, InterfaceState], optional
 
     :return:
         A list of fully formatted ``tc`` command strings ready for execution using
         :func:`run_tc_command`.
     :rtype: List[str]
 
-    :raises subprocess.SubprocessError:
-        If ``tc qdisc show dev`` command fails unexpectedly.
-
     **Implementation Details**
     
-    - Automatically ensures ``clsact`` exists per interface.
-    - Uses separate chain pairs for each talker (N and N+1).
+    - Ensures ``clsact`` exists per interface, from the snapshots.
+    - Emits one rule per talker in chain 0; see
+      :func:`tc_filters.compile_filters` for deduplicated rules with shared
+      action chains.
     - Dynamically builds commands only with fields available in the dataset.
     - Safe to run multiple times (idempotent regarding ``clsact`` setup).
     """
     commands: List[str] = []
+    states = interface_states or {}
 
     processed_ifaces = set()
 
@@ -628,47 +847,20 @@ def create_tc_filter_commands_for_time_aware_talkers(
             if not interface:
                 continue
 
-            src_mac = talker.get("source_mac")
-            dst_mac = talker.get("destination_mac")
-            src_ip = talker.get("source_ip")
-            dst_ip = talker.get("destination_ip")
-            dst_port = talker.get("destination_port")
-            src_port = talker.get("source_port")
-            vlan_id = talker.get("vlan_id")
-            vlan_prio = talker.get("vlan_priority")
-            ip_proto = talker.get("ip_protocol")
-
-            # Safe conversions
-            proto_num = int(ip_proto) if ip_proto is not None else 65535
-            dst_port_num = int(dst_port) if dst_port is not None else 0
-            src_port_num = int(src_port) if src_port is not None else 0
-
             # --- Automatically add clsact if missing ---
             if interface not in processed_ifaces:
-                if not _clsact_exists(interface):
+                state = states.get(interface)
+                if state is None or not state.has_clsact:
                     commands.append(f"tc qdisc add dev {interface} clsact")
                 processed_ifaces.add(interface)
 
-            # --- Chain N: IP filter rule ---
+            # --- IP filter rule ---
             cmd_ip = f"tc filter add dev {interface} egress protocol ip flower "
-
-            layer3_proto_cmd = _get_ip_protocol_and_ports_filter_configuration(
-                proto_num, dst_port_num, src_port_num
-            )
-
-            if src_mac:
-                cmd_ip += f"src_mac {src_mac} "
-            if dst_mac:
-                cmd_ip += f"dst_mac {dst_mac} "
-            if src_ip:
-                cmd_ip += f"src_ip {src_ip} "
-            if dst_ip:
-                cmd_ip += f"dst_ip {dst_ip} "
-            if layer3_proto_cmd != "":
-                cmd_ip += f"{layer3_proto_cmd} "
-            cmd_ip += (
-                f"action vlan push id {vlan_id} protocol 802.1Q priority {vlan_prio} pipe "
-                f"action skbedit priority {vlan_prio}"
+            match = flower_match(talker)
+            if match:
+                cmd_ip += f"{match} "
+            cmd_ip += vlan_push_actions(
+                talker.get("vlan_id"), talker.get("vlan_priority")
             )
             commands.append(cmd_ip.strip())
 
@@ -722,42 +914,13 @@ def create_tc_filter_commands_for_non_time_aware_talkers(
             if not interface:
                 continue
 
-            src_mac = talker.get("source_mac")
-            dst_mac = talker.get("destination_mac")
-            src_ip = talker.get("source_ip")
-            dst_ip = talker.get("destination_ip")
-            ip_proto = talker.get("ip_protocol")
-            dst_port = talker.get("destination_port")
-            src_port = talker.get("source_port")
-            vlan_id = talker.get("vlan_id")
-            vlan_prio = talker.get("vlan_priority")
-
-            # Safe conversions
-            proto_num = int(ip_proto) if ip_proto is not None else 65535
-            dst_port_num = int(dst_port) if dst_port is not None else 0
-            src_port_num = int(src_port) if src_port is not None else 0
-
-            layer3_proto_cmd = _get_ip_protocol_and_ports_filter_configuration(
-                proto_num, dst_port_num, src_port_num
-            )
-
             # Base command
             cmd = f"tc filter add dev {interface} egress protocol ip flower "
-            if src_mac:
-                cmd += f"src_mac {src_mac} "
-            if dst_mac:
-                cmd += f"dst_mac {dst_mac} "
-            if src_ip:
-                cmd += f"src_ip {src_ip} "
-            if dst_ip:
-                cmd += f"dst_ip {dst_ip} "
-            if layer3_proto_cmd != "":
-                cmd += f"{layer3_proto_cmd} "
+            match = flower_match(talker)
+            if match:
+                cmd += f"{match} "
             # VLAN push action
-            cmd += (
-                f"action vlan push id {vlan_id} protocol 802.1Q priority {vlan_prio} pipe "
-                f"action skbedit priority {vlan_prio}"
-            )
+            cmd += vlan_push_actions(talker.get("vlan_id"), talker.get("vlan_priority"))
 
             commands.append(cmd.strip())
 
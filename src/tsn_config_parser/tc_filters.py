@@ -0,0 +1,208 @@
+# File: tc_filters.py
+"""
+tc_filters
+==========
+
+Compile the VLAN-tagged talkers of a configuration into egress ``flower``
+filters, with as few rules and actions as the talkers allow:
+
+- talkers with the same interface and the same match keys produce one
+  rule; a second talker matching the same traffic with a different VLAN
+  tag is ignored with a warning, as the kernel would only ever run the
+  first rule;
+- talkers of one interface sharing VLAN ID and PCP share their actions:
+  their rules jump (``action goto chain N``) to a chain holding a single
+  rule with the VLAN push and ``skbedit`` actions;
+- a (VLAN ID, PCP) group with a single talker keeps its actions inline, so
+  it costs no extra chain lookup;
+- on interfaces whose NIC offloads flower, every rule is ``skip_sw`` so
+  classification and actions run in hardware.
+
+Chains are numbered per interface from 1, in (VLAN ID, PCP) order, by a
+:class:`ChainAllocator` owned by the compilation: the numbering does not
+depend on the order of the streams in the document, and compiling the same
+talkers again, from any thread, gives the same commands.
+Match rules keep the order of their talkers.
+
+Example
+-------
+
+.. code-block:: python
+
+    rules = compile_filters(time_aware_talkers, non_time_aware_talkers)
+    cmds = [rule.command() for rule in rules]
+"""
+
+import logging
+from collections import Counter, OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, Hashable, Iterable, List, Optional, Tuple
+
+from .tc_command import flower_match, vlan_push_actions
+
+__all__ = ["ChainAllocator", "FlowRule", "compile_filters"]
+
+logger = logging.getLogger(__name__)
+
+FIRST_ACTION_CHAIN = 1  # chain 0 is the egress hook's own chain
+
+
+@dataclass(frozen=True)
+class FlowRule:
+    """
+    One egress ``flower`` rule.
+
+    :ivar str interface: Network interface name
+    :ivar str match: Flower match keys, empty to match every packet
+    :ivar str actions: Actions of the rule
+    :ivar int chain: Chain holding the rule
+    :ivar bool skip_sw: Only install the rule in hardware
+    """
+
+    interface: str
+    match: str
+    actions: str
+    chain: int = 0
+    skip_sw: bool = False
+
+    def command(self) -> str:
+        """The ``tc filter add`` command of the rule."""
+        chain = f" chain {self.chain}" if self.chain else ""
+        keys = " skip_sw" if self.skip_sw else ""
+        keys += f" {self.match}" if self.match else ""
+        return (
+            f"tc filter add dev {self.interface} egress{chain} protocol ip "
+            f"flower{keys} {self.actions}"
+        )
+
+
+class ChainAllocator:
+    """
+    Hands out action chain numbers, separately for every interface.
+
+    Asking again for the same key returns the same chain. An allocator
+    belongs to one compilation; nothing is shared between calls, so
+    compilations can run concurrently and always number alike.
+    """
+
+    def __init__(self, first: int = FIRST_ACTION_CHAIN):
+        """
+        :param int first: First chain number of every interface
+        """
+        self.first = first
+        self._chains: Dict[str, Dict[Hashable, int]] = {}
+
+    def allocate(self, interface: str, key: Hashable) -> int:
+        """
+        Return the chain of ``key`` on ``interface``, allocating the next one.
+
+        :param str interface: Network interface name
+        :param key: What the chain holds, e.g. a (VLAN ID, PCP) tag
+        :return: Chain number
+        :rtype: int
+        """
+        chains = self._chains.setdefault(interface, {})
+        if key not in chains:
+            chains[key] = self.first + len(chains)
+        return chains[key]
+
+    def chains(self, interface: str) -> Dict[Hashable, int]:
+        """Chains allocated on ``interface``, by key."""
+        return dict(self._chains.get(interface, {}))
+
+
+def _sort_key(value: Any) -> Tuple[int, Any]:
+    """Order numbers numerically, anything else after them as text."""
+    try:
+        return (0, int(value))
+    except (TypeError, ValueError):
+        return (1, str(value))
+
+
+def compile_filters(
+    *talker_infos: Dict[str, List[Dict[str, Any]]],
+    allocator: Optional[ChainAllocator] = None,
+    hw_offload: Iterable[str] = (),
+) -> List[FlowRule]:
+    """
+    Compile talker information into deduplicated flower rules.
+
+    :param talker_infos: Output of
+        :meth:`GE_Dictionary.get_vlan_tagged_time_aware_talker_info` and/or
+        :meth:`GE_Dictionary.get_vlan_tagged_non_time_aware_talker_info`;
+        each maps a stream ID to its talker dictionaries.
+    :param allocator: Chain allocator to number the action chains with; a
+        new one by default.
+    :type allocator: ChainAllocator, optional
+    :param hw_offload: Interfaces whose rules are offloaded (``skip_sw``).
+    :type hw_offload: Iterable[str]
+    :return: Rules per interface (in order of first appearance); action
+             chains precede the rules jumping to them.
+    :rtype: List[FlowRule]
+    """
+    # interface -> (match keys, (vlan_id, pcp)) in order of appearance
+    flows: Dict[str, Dict[str, Tuple[Any, Any]]] = OrderedDict()
+    talkers = duplicates = 0
+
+    for talker in _talkers(talker_infos):
+        interface = talker.get("interface_name")
+        if not interface:
+            continue
+        talkers += 1
+        match = flower_match(talker)
+        tag = (talker.get("vlan_id"), talker.get("vlan_priority"))
+
+        by_match = flows.setdefault(interface, OrderedDict())
+        previous = by_match.get(match)
+        if previous is None:
+            by_match[match] = tag
+            continue
+        duplicates += 1
+        if previous != tag:
+            logger.warning(
+                f"{interface}: talkers matching '{match}' push VLAN "
+                f"{previous[0]} priority {previous[1]} and VLAN {tag[0]} "
+                f"priority {tag[1]}; keeping the first"
+            )
+
+    if allocator is None:
+        allocator = ChainAllocator()
+    hw_offload = set(hw_offload)
+
+    rules: List[FlowRule] = []
+    for interface, by_match in flows.items():
+        skip_sw = interface in hw_offload
+        # Action chains first, so no rule ever jumps to an empty chain
+        users = Counter(by_match.values())
+        shared = sorted(
+            (tag for tag, count in users.items() if count > 1),
+            key=lambda t: (_sort_key(t[0]), _sort_key(t[1])),
+        )
+        chains = {tag: allocator.allocate(interface, tag) for tag in shared}
+        for tag, chain in chains.items():
+            rules.append(
+                FlowRule(interface, "", vlan_push_actions(*tag), chain, skip_sw)
+            )
+
+        # Match rules keep the talkers' order: overlapping matches are
+        # resolved by rule order
+        for match, tag in by_match.items():
+            if tag in chains:
+                actions = f"action goto chain {chains[tag]}"
+            else:
+                actions = vlan_push_actions(*tag)
+            rules.append(FlowRule(interface, match, actions, skip_sw=skip_sw))
+
+    logger.debug(
+        f"Compiled {talkers} talkers into {len(rules)} filters "
+        f"({duplicates} duplicates dropped)"
+    )
+    return rules
+
+
+def _talkers(
+    talker_infos: Iterable[Dict[str, List[Dict[str, Any]]]],
+) -> Iterable[Dict[str, Any]]:
+    for info in talker_infos:
+        for stream_talkers in info.values():
+            yield from stream_talkers
@@ -0,0 +1,256 @@
+# File: tc_gcl.py
+"""
+tc_gcl
+======
+
+Compile the ``admin-control-list`` of a gate parameter table into a typed
+taprio schedule before anything is sent to the kernel:
+
+- every entry is checked (known operation, gate mask within 8 traffic
+  classes, positive interval) and a malformed list is refused with
+  :class:`GCLError` instead of being programmed as ``sched-entry ?``;
+- adjacent entries with the same operation and gate states are merged
+  into one entry covering both intervals, unless the merged entry would be
+  longer than the ``max_interval`` limit (lists split a long gate into
+  several entries to stay within it);
+- the cycle time is the configured ``admin-cycle-time`` or, without one,
+  the sum of the intervals, and is emitted with the optional
+  ``cycle-time-extension``.
+
+A compiled :class:`Schedule` is checked against the limits of a NIC with
+:meth:`Schedule.validate`.
+
+Example
+-------
+
+.. code-block:: python
+
+    limits = GCLLimits(max_entries=256, min_interval=1000)
+    schedule = compile_gcl(ge_dict.get_gate_control_entries(), limits=limits)
+    schedule.validate(limits)
+    cmds = create_tc_qdisc_gcl_command(
+        ["enp1s0"], schedule.sched_entries, **schedule.command_args()
+    )
+"""
+
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional
+
+__all__ = [
+    "GCLError",
+    "GCLLimits",
+    "GateEntry",
+    "Schedule",
+    "compile_gcl",
+]
+
+# operation-name of an IEEE 802.1Q gate-control-entry -> taprio command
+OPERATIONS = {
+    "set-gate-states": "S",
+    "set-and-hold-mac": "H",
+    "set-and-release-mac": "R",
+}
+
+MAX_GATE_MASK = 0xFF  # taprio supports up to 8 traffic classes
+
+
+class GCLError(ValueError):
+    """The gate control list is malformed or exceeds the NIC's limits."""
+
+
+@dataclass(frozen=True)
+class GateEntry:
+    """
+    One entry of a taprio schedule.
+
+    :ivar str command: taprio command (``S``, ``H`` or ``R``)
+    :ivar int gate_mask: Open gates, bit ``n`` for traffic class ``n``
+    :ivar int interval: Duration of the entry in nanoseconds
+    """
+
+    command: str
+    gate_mask: int
+    interval: int
+
+    def __str__(self) -> str:
+        return f"sched-entry {self.command} {self.gate_mask:02X} {self.interval}"
+
+
+@dataclass(frozen=True)
+class GCLLimits:
+    """
+    Gate control list limits of a NIC; None means unlimited.
+
+    :ivar Optional[int] max_entries: Maximum number of entries
+    :ivar Optional[int] min_interval: Shortest entry in nanoseconds
+    :ivar Optional[int] max_interval: Longest entry in nanoseconds
+    :ivar Optional[int] max_cycle_time: Longest cycle in nanoseconds
+    """
+
+    max_entries: Optional[int] = None
+    min_interval: Optional[int] = None
+    max_interval: Optional[int] = None
+    max_cycle_time: Optional[int] = None
+
+    def merge(self, other: "GCLLimits") -> "GCLLimits":
+        """Return the stricter of both limits, field by field."""
+
+        def pick(a, b, strict):
+            if a is None or b is None:
+                return a if b is None else b
+            return strict(a, b)
+
+        return GCLLimits(
+            max_entries=pick(self.max_entries, other.max_entries, min),
+            min_interval=pick(self.min_interval, other.min_interval, max),
+            max_interval=pick(self.max_interval, other.max_interval, min),
+            max_cycle_time=pick(self.max_cycle_time, other.max_cycle_time, min),
+        )
+
+
+@dataclass
+class Schedule:
+    """A compiled taprio schedule."""
+
+    entries: List[GateEntry] = field(default_factory=list)
+    cycle_time: int = 0
+    cycle_time_extension: Optional[int] = None
+    base_time: int = 0  # admin-base-time, the phase of the cycles
+    merged: int = 0  # entries removed by merging
+
+    @property
+    def sched_entries(self) -> List[str]:
+        """The entries as ``sched-entry`` strings."""
+        return [str(entry) for entry in self.entries]
+
+    def command_args(self) -> Dict[str, Any]:
+        """Keyword arguments for :func:`create_tc_qdisc_gcl_command`."""
+        return {
+            "cycle_time": self.cycle_time,
+            "cycle_time_extension": self.cycle_time_extension,
+        }
+
+    def validate(self, limits: GCLLimits) -> None:
+        """
+        Check the schedule against the limits of a NIC.
+
+        :param limits: Limits of the NIC.
+        :type limits: GCLLimits
+        :raises GCLError: If a limit is exceeded.
+        """
+        if limits.max_entries is not None and len(self.entries) > limits.max_entries:
+            raise GCLError(
+                f"gate control list has {len(self.entries)} entries, "
+                f"at most {limits.max_entries} are supported"
+            )
+        for i, entry in enumerate(self.entries):
+            if limits.min_interval is not None and entry.interval < limits.min_interval:
+                raise GCLError(
+                    f"entry {i}: interval {entry.interval} ns is shorter than "
+                    f"the minimum of {limits.min_interval} ns"
+                )
+            if limits.max_interval is not None and entry.interval > limits.max_interval:
+                raise GCLError(
+                    f"entry {i}: interval {entry.interval} ns is longer than "
+                    f"the maximum of {limits.max_interval} ns"
+                )
+        if (
+            limits.max_cycle_time is not None
+            and self.cycle_time > limits.max_cycle_time
+        ):
+            raise GCLError(
+                f"cycle time {self.cycle_time} ns is longer than "
+                f"the maximum of {limits.max_cycle_time} ns"
+            )
+
+
+def _int_value(entry: Dict[str, Any], key: str, index: int) -> int:
+    value = entry.get(key)
+    if isinstance(value, dict):
+        value = value.get("#text")
+    try:
+        return int(str(value).strip())
+    except (TypeError, ValueError):
+        raise GCLError(f"entry {index}: invalid {key} {value!r}") from None
+
+
+def _command(entry: Dict[str, Any], index: int) -> str:
+    op = entry.get("operation-name")
+    if isinstance(op, dict):
+        op = op.get("#text")
+    # Drop the YANG module prefix ("sched:set-gate-states")
+    name = str(op).rsplit(":", 1)[-1].strip()
+    if name not in OPERATIONS:
+        raise GCLError(f"entry {index}: unsupported operation {op!r}")
+    return OPERATIONS[name]
+
+
+def compile_gcl(
+    raw_entries: Iterable[Dict[str, Any]],
+    cycle_time: Optional[int] = None,
+    cycle_time_extension: Optional[int] = None,
+    base_time: int = 0,
+    limits: Optional[GCLLimits] = None,
+) -> Schedule:
+    """
+    Compile gate-control-entry dictionaries into a schedule.
+
+    :param raw_entries: ``gate-control-entry`` dictionaries in list order.
+    :type raw_entries: Iterable[Dict[str, Any]]
+    :param cycle_time: ``admin-cycle-time`` in nanoseconds; ``None`` uses
+                       the sum of the intervals.
+    :type cycle_time: int, optional
+    :param cycle_time_extension: ``admin-cycle-time-extension`` in
+                                 nanoseconds.
+    :type cycle_time_extension: int, optional
+    :param base_time: ``admin-base-time`` in nanoseconds.
+    :type base_time: int
+    :param limits: Limits the schedule must meet; entries are never merged
+                   past ``max_interval``.
+    :type limits: GCLLimits, optional
+    :return: The compiled schedule.
+    :rtype: Schedule
+    :raises GCLError: If an entry is malformed, the list is empty or the
+                      cycle time is shorter than the entries.
+    """
+    schedule = Schedule(cycle_time_extension=cycle_time_extension, base_time=base_time)
+    max_interval = limits.max_interval if limits is not None else None
+    for index, raw in enumerate(raw_entries):
+        if not isinstance(raw, dict):
+            raise GCLError(f"entry {index}: not a gate-control-entry")
+        command = _command(raw, index)
+        gate_mask = _int_value(raw, "gate-states-value", index)
+        interval = _int_value(raw, "time-interval-value", index)
+        if not 0 <= gate_mask <= MAX_GATE_MASK:
+            raise GCLError(f"entry {index}: gate states {gate_mask} out of range")
+        if interval <= 0:
+            raise GCLError(f"entry {index}: interval must be positive, got {interval}")
+
+        last = schedule.entries[-1] if schedule.entries else None
+        if (
+            last
+            and (last.command, last.gate_mask) == (command, gate_mask)
+            and (max_interval is None or last.interval + interval <= max_interval)
+        ):
+            schedule.entries[-1] = GateEntry(
+                command, gate_mask, last.interval + interval
+            )
+            schedule.merged += 1
+        else:
+            schedule.entries.append(GateEntry(command, gate_mask, interval))
+
+    if not schedule.entries:
+        raise GCLError("gate control list is empty")
+
+    total = sum(entry.interval for entry in schedule.entries)
+    if cycle_time is None:
+        cycle_time = total
+    elif cycle_time < total:
+        raise GCLError(
+            f"cycle time {cycle_time} ns is shorter than the "
+            f"{total} ns of the gate control list"
+        )
+    if cycle_time_extension is not None and cycle_time_extension < 0:
+        raise GCLError(f"negative cycle time extension {cycle_time_extension}")
+    schedule.cycle_time = cycle_time
+    return schedule
@@ -0,0 +1,240 @@
+# File: tc_layout.py
+"""
+tc_layout
+=========
+
+Choose the taprio/etf qdisc layout of an interface from what its NIC can
+offload, instead of one fixed template:
+
+- one traffic class per transmit queue (``num_tc``), with the VLAN
+  priorities spread over the classes so the highest priorities get their
+  own class;
+- **full offload** (taprio ``flags 0x2``) when the NIC executes the gate
+  control list itself, otherwise **txtime-assist** (``flags 0x1`` plus
+  ``txtime-delay``), which needs ETF launch-time offload on every queue;
+- an offloaded ETF child for each class whose queue supports per-packet
+  launch time.
+
+A full-offload layout carries a txtime-assist ``fallback`` when the NIC
+supports both, to be programmed if the kernel or driver rejects full
+offload. A layout the NIC cannot offload is refused with
+:class:`LayoutError` rather than left to fall back to software scheduling.
+
+Example
+-------
+
+.. code-block:: python
+
+    caps = OffloadCapabilities(num_tx_queues=4, taprio_full_offload=True,
+                               etf_offload=True, launch_time_queues=(0, 1, 2, 3))
+    layout = plan_qdisc_layout(caps, ["sched-entry S 0F 500000"])
+    cmds = create_tc_qdisc_gcl_command(["enp1s0"], gcl, **layout.command_args())
+"""
+
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+__all__ = [
+    "DEFAULT_CAPABILITIES",
+    "LayoutError",
+    "MODE_FULL_OFFLOAD",
+    "MODE_SOFTWARE",
+    "MODE_TXTIME_ASSIST",
+    "OffloadCapabilities",
+    "QdiscLayout",
+    "default_capabilities",
+    "offload_mode",
+    "plan_qdisc_layout",
+]
+
+MODE_FULL_OFFLOAD = "full-offload"
+MODE_TXTIME_ASSIST = "txtime-assist"
+MODE_SOFTWARE = "software"
+
+_TAPRIO_FLAGS = {MODE_FULL_OFFLOAD: "0x2", MODE_TXTIME_ASSIST: "0x1"}
+
+NUM_PRIORITIES = 16  # Entries of the taprio priority map
+MAX_TRAFFIC_CLASSES = 8
+DEFAULT_TXTIME_DELAY = 200000
+
+
+class LayoutError(ValueError):
+    """The NIC cannot offload the requested schedule."""
+
+
+@dataclass(frozen=True)
+class OffloadCapabilities:
+    """
+    What a NIC can offload for time-aware scheduling.
+
+    :ivar int num_tx_queues: Number of transmit queues
+    :ivar bool taprio_full_offload: The NIC executes the taprio gate control
+        list (``flags 0x2``)
+    :ivar bool taprio_txtime_assist: taprio may run in txtime-assist mode
+        (``flags 0x1``)
+    :ivar bool etf_offload: ETF qdiscs can be offloaded (LaunchTime)
+    :ivar Tuple[int, ...] launch_time_queues: Queues supporting per-packet
+        launch time
+    """
+
+    num_tx_queues: int
+    taprio_full_offload: bool = False
+    taprio_txtime_assist: bool = True
+    etf_offload: bool = False
+    launch_time_queues: Tuple[int, ...] = ()
+
+
+def default_capabilities(num_tx_queues: int) -> OffloadCapabilities:
+    """
+    Capabilities assumed for a NIC without a Device class.
+
+    txtime-assist with launch-time offload on each of its transmit queues.
+
+    :param int num_tx_queues: Transmit queues of the interface
+    :return: Capabilities to plan the layout with
+    :rtype: OffloadCapabilities
+    """
+    return OffloadCapabilities(
+        num_tx_queues=num_tx_queues,
+        taprio_txtime_assist=True,
+        etf_offload=True,
+        launch_time_queues=tuple(range(num_tx_queues)),
+    )
+
+
+# Layout of the historical template (4 transmit queues)
+DEFAULT_CAPABILITIES = default_capabilities(4)
+
+
+@dataclass
+class QdiscLayout:
+    """Parameters of the qdisc tree of one interface."""
+
+    mode: str
+    num_tc: int
+    map_str: str
+    queues_str: str
+    etf_classes: List[int] = field(default_factory=list)  # 1-based classes
+    txtime_delay: Optional[int] = None
+    fallback: Optional["QdiscLayout"] = None  # if full offload is rejected
+
+    @property
+    def flags(self) -> str:
+        """taprio ``flags`` value of the mode."""
+        return _TAPRIO_FLAGS[self.mode]
+
+    def command_args(self) -> Dict[str, Any]:
+        """Keyword arguments for :func:`create_tc_qdisc_gcl_command`."""
+        return {
+            "num_tc": self.num_tc,
+            "map_str": self.map_str,
+            "queues_str": self.queues_str,
+            "flags": self.flags,
+            "txtime_delay": self.txtime_delay,
+            "etf_classes": self.etf_classes,
+        }
+
+
+def _priority_map(num_tc: int) -> str:
+    """
+    Map the 16 priorities onto ``num_tc`` classes.
+
+    Priorities 0-3 (best effort) share class 0 and priorities 4-7 are
+    spread over the other classes, highest priority last. With 8 classes
+    every priority 0-7 gets its own class.
+    """
+    classes = []
+    for prio in range(NUM_PRIORITIES):
+        if num_tc >= 8 and prio < 8:
+            classes.append(prio)
+        elif prio < 4 or prio >= 8 or num_tc == 1:
+            classes.append(0)
+        else:
+            classes.append(1 + (prio - 4) * (num_tc - 1) // 4)
+    return " ".join(str(c) for c in classes)
+
+
+def _gate_mask_bits(gcl: List[str]) -> int:
+    """Highest traffic class opened by any entry, plus one."""
+    highest = 0
+    for entry in gcl:
+        parts = entry.split()
+        if len(parts) >= 3:
+            highest = max(highest, int(parts[2], 16).bit_length())
+    return highest
+
+
+def offload_mode(flags: Any) -> str:
+    """
+    Name the taprio mode of an installed qdisc from its ``flags``.
+
+    :param flags: taprio flags, as an int or a string such as ``"0x2"``;
+                  ``None`` if the qdisc reports none.
+    :return: :data:`MODE_FULL_OFFLOAD`, :data:`MODE_TXTIME_ASSIST` or
+             :data:`MODE_SOFTWARE`.
+    :rtype: str
+    """
+    if isinstance(flags, str):
+        flags = int(flags, 0)
+    flags = flags or 0
+    if flags & 0x2:
+        return MODE_FULL_OFFLOAD
+    if flags & 0x1:
+        return MODE_TXTIME_ASSIST
+    return MODE_SOFTWARE
+
+
+def plan_qdisc_layout(
+    caps: OffloadCapabilities, gcl: List[str], allow_full_offload: bool = True
+) -> QdiscLayout:
+    """
+    Compute the best offloadable qdisc layout for a NIC.
+
+    :param caps: Capabilities of the NIC.
+    :type caps: OffloadCapabilities
+    :param gcl: Gate control list (``sched-entry`` strings).
+    :type gcl: List[str]
+    :param allow_full_offload: False once full offload was rejected on the
+                               interface, to plan txtime-assist directly.
+    :type allow_full_offload: bool
+    :return: The layout to program, with its fallback if any.
+    :rtype: QdiscLayout
+    :raises LayoutError: If the schedule cannot be offloaded by the NIC.
+    """
+    num_tc = min(caps.num_tx_queues, MAX_TRAFFIC_CLASSES)
+    if num_tc < 1:
+        raise LayoutError("no transmit queue available")
+
+    needed = _gate_mask_bits(gcl)
+    if needed > num_tc:
+        raise LayoutError(
+            f"gate control list uses {needed} traffic classes, "
+            f"the NIC has {num_tc} transmit queues"
+        )
+
+    launch_time = set(caps.launch_time_queues) if caps.etf_offload else set()
+    etf_classes = [tc + 1 for tc in range(num_tc) if tc in launch_time]
+
+    modes = []
+    if caps.taprio_full_offload and allow_full_offload:
+        modes.append(MODE_FULL_OFFLOAD)
+    if caps.taprio_txtime_assist and len(etf_classes) == num_tc:
+        modes.append(MODE_TXTIME_ASSIST)
+    if not modes:
+        raise LayoutError(
+            "neither taprio full offload nor launch-time offload on every "
+            "queue (txtime-assist) is supported"
+        )
+
+    layout = None
+    for mode in reversed(modes):
+        layout = QdiscLayout(
+            mode=mode,
+            num_tc=num_tc,
+            map_str=_priority_map(num_tc),
+            queues_str=" ".join(f"1@{q}" for q in range(num_tc)),
+            etf_classes=etf_classes,
+            txtime_delay=DEFAULT_TXTIME_DELAY if mode == MODE_TXTIME_ASSIST else None,
+            fallback=layout,
+        )
+    return layout
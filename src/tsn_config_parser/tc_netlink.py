@@ -0,0 +1,714 @@
+# File: tc_netlink.py
+"""
+tc_netlink
+==========
+
+Minimal rtnetlink (``NETLINK_ROUTE``) client for traffic-control objects.
+
+This module talks to the kernel directly over a persistent netlink socket,
+so that programming, listing and removing qdiscs/filters does not require
+spawning ``tc`` processes or parsing their text output. It only implements
+the messages Time Config Hub needs:
+
+- dump qdiscs (``RTM_GETQDISC``) and filters (``RTM_GETTFILTER``)
+- delete qdiscs (``RTM_DELQDISC``) and filters (``RTM_DELTFILTER``)
+- add or replace ``clsact``, ``taprio`` and ``etf`` qdiscs
+  (``RTM_NEWQDISC``, options from :func:`taprio_options` /
+  :func:`etf_options`)
+- add ``flower`` filters (``RTM_NEWTFILTER``, options from
+  :func:`flower_options`) with ``vlan`` push, ``skbedit`` priority and
+  ``goto chain`` actions
+
+Attributes are laid out the way ``tc`` (iproute2) lays them out.
+
+Example
+-------
+
+.. code-block:: python
+
+    from tc_netlink import NetlinkSocket
+
+    with NetlinkSocket() as nl:
+        for msg in nl.dump_qdiscs("enp170s0"):
+            print(msg["kind"], hex(msg["handle"]), hex(msg["parent"]))
+"""
+
+import errno
+import os
+import socket
+import struct
+import threading
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+__all__ = [
+    "NetlinkSocket",
+    "NetlinkError",
+    "etf_options",
+    "flower_options",
+    "goto_chain_action",
+    "skbedit_priority_action",
+    "taprio_options",
+    "vlan_push_action",
+]
+
+# Netlink message types / flags (linux/netlink.h, linux/rtnetlink.h)
+NLMSG_ERROR = 2
+NLMSG_DONE = 3
+NLM_F_REQUEST = 0x001
+NLM_F_MULTI = 0x002
+NLM_F_ACK = 0x004
+NLM_F_DUMP = 0x300
+NLM_F_REPLACE = 0x100
+NLM_F_EXCL = 0x200
+NLM_F_CREATE = 0x400
+NLM_F_ACK_TLVS = 0x200  # in an error/ACK: extended ACK attributes follow
+
+# Socket options (linux/netlink.h)
+SOL_NETLINK = 270
+NETLINK_CAP_ACK = 10
+NETLINK_EXT_ACK = 11
+NLMSGERR_ATTR_MSG = 1
+
+RTM_NEWQDISC = 36
+RTM_DELQDISC = 37
+RTM_GETQDISC = 38
+RTM_NEWTFILTER = 44
+RTM_DELTFILTER = 45
+RTM_GETTFILTER = 46
+
+# Traffic control attributes (linux/rtnetlink.h)
+TCA_KIND = 1
+TCA_OPTIONS = 2
+TCA_CHAIN = 11
+
+NLA_F_NESTED = 0x8000
+NLA_TYPE_MASK = 0x3FFF
+
+# Well-known handles (linux/pkt_sched.h)
+TC_H_ROOT = 0xFFFFFFFF
+TC_H_CLSACT = 0xFFFFFFF1
+TC_H_MIN_EGRESS = 0xFFF3
+TC_H_EGRESS = (TC_H_CLSACT & 0xFFFF0000) | TC_H_MIN_EGRESS
+
+# taprio attributes (linux/pkt_sched.h)
+TCA_TAPRIO_ATTR_PRIOMAP = 1
+TCA_TAPRIO_ATTR_SCHED_ENTRY_LIST = 2
+TCA_TAPRIO_ATTR_SCHED_BASE_TIME = 3
+TCA_TAPRIO_ATTR_SCHED_CLOCKID = 5
+TCA_TAPRIO_ATTR_SCHED_CYCLE_TIME = 8
+TCA_TAPRIO_ATTR_SCHED_CYCLE_TIME_EXTENSION = 9
+TCA_TAPRIO_ATTR_FLAGS = 10
+TCA_TAPRIO_ATTR_TXTIME_DELAY = 11
+TCA_TAPRIO_ATTR_ADMIN_SCHED = 16
+TCA_TAPRIO_SCHED_ENTRY = 1
+TCA_TAPRIO_SCHED_ENTRY_CMD = 2
+TCA_TAPRIO_SCHED_ENTRY_GATE_MASK = 3
+TCA_TAPRIO_SCHED_ENTRY_INTERVAL = 4
+
+# etf attributes / flags
+TCA_ETF_PARMS = 1
+TC_ETF_DEADLINE_MODE_ON = 1 << 0
+TC_ETF_OFFLOAD_ON = 1 << 1
+TC_ETF_SKIP_SOCK_CHECK = 1 << 2
+
+# flower attributes / classifier flags (linux/pkt_cls.h)
+TCA_FLOWER_ACT = 3
+TCA_FLOWER_KEY_ETH_DST = 4
+TCA_FLOWER_KEY_ETH_DST_MASK = 5
+TCA_FLOWER_KEY_ETH_SRC = 6
+TCA_FLOWER_KEY_ETH_SRC_MASK = 7
+TCA_FLOWER_KEY_ETH_TYPE = 8
+TCA_FLOWER_KEY_IP_PROTO = 9
+TCA_FLOWER_KEY_IPV4_SRC = 10
+TCA_FLOWER_KEY_IPV4_SRC_MASK = 11
+TCA_FLOWER_KEY_IPV4_DST = 12
+TCA_FLOWER_KEY_IPV4_DST_MASK = 13
+TCA_FLOWER_KEY_TCP_SRC = 18
+TCA_FLOWER_KEY_TCP_DST = 19
+TCA_FLOWER_KEY_UDP_SRC = 20
+TCA_FLOWER_KEY_UDP_DST = 21
+TCA_FLOWER_FLAGS = 22
+TCA_FLOWER_KEY_SCTP_SRC = 41
+TCA_FLOWER_KEY_SCTP_DST = 42
+TCA_CLS_FLAGS_SKIP_HW = 1 << 0
+TCA_CLS_FLAGS_SKIP_SW = 1 << 1
+TCA_CLS_FLAGS_IN_HW = 1 << 2
+TCA_CLS_FLAGS_NOT_IN_HW = 1 << 3
+
+# Actions (linux/pkt_cls.h, linux/tc_act/*.h)
+TCA_ACT_KIND = 1
+TCA_ACT_OPTIONS = 2
+TC_ACT_PIPE = 3
+TC_ACT_GOTO_CHAIN = 2 << 28
+TCA_GACT_PARMS = 2
+TCA_SKBEDIT_PARMS = 2
+TCA_SKBEDIT_PRIORITY = 3
+TCA_VLAN_PARMS = 2
+TCA_VLAN_PUSH_VLAN_ID = 3
+TCA_VLAN_PUSH_VLAN_PROTOCOL = 4
+TCA_VLAN_PUSH_VLAN_PRIORITY = 6
+TCA_VLAN_ACT_PUSH = 2
+ETH_P_ALL = 0x0003
+ETH_P_8021Q = 0x8100
+
+# ip_proto -> (source, destination) port keys of flower
+FLOWER_PORT_KEYS = {
+    socket.IPPROTO_TCP: (TCA_FLOWER_KEY_TCP_SRC, TCA_FLOWER_KEY_TCP_DST),
+    socket.IPPROTO_UDP: (TCA_FLOWER_KEY_UDP_SRC, TCA_FLOWER_KEY_UDP_DST),
+    socket.IPPROTO_SCTP: (TCA_FLOWER_KEY_SCTP_SRC, TCA_FLOWER_KEY_SCTP_DST),
+}
+
+_NLMSGHDR = struct.Struct("=IHHII")
+_TCMSG = struct.Struct("=BxxxiIII")
+_RTATTR = struct.Struct("=HH")
+_NLMSGERR = struct.Struct("=i")
+_ETF_QOPT = struct.Struct("=iiI")
+_MQPRIO_QOPT = struct.Struct("=B16BB16H16H")  # struct tc_mqprio_qopt
+_TC_GEN = struct.Struct("=IIiii")  # index, capab, action, refcnt, bindcnt
+
+_RECV_BUFSIZE = 65536
+
+
+class NetlinkError(OSError):
+    """Raised when the kernel answers a request with a negative errno."""
+
+    pass
+
+
+def _align(length: int) -> int:
+    """Round ``length`` up to the 4-byte netlink alignment."""
+    return (length + 3) & ~3
+
+
+def _pack_attr(attr_type: int, payload: bytes) -> bytes:
+    """Encode a single ``rtattr`` with its padding."""
+    length = _RTATTR.size + len(payload)
+    return _RTATTR.pack(length, attr_type) + payload + b"\0" * (_align(length) - length)
+
+
+def _pack_nested(attr_type: int, *attrs: bytes) -> bytes:
+    """Encode ``attrs`` nested in one ``rtattr`` flagged ``NLA_F_NESTED``."""
+    return _pack_attr(attr_type | NLA_F_NESTED, b"".join(attrs))
+
+
+def _iter_attrs(data: bytes) -> Iterator[Tuple[int, bytes]]:
+    """Yield ``(type, payload)`` for every ``rtattr`` in ``data``."""
+    offset = 0
+    while offset + _RTATTR.size <= len(data):
+        length, attr_type = _RTATTR.unpack_from(data, offset)
+        if length < _RTATTR.size:
+            break
+        yield attr_type & NLA_TYPE_MASK, data[offset + _RTATTR.size : offset + length]
+        offset += _align(length)
+
+
+def _attrs(data: bytes) -> Dict[int, bytes]:
+    """Return the attributes of ``data`` keyed by type (last one wins)."""
+    return dict(_iter_attrs(data))
+
+
+def _u32(data: bytes) -> int:
+    return struct.unpack_from("=I", data)[0]
+
+
+def _s32(data: bytes) -> int:
+    return struct.unpack_from("=i", data)[0]
+
+
+def _s64(data: bytes) -> int:
+    return struct.unpack_from("=q", data)[0]
+
+
+def _decode_schedule(attrs: Dict[int, bytes]) -> Dict[str, Any]:
+    """Decode the base time, cycle time and entries of a taprio schedule."""
+    decoded: Dict[str, Any] = {}
+
+    if TCA_TAPRIO_ATTR_SCHED_BASE_TIME in attrs:
+        decoded["base_time"] = _s64(attrs[TCA_TAPRIO_ATTR_SCHED_BASE_TIME])
+    if TCA_TAPRIO_ATTR_SCHED_CYCLE_TIME in attrs:
+        decoded["cycle_time"] = _s64(attrs[TCA_TAPRIO_ATTR_SCHED_CYCLE_TIME])
+    if TCA_TAPRIO_ATTR_SCHED_CYCLE_TIME_EXTENSION in attrs:
+        decoded["cycle_time_extension"] = _s64(
+            attrs[TCA_TAPRIO_ATTR_SCHED_CYCLE_TIME_EXTENSION]
+        )
+
+    entries: List[Dict[str, int]] = []
+    for _, entry in _iter_attrs(attrs.get(TCA_TAPRIO_ATTR_SCHED_ENTRY_LIST, b"")):
+        entry_attrs = _attrs(entry)
+        entries.append(
+            {
+                "cmd": entry_attrs.get(TCA_TAPRIO_SCHED_ENTRY_CMD, b"\0")[0],
+                "gate_mask": _u32(
+                    entry_attrs.get(TCA_TAPRIO_SCHED_ENTRY_GATE_MASK, bytes(4))
+                ),
+                "interval": _u32(
+                    entry_attrs.get(TCA_TAPRIO_SCHED_ENTRY_INTERVAL, bytes(4))
+                ),
+            }
+        )
+    if entries:
+        decoded["schedule"] = entries
+
+    return decoded
+
+
+def _decode_taprio(options: bytes) -> Dict[str, Any]:
+    """Decode the ``TCA_OPTIONS`` of a taprio qdisc.
+
+    The operational schedule is at the top level; a schedule that is not
+    active yet is under ``admin``.
+    """
+    attrs = _attrs(options)
+    decoded: Dict[str, Any] = {}
+
+    if TCA_TAPRIO_ATTR_FLAGS in attrs:
+        decoded["flags"] = _u32(attrs[TCA_TAPRIO_ATTR_FLAGS])
+    if TCA_TAPRIO_ATTR_TXTIME_DELAY in attrs:
+        decoded["txtime_delay"] = _u32(attrs[TCA_TAPRIO_ATTR_TXTIME_DELAY])
+    if TCA_TAPRIO_ATTR_SCHED_CLOCKID in attrs:
+        decoded["clockid"] = _s32(attrs[TCA_TAPRIO_ATTR_SCHED_CLOCKID])
+    decoded.update(_decode_schedule(attrs))
+    if TCA_TAPRIO_ATTR_ADMIN_SCHED in attrs:
+        decoded["admin"] = _decode_schedule(_attrs(attrs[TCA_TAPRIO_ATTR_ADMIN_SCHED]))
+
+    return decoded
+
+
+def _decode_etf(options: bytes) -> Dict[str, Any]:
+    """Decode the ``TCA_OPTIONS`` of an etf qdisc."""
+    parms = _attrs(options).get(TCA_ETF_PARMS)
+    if not parms or len(parms) < _ETF_QOPT.size:
+        return {}
+
+    delta, clockid, flags = _ETF_QOPT.unpack_from(parms)
+    return {
+        "delta": delta,
+        "clockid": clockid,
+        "offload": bool(flags & TC_ETF_OFFLOAD_ON),
+        "deadline_mode": bool(flags & TC_ETF_DEADLINE_MODE_ON),
+        "skip_sock_check": bool(flags & TC_ETF_SKIP_SOCK_CHECK),
+    }
+
+
+def _decode_flower(options: bytes) -> Dict[str, Any]:
+    """Decode the classifier flags of a flower filter."""
+    attrs = _attrs(options)
+    if TCA_FLOWER_FLAGS not in attrs:
+        return {}
+
+    flags = _u32(attrs[TCA_FLOWER_FLAGS])
+    return {
+        "skip_hw": bool(flags & TCA_CLS_FLAGS_SKIP_HW),
+        "skip_sw": bool(flags & TCA_CLS_FLAGS_SKIP_SW),
+        "in_hw": bool(flags & TCA_CLS_FLAGS_IN_HW),
+        "not_in_hw": bool(flags & TCA_CLS_FLAGS_NOT_IN_HW),
+    }
+
+
+_OPTION_DECODERS = {
+    "taprio": _decode_taprio,
+    "etf": _decode_etf,
+    "flower": _decode_flower,
+}
+
+
+def _sched_entry(cmd: int, gate_mask: int, interval: int) -> bytes:
+    return _pack_attr(
+        TCA_TAPRIO_SCHED_ENTRY,
+        _pack_attr(TCA_TAPRIO_SCHED_ENTRY_CMD, struct.pack("=B", cmd))
+        + _pack_attr(TCA_TAPRIO_SCHED_ENTRY_GATE_MASK, struct.pack("=I", gate_mask))
+        + _pack_attr(TCA_TAPRIO_SCHED_ENTRY_INTERVAL, struct.pack("=I", interval)),
+    )
+
+
+def taprio_options(
+    num_tc: int,
+    prio_map: List[int],
+    queues: List[Tuple[int, int]],
+    entries: List[Tuple[int, int, int]],
+    base_time: int = 0,
+    clockid: Optional[int] = None,
+    flags: Optional[int] = None,
+    txtime_delay: int = 0,
+    cycle_time: int = 0,
+    cycle_time_extension: int = 0,
+) -> bytes:
+    """
+    Encode the ``TCA_OPTIONS`` of a taprio qdisc.
+
+    :param int num_tc: Number of traffic classes
+    :param prio_map: Traffic class of each of the 16 priorities
+    :param queues: ``(count, offset)`` of the queues of each traffic class
+    :param entries: ``(command, gate mask, interval)`` of each schedule entry
+    :param int base_time: ``base-time`` in nanoseconds, 0 to omit it
+    :param clockid: Clock of the schedule, None to omit it
+    :param flags: taprio flags, None to omit them
+    :param int txtime_delay: ``txtime-delay``, 0 to omit it
+    :param int cycle_time: ``cycle-time``, 0 to omit it
+    :param int cycle_time_extension: ``cycle-time-extension``, 0 to omit it
+    :return: Options attribute
+    :rtype: bytes
+    """
+    prio = (list(prio_map) + [0] * 16)[:16]
+    counts = [count for count, _ in queues] + [0] * (16 - len(queues))
+    offsets = [offset for _, offset in queues] + [0] * (16 - len(queues))
+
+    attrs = []
+    if clockid is not None:
+        attrs.append(
+            _pack_attr(TCA_TAPRIO_ATTR_SCHED_CLOCKID, struct.pack("=i", clockid))
+        )
+    if flags is not None:
+        attrs.append(_pack_attr(TCA_TAPRIO_ATTR_FLAGS, struct.pack("=I", flags)))
+    attrs.append(
+        _pack_attr(
+            TCA_TAPRIO_ATTR_PRIOMAP,
+            _MQPRIO_QOPT.pack(num_tc, *prio, 0, *counts[:16], *offsets[:16]),
+        )
+    )
+    for attr_type, value, fmt in (
+        (TCA_TAPRIO_ATTR_TXTIME_DELAY, txtime_delay, "=I"),
+        (TCA_TAPRIO_ATTR_SCHED_BASE_TIME, base_time, "=q"),
+        (TCA_TAPRIO_ATTR_SCHED_CYCLE_TIME, cycle_time, "=q"),
+        (TCA_TAPRIO_ATTR_SCHED_CYCLE_TIME_EXTENSION, cycle_time_extension, "=q"),
+    ):
+        if value:
+            attrs.append(_pack_attr(attr_type, struct.pack(fmt, value)))
+    attrs.append(
+        _pack_nested(
+            TCA_TAPRIO_ATTR_SCHED_ENTRY_LIST,
+            *(_sched_entry(cmd, mask, interval) for cmd, mask, interval in entries),
+        )
+    )
+    return _pack_attr(TCA_OPTIONS, b"".join(attrs))
+
+
+def etf_options(
+    delta: int,
+    clockid: int,
+    offload: bool = False,
+    skip_sock_check: bool = False,
+    deadline_mode: bool = False,
+) -> bytes:
+    """
+    Encode the ``TCA_OPTIONS`` of an etf qdisc.
+
+    :param int delta: ``delta`` in nanoseconds
+    :param int clockid: Clock of the launch times
+    :param bool offload: Offload to the NIC (LaunchTime)
+    :param bool skip_sock_check: Do not require ``SO_TXTIME`` sockets
+    :param bool deadline_mode: Dequeue as soon as possible before the deadline
+    :return: Options attribute
+    :rtype: bytes
+    """
+    flags = (
+        (TC_ETF_OFFLOAD_ON if offload else 0)
+        | (TC_ETF_SKIP_SOCK_CHECK if skip_sock_check else 0)
+        | (TC_ETF_DEADLINE_MODE_ON if deadline_mode else 0)
+    )
+    return _pack_attr(
+        TCA_OPTIONS, _pack_attr(TCA_ETF_PARMS, _ETF_QOPT.pack(delta, clockid, flags))
+    )
+
+
+def _action(kind: str, *options: bytes) -> bytes:
+    return _pack_attr(TCA_ACT_KIND, kind.encode() + b"\0") + _pack_nested(
+        TCA_ACT_OPTIONS, *options
+    )
+
+
+def vlan_push_action(
+    vlan_id: int,
+    priority: int,
+    protocol: int = ETH_P_8021Q,
+    control: int = TC_ACT_PIPE,
+) -> bytes:
+    """Encode a ``vlan push`` action (without its list position)."""
+    return _action(
+        "vlan",
+        _pack_attr(
+            TCA_VLAN_PARMS,
+            _TC_GEN.pack(0, 0, control, 0, 0) + struct.pack("=i", TCA_VLAN_ACT_PUSH),
+        ),
+        _pack_attr(TCA_VLAN_PUSH_VLAN_ID, struct.pack("=H", vlan_id)),
+        _pack_attr(TCA_VLAN_PUSH_VLAN_PROTOCOL, struct.pack("!H", protocol)),
+        _pack_attr(TCA_VLAN_PUSH_VLAN_PRIORITY, struct.pack("=B", priority)),
+    )
+
+
+def skbedit_priority_action(priority: int, control: int = TC_ACT_PIPE) -> bytes:
+    """Encode a ``skbedit priority`` action (without its list position)."""
+    return _action(
+        "skbedit",
+        _pack_attr(TCA_SKBEDIT_PARMS, _TC_GEN.pack(0, 0, control, 0, 0)),
+        _pack_attr(TCA_SKBEDIT_PRIORITY, struct.pack("=I", priority)),
+    )
+
+
+def goto_chain_action(chain: int) -> bytes:
+    """Encode a ``goto chain`` action (without its list position)."""
+    return _action(
+        "gact",
+        _pack_attr(TCA_GACT_PARMS, _TC_GEN.pack(0, 0, TC_ACT_GOTO_CHAIN | chain, 0, 0)),
+    )
+
+
+def flower_options(
+    eth_type: int,
+    keys: List[Tuple[int, bytes]],
+    actions: List[bytes],
+    flags: int = 0,
+) -> bytes:
+    """
+    Encode the ``TCA_OPTIONS`` of a flower filter.
+
+    :param int eth_type: Ethertype the filter matches (host byte order),
+        ``ETH_P_ALL`` for any
+    :param keys: ``(attribute type, payload)`` of each match key
+    :param actions: Actions from :func:`vlan_push_action` and friends, in
+        order
+    :param int flags: Classifier flags (``TCA_CLS_FLAGS_SKIP_SW``...)
+    :return: Options attribute
+    :rtype: bytes
+    """
+    attrs = [_pack_attr(attr_type, payload) for attr_type, payload in keys]
+    if actions:
+        attrs.append(
+            _pack_attr(
+                TCA_FLOWER_ACT,
+                b"".join(
+                    _pack_attr(prio, action)
+                    for prio, action in enumerate(actions, start=1)
+                ),
+            )
+        )
+    attrs.append(_pack_attr(TCA_FLOWER_FLAGS, struct.pack("=I", flags)))
+    if eth_type != ETH_P_ALL:
+        attrs.append(_pack_attr(TCA_FLOWER_KEY_ETH_TYPE, struct.pack("!H", eth_type)))
+    return _pack_attr(TCA_OPTIONS, b"".join(attrs))
+
+
+def _decode_tcmsg(payload: bytes) -> Dict[str, Any]:
+    """Decode a ``tcmsg`` body (qdisc or filter) into a plain dict."""
+    _, ifindex, handle, parent, info = _TCMSG.unpack_from(payload)
+    attrs = _attrs(payload[_TCMSG.size :])
+
+    kind = attrs.get(TCA_KIND, b"").split(b"\0", 1)[0].decode()
+    options: Dict[str, Any] = {}
+    decoder = _OPTION_DECODERS.get(kind)
+    if decoder and TCA_OPTIONS in attrs:
+        options = decoder(attrs[TCA_OPTIONS])
+
+    return {
+        "ifindex": ifindex,
+        "handle": handle,
+        "parent": parent,
+        "info": info,
+        "kind": kind,
+        "chain": _u32(attrs[TCA_CHAIN]) if TCA_CHAIN in attrs else None,
+        "options": options,
+    }
+
+
+class NetlinkSocket:
+    """
+    Persistent ``NETLINK_ROUTE`` socket for tc requests.
+
+    The socket is opened once and reused for every request; requests are
+    serialized with a lock so a single instance can be shared by threads.
+    """
+
+    def __init__(self):
+        self._sock = socket.socket(
+            socket.AF_NETLINK, socket.SOCK_RAW, socket.NETLINK_ROUTE
+        )
+        self._sock.bind((0, 0))
+        # Errors carry the kernel's message but not the request they answer
+        for option in (NETLINK_EXT_ACK, NETLINK_CAP_ACK):
+            try:
+                self._sock.setsockopt(SOL_NETLINK, option, 1)
+            except OSError:
+                pass
+        self._seq = 0
+        self._lock = threading.Lock()
+
+    def __enter__(self) -> "NetlinkSocket":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Close the underlying socket."""
+        self._sock.close()
+
+    # -----------------------
+    # Public requests
+    # -----------------------
+
+    def dump_qdiscs(self, interface: str) -> List[Dict[str, Any]]:
+        """Return every qdisc attached to ``interface``."""
+        ifindex = socket.if_nametoindex(interface)
+        body = _TCMSG.pack(socket.AF_UNSPEC, 0, 0, 0, 0)
+        return [
+            msg
+            for msg in self._request(RTM_GETQDISC, NLM_F_DUMP, body)
+            if msg["ifindex"] == ifindex
+        ]
+
+    def dump_filters(self, interface: str, parent: int) -> List[Dict[str, Any]]:
+        """Return every filter under ``parent`` on ``interface``."""
+        ifindex = socket.if_nametoindex(interface)
+        body = _TCMSG.pack(socket.AF_UNSPEC, ifindex, 0, parent, 0)
+        return self._request(RTM_GETTFILTER, NLM_F_DUMP, body)
+
+    def del_qdisc(self, interface: str, parent: int, handle: int = 0) -> None:
+        """Delete the qdisc attached at ``parent`` on ``interface``."""
+        ifindex = socket.if_nametoindex(interface)
+        body = _TCMSG.pack(socket.AF_UNSPEC, ifindex, handle, parent, 0)
+        self._request(RTM_DELQDISC, NLM_F_ACK, body)
+
+    def add_clsact(self, interface: str) -> None:
+        """Attach a ``clsact`` qdisc to ``interface``."""
+        ifindex = socket.if_nametoindex(interface)
+        body = _TCMSG.pack(socket.AF_UNSPEC, ifindex, 0xFFFF0000, TC_H_CLSACT, 0)
+        body += _pack_attr(TCA_KIND, b"clsact\0")
+        self._request(RTM_NEWQDISC, NLM_F_ACK | NLM_F_CREATE | NLM_F_EXCL, body)
+
+    def new_qdisc(
+        self,
+        interface: str,
+        parent: int,
+        handle: int,
+        kind: str,
+        options: bytes = b"",
+        replace: bool = False,
+    ) -> None:
+        """
+        Add (or with ``replace`` add or replace) a qdisc at ``parent``.
+
+        :param str interface: Network interface name
+        :param int parent: Parent handle (``TC_H_ROOT`` or a class)
+        :param int handle: Handle of the qdisc, 0 to let the kernel pick
+        :param str kind: Qdisc kind
+        :param bytes options: Options from :func:`taprio_options` or
+            :func:`etf_options`
+        :param bool replace: Replace an existing qdisc instead of failing
+        """
+        ifindex = socket.if_nametoindex(interface)
+        body = _TCMSG.pack(socket.AF_UNSPEC, ifindex, handle, parent, 0)
+        body += _pack_attr(TCA_KIND, kind.encode() + b"\0") + options
+        flags = NLM_F_CREATE | (NLM_F_REPLACE if replace else NLM_F_EXCL)
+        self._request(RTM_NEWQDISC, NLM_F_ACK | flags, body)
+
+    def new_filter(
+        self,
+        interface: str,
+        parent: int,
+        pref: int,
+        protocol: int,
+        handle: int,
+        kind: str,
+        options: bytes,
+        chain: Optional[int] = None,
+    ) -> None:
+        """
+        Add a filter under ``parent`` on ``interface``.
+
+        ``pref`` and ``handle`` 0 let the kernel pick them; ``protocol`` is
+        the ethertype in host byte order.
+        """
+        ifindex = socket.if_nametoindex(interface)
+        info = (pref << 16) | socket.htons(protocol)
+        body = _TCMSG.pack(socket.AF_UNSPEC, ifindex, handle, parent, info)
+        if chain is not None:
+            body += _pack_attr(TCA_CHAIN, struct.pack("=I", chain))
+        body += _pack_attr(TCA_KIND, kind.encode() + b"\0") + options
+        self._request(RTM_NEWTFILTER, NLM_F_ACK | NLM_F_CREATE | NLM_F_EXCL, body)
+
+    def del_filter(
+        self,
+        interface: str,
+        parent: int,
+        pref: int = 0,
+        protocol: int = 0,
+        handle: int = 0,
+        kind: Optional[str] = None,
+        chain: Optional[int] = None,
+    ) -> None:
+        """
+        Delete filters under ``parent`` on ``interface``.
+
+        With the defaults every filter under ``parent`` is removed; passing
+        ``pref``/``protocol``/``handle``/``kind`` narrows it to one rule.
+        ``protocol`` is the ethertype in host byte order.
+        """
+        ifindex = socket.if_nametoindex(interface)
+        info = (pref << 16) | socket.htons(protocol)
+        body = _TCMSG.pack(socket.AF_UNSPEC, ifindex, handle, parent, info)
+        if kind:
+            body += _pack_attr(TCA_KIND, kind.encode() + b"\0")
+        if chain is not None:
+            body += _pack_attr(TCA_CHAIN, struct.pack("=I", chain))
+        self._request(RTM_DELTFILTER, NLM_F_ACK, body)
+
+    # -----------------------
+    # Internal helpers
+    # -----------------------
+
+    def _request(self, msg_type: int, flags: int, body: bytes) -> List[Dict[str, Any]]:
+        """Send one request and collect its (possibly multi-part) answer."""
+        with self._lock:
+            self._seq += 1
+            seq = self._seq
+            header = _NLMSGHDR.pack(
+                _NLMSGHDR.size + len(body), msg_type, NLM_F_REQUEST | flags, seq, 0
+            )
+            self._sock.send(header + body)
+            return self._collect(seq)
+
+    def _collect(self, seq: int) -> List[Dict[str, Any]]:
+        """Read replies for ``seq`` until DONE, ACK or an error."""
+        results: List[Dict[str, Any]] = []
+        while True:
+            data = self._sock.recv(_RECV_BUFSIZE)
+            offset = 0
+            while offset + _NLMSGHDR.size <= len(data):
+                length, msg_type, flags, msg_seq, _ = _NLMSGHDR.unpack_from(
+                    data, offset
+                )
+                if length < _NLMSGHDR.size:
+                    return results
+                payload = data[offset + _NLMSGHDR.size : offset + length]
+                offset += _align(length)
+
+                if msg_seq != seq:
+                    # Stale answer from an interrupted request
+                    continue
+                if msg_type == NLMSG_DONE:
+                    return results
+                if msg_type == NLMSG_ERROR:
+                    code = _NLMSGERR.unpack_from(payload)[0]
+                    if code != 0:
+                        raise NetlinkError(-code, _error_message(code, flags, payload))
+                    return results  # ACK
+                if msg_type in (RTM_NEWQDISC, RTM_NEWTFILTER):
+                    results.append(_decode_tcmsg(payload))
+                if not flags & NLM_F_MULTI:
+                    return results
+
+
+def _error_message(code: int, flags: int, payload: bytes) -> str:
+    """The kernel's extended ACK message of an error, or its errno text."""
+    if flags & NLM_F_ACK_TLVS:
+        # Capped ACK: the error code and the request header, then the TLVs
+        tlvs = _attrs(payload[_NLMSGERR.size + _NLMSGHDR.size :])
+        text = tlvs.get(NLMSGERR_ATTR_MSG, b"").split(b"\0", 1)[0].decode()
+        if text:
+            return text
+    return os.strerror(-code)
+
+
+def is_permission_error(exc: BaseException) -> bool:
+    """Return True if ``exc`` is a netlink EPERM/EACCES answer."""
+    return isinstance(exc, OSError) and exc.errno in (errno.EPERM, errno.EACCES)
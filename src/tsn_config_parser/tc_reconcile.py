@@ -0,0 +1,396 @@
+# File: tc_reconcile.py
+"""
+tc_reconcile
+============
+
+Differential (reconcile) planning for tc configuration.
+
+Instead of tearing every interface down and programming it again, the
+desired qdisc/filter commands of an interface are compared with what is
+installed and only the difference is emitted:
+
+- the taprio qdisc is replaced when its gate control list or cycle time
+  differ from the installed ones (or those cannot be read), and the whole
+  qdisc tree is rebuilt only when its layout (num_tc, map, queues, flags,
+  etf children) changed;
+- flower filters are added/deleted one by one, each rule living at its own
+  explicit ``pref`` so it can be addressed later; prefs keep the order of
+  the desired rules, so a rule inserted before kept ones may re-add them;
+- interfaces whose configuration did not change get no command at all.
+
+What is "installed" comes from two sources: the live
+:class:`~tsn_config_parser.tc_state.InterfaceState` snapshot (which qdiscs
+and filter prefs really exist, and the taprio schedule) and an :class:`AppliedRecord` of what was
+programmed last time (which rule each pref holds). A record that does not
+match the snapshot is ignored, which degrades to a full re-program of that
+interface.
+
+Example
+-------
+
+.. code-block:: python
+
+    desired = desired_from_commands(qdisc_cmds, filter_cmds)
+    plan = plan_reconcile(desired["enp1s0"], state, record)
+    print(plan.qdisc_commands + plan.filter_commands)
+"""
+
+import re
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from .tc_backend import Qdisc
+from .tc_state import InterfaceState
+
+__all__ = [
+    "AppliedRecord",
+    "DesiredInterface",
+    "ReconcilePlan",
+    "desired_from_commands",
+    "plan_reconcile",
+    "plan_software_filters",
+]
+
+FILTER_PREF_BASE = 1  # First pref used for explicitly placed filters
+FILTER_HANDLE = "0x1"  # One rule per pref, so the handle is always the same
+SCHED_COMMANDS = "SHR"  # taprio sched-entry commands by their netlink value
+
+_SKIP_SW_RE = re.compile(r"\bskip_sw ")
+_DEV_RE = re.compile(r"\bdev (\S+)")
+_BASE_TIME_RE = re.compile(r"\s*base-time \d+")
+_SCHED_ENTRY_RE = re.compile(r"sched-entry \S+ \S+ \S+|cycle-time(?:-extension)? \d+")
+_FILTER_RE = re.compile(
+    r"\begress (?P<chain>chain \d+ )?protocol (?P<proto>\S+) flower (?P<body>.*)$"
+)
+
+
+def _normalize(command: str) -> str:
+    return " ".join(command.split())
+
+
+def _schedule(
+    entries: Iterable[Tuple[Any, Any, Any]],
+    cycle_time: Optional[Any],
+    extension: Optional[Any],
+) -> Tuple[Tuple[Tuple[str, int, int], ...], int, int]:
+    """Normalize a taprio schedule to ``(entries, cycle_time, extension)``.
+
+    Gate masks given as strings are hex, as in ``tc``; without a cycle time
+    taprio uses the sum of the intervals.
+    """
+    normalized = tuple(
+        (
+            cmd if isinstance(cmd, str) else SCHED_COMMANDS[cmd],
+            int(mask, 16) if isinstance(mask, str) else int(mask),
+            int(interval),
+        )
+        for cmd, mask, interval in entries
+    )
+    if cycle_time is None:
+        cycle_time = sum(interval for _, _, interval in normalized)
+    return normalized, int(cycle_time), int(extension or 0)
+
+
+def _installed_schedule(root: Optional[Qdisc]) -> Optional[Tuple]:
+    """The latest schedule of a live taprio qdisc, None if it cannot be read.
+
+    A schedule that is not active yet (``admin``) supersedes the operational
+    one. Both the ``tc -j`` and the netlink forms of the options are read.
+    """
+    if root is None or root.kind != "taprio":
+        return None
+    options = root.options.get("admin") or root.options
+    try:
+        entries = [
+            (e["cmd"], e.get("gate_mask", e.get("gatemask")), e["interval"])
+            for e in options["schedule"]
+        ]
+        return _schedule(
+            entries, options["cycle_time"], options.get("cycle_time_extension")
+        )
+    except (KeyError, TypeError, ValueError, IndexError):
+        return None
+
+
+def _device(command: str) -> str:
+    match = _DEV_RE.search(command)
+    if not match:
+        raise ValueError(f"tc command without device: {command}")
+    return match.group(1)
+
+
+@dataclass
+class DesiredInterface:
+    """Desired tc configuration of one interface."""
+
+    interface: str
+    qdisc_commands: List[str] = field(default_factory=list)
+    filter_rules: List[str] = field(default_factory=list)
+
+    @property
+    def taprio_command(self) -> Optional[str]:
+        """The root taprio command, if any."""
+        return next((c for c in self.qdisc_commands if " taprio" in c), None)
+
+    @property
+    def layout_key(self) -> str:
+        """Everything about the qdisc tree except base-time and the schedule."""
+        parts = []
+        for cmd in self.qdisc_commands:
+            cmd = _BASE_TIME_RE.sub("", cmd)
+            parts.append(_normalize(_SCHED_ENTRY_RE.sub("", cmd)))
+        return "\n".join(parts)
+
+    @property
+    def schedule_key(self) -> str:
+        """The gate control list and cycle time of the taprio qdisc."""
+        taprio = self.taprio_command
+        return " ".join(_SCHED_ENTRY_RE.findall(taprio)) if taprio else ""
+
+    @property
+    def schedule(self) -> Tuple:
+        """The schedule of :attr:`schedule_key`, normalized like a live one."""
+        entries, options = [], {}
+        for item in _SCHED_ENTRY_RE.findall(self.schedule_key):
+            words = item.split()
+            if words[0] == "sched-entry":
+                entries.append(words[1:])
+            else:
+                options[words[0]] = words[1]
+        return _schedule(
+            entries, options.get("cycle-time"), options.get("cycle-time-extension")
+        )
+
+
+@dataclass
+class AppliedRecord:
+    """What was last programmed on an interface."""
+
+    layout_key: str = ""
+    schedule_key: str = ""
+    filters: Dict[str, int] = field(default_factory=dict)  # rule -> pref
+    offload_fallback: bool = False  # full offload was rejected by the kernel
+    filter_offload_fallback: bool = False  # skip_sw filters were rejected
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "layout_key": self.layout_key,
+            "schedule_key": self.schedule_key,
+            "filters": dict(self.filters),
+            "offload_fallback": self.offload_fallback,
+            "filter_offload_fallback": self.filter_offload_fallback,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "AppliedRecord":
+        return cls(
+            layout_key=data.get("layout_key", ""),
+            schedule_key=data.get("schedule_key", ""),
+            filters={k: int(v) for k, v in data.get("filters", {}).items()},
+            offload_fallback=bool(data.get("offload_fallback", False)),
+            filter_offload_fallback=bool(data.get("filter_offload_fallback", False)),
+        )
+
+
+@dataclass
+class ReconcilePlan:
+    """Commands needed to bring one interface to its desired state."""
+
+    interface: str
+    qdisc_commands: List[str] = field(default_factory=list)
+    filter_commands: List[str] = field(default_factory=list)
+    record: AppliedRecord = field(default_factory=AppliedRecord)
+
+    @property
+    def is_empty(self) -> bool:
+        """True if the interface is already up to date."""
+        return not self.qdisc_commands and not self.filter_commands
+
+
+def desired_from_commands(
+    qdisc_commands: List[str], filter_commands: List[str]
+) -> Dict[str, DesiredInterface]:
+    """
+    Group generated ``tc`` commands by interface.
+
+    ``clsact`` creation commands are dropped: whether one is needed is
+    decided by :func:`plan_reconcile` from the snapshot.
+
+    :param qdisc_commands: Output of :func:`create_tc_qdisc_gcl_command`.
+    :param filter_commands: Commands of :func:`tc_filters.compile_filters`
+                            or the ``create_tc_filter_commands_for_*`` helpers.
+    :return: Desired state keyed by interface name.
+    :rtype: Dict[str, DesiredInterface]
+    """
+    desired: Dict[str, DesiredInterface] = {}
+
+    for cmd in qdisc_commands:
+        iface = _device(cmd)
+        desired.setdefault(iface, DesiredInterface(iface)).qdisc_commands.append(
+            _normalize(cmd)
+        )
+
+    for cmd in filter_commands:
+        iface = _device(cmd)
+        entry = desired.setdefault(iface, DesiredInterface(iface))
+        match = _FILTER_RE.search(_normalize(cmd))
+        if match is None:
+            # clsact creation or a non-flower command
+            continue
+        # Rules outside chain 0 keep their chain as a prefix
+        chain = match.group("chain") or ""
+        rule = f"{chain}{match.group('proto')} {match.group('body')}"
+        if rule not in entry.filter_rules:
+            entry.filter_rules.append(rule)
+
+    return desired
+
+
+def _chain(rule: str) -> int:
+    """Chain of a rule; 0 for the rules of the egress hook itself."""
+    return int(rule.split(" ", 2)[1]) if rule.startswith("chain ") else 0
+
+
+def _filter_command(action: str, interface: str, rule: str, pref: int) -> str:
+    chain = ""
+    if rule.startswith("chain "):
+        _, number, rule = rule.split(" ", 2)
+        chain = f"chain {number} "
+    proto, _, body = rule.partition(" ")
+    cmd = (
+        f"tc filter {action} dev {interface} egress {chain}protocol {proto} "
+        f"pref {pref} handle {FILTER_HANDLE} flower"
+    )
+    return f"{cmd} {body}" if action == "add" else cmd
+
+
+def plan_reconcile(
+    desired: DesiredInterface,
+    state: InterfaceState,
+    record: Optional[AppliedRecord] = None,
+) -> ReconcilePlan:
+    """
+    Compute the delta between desired and installed state of an interface.
+
+    :param desired: Desired configuration of the interface.
+    :type desired: DesiredInterface
+    :param state: Live snapshot of the interface.
+    :type state: InterfaceState
+    :param record: What was programmed last time, if known.
+    :type record: AppliedRecord, optional
+    :return: Commands to run and the record to store once they succeeded.
+    :rtype: ReconcilePlan
+    """
+    iface = desired.interface
+    plan = ReconcilePlan(iface)
+    record = record or AppliedRecord()
+
+    # --- qdisc tree ---
+    root = state.root
+    etf_count = sum(1 for c in desired.qdisc_commands if " etf " in c)
+    tree_installed = (
+        root is not None
+        and root.kind == "taprio"
+        and sum(1 for q in state.qdiscs if q.kind == "etf") == etf_count
+        and record.layout_key == desired.layout_key
+    )
+    if desired.qdisc_commands:
+        if not tree_installed:
+            if state.has_configured_root:
+                plan.qdisc_commands.append(f"tc qdisc del dev {iface} root")
+            plan.qdisc_commands.extend(desired.qdisc_commands)
+        elif _installed_schedule(root) != desired.schedule:
+            # Same layout: only the admin schedule of taprio is replaced
+            plan.qdisc_commands.append(desired.taprio_command)
+        plan.record.layout_key = desired.layout_key
+        plan.record.schedule_key = desired.schedule_key
+
+    # --- flower filters ---
+    live_prefs = {f.pref for f in state.filters}
+    installed = {
+        rule: pref for rule, pref in record.filters.items() if pref in live_prefs
+    }
+    unknown_prefs = live_prefs - set(installed.values())
+
+    if unknown_prefs:
+        # Filters we did not program: start from a clean clsact
+        plan.qdisc_commands.append(f"tc qdisc del dev {iface} clsact")
+        installed = {}
+    if desired.filter_rules and (unknown_prefs or not state.has_clsact):
+        plan.qdisc_commands.append(f"tc qdisc add dev {iface} clsact")
+
+    # Prefs follow the order of the desired rules in each chain, as on a
+    # first apply: overlapping matches are resolved by rule order. A kept
+    # rule whose pref would break that order is deleted and added again.
+    removed = [(r, p) for r, p in installed.items() if r not in desired.filter_rules]
+    used = set(installed.values()) - {p for r, p in removed if not _chain(r)}
+    adds: List[str] = []
+    last: Dict[int, int] = {}  # chain -> pref of its previous rule
+    for rule in desired.filter_rules:
+        chain = _chain(rule)
+        pref = installed.get(rule)
+        if pref is None or pref <= last.get(chain, 0):
+            if pref is not None:
+                removed.append((rule, pref))
+            pref = max(last.get(chain, 0) + 1, FILTER_PREF_BASE)
+            while pref in used:
+                pref += 1
+            adds.append(_filter_command("add", iface, rule, pref))
+            used.add(pref)
+        plan.record.filters[rule] = pref
+        last[chain] = pref
+
+    # Rules jumping to a chain are deleted before the adds and the chains'
+    # old rules after them, so no rule ever jumps to an empty chain
+    for rule, pref in removed:
+        if not _chain(rule):
+            plan.filter_commands.append(_filter_command("del", iface, rule, pref))
+    plan.filter_commands.extend(adds)
+    for rule, pref in removed:
+        if _chain(rule):
+            plan.filter_commands.append(_filter_command("del", iface, rule, pref))
+
+    return plan
+
+
+def plan_software_filters(
+    interface: str, filters: Dict[str, int], failed_commands: Iterable[str]
+) -> Tuple[List[str], Dict[str, int]]:
+    """
+    Move the hardware-only (``skip_sw``) rules of an interface to software.
+
+    Used when the NIC rejects some of them: rules jumping between chains
+    must all be in software for the jumps to work, so every ``skip_sw``
+    rule is replaced, at its pref, by the same rule without ``skip_sw``.
+    Chain 0 rules are deleted first and added back last, so none of them
+    jumps to a chain while its rule is being replaced.
+
+    :param interface: Network interface name.
+    :param filters: Rules and prefs of the plan's record.
+    :param failed_commands: ``tc filter add`` commands that failed; those
+                            rules are only added again, the others are
+                            deleted first.
+    :return: Commands to run, and the record's rules once they succeeded.
+    :rtype: Tuple[List[str], Dict[str, int]]
+    """
+    failed = {_normalize(cmd) for cmd in failed_commands}
+    deletes: List[str] = []
+    chains: List[str] = []
+    adds: List[str] = []
+    software: Dict[str, int] = {}
+    for rule, pref in filters.items():
+        if not _SKIP_SW_RE.search(rule):
+            software[rule] = pref
+            continue
+        delete = []
+        if _filter_command("add", interface, rule, pref) not in failed:
+            delete = [_filter_command("del", interface, rule, pref)]
+        sw_rule = _SKIP_SW_RE.sub("", rule)
+        add = [_filter_command("add", interface, sw_rule, pref)]
+        if _chain(rule):
+            chains += delete + add
+        else:
+            deletes += delete
+            adds += add
+        software[sw_rule] = pref
+    return deletes + chains + adds, software
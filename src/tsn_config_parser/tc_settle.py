@@ -0,0 +1,189 @@
+# File: tc_settle.py
+"""
+tc_settle
+=========
+
+Adaptive settle detection for tc changes.
+
+``tc`` and netlink requests return once the kernel has accepted a change,
+but offloading NICs may still be reprogramming (for example the ``igc``
+driver resets the adapter when taprio/etf offload is toggled, which drops
+the link for a moment). Instead of sleeping a fixed delay after every
+command, callers poll a probe until it reports the interface as settled,
+bounded by a per-device upper limit.
+
+Right after the command the carrier of such a NIC is often still up: the
+driver has not dropped the link yet. :class:`LinkReset` therefore waits for
+the link to go down first, seen as a lost carrier or as a bump of
+``carrier_changes`` (which also catches a bounce shorter than a poll), and
+only then for the carrier to come back.
+
+Example
+-------
+
+.. code-block:: python
+
+    from tc_settle import LinkReset, link_state, wait_for_settle
+
+    before = link_state("enp170s0")
+    # ... program the interface ...
+    waited = wait_for_settle(LinkReset("enp170s0", before), timeout=1.0)
+"""
+
+import logging
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Optional
+
+__all__ = [
+    "DEFAULT_SETTLE_TIMEOUT",
+    "LinkReset",
+    "LinkState",
+    "link_has_carrier",
+    "link_settled",
+    "link_state",
+    "wait_for_settle",
+]
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SETTLE_TIMEOUT = 1.0  # seconds, upper bound when no device is known
+SETTLE_POLL_INTERVAL = 0.01  # seconds
+
+SYS_CLASS_NET = Path("/sys/class/net")
+
+
+def link_has_carrier(interface: str) -> Optional[bool]:
+    """
+    Return the carrier state of ``interface``.
+
+    :param interface: Network interface name.
+    :type interface: str
+    :return: ``True``/``False`` for link up/down, ``None`` if it cannot be
+             read (interface administratively down or missing).
+    :rtype: Optional[bool]
+    """
+    try:
+        return (SYS_CLASS_NET / interface / "carrier").read_text().strip() == "1"
+    except OSError:
+        return None
+
+
+def _carrier_changes(interface: str) -> Optional[int]:
+    try:
+        return int((SYS_CLASS_NET / interface / "carrier_changes").read_text())
+    except (OSError, ValueError):
+        return None
+
+
+@dataclass(frozen=True)
+class LinkState:
+    """
+    Carrier of an interface at one point in time.
+
+    :ivar Optional[bool] carrier: Link up/down, None if unreadable
+    :ivar Optional[int] carrier_changes: Carrier transitions since the
+        interface was created, None if unreadable
+    """
+
+    carrier: Optional[bool]
+    carrier_changes: Optional[int]
+
+
+def link_state(interface: str) -> LinkState:
+    """
+    Read the carrier state and carrier transition counter of ``interface``.
+
+    :param interface: Network interface name.
+    :type interface: str
+    :return: Current link state.
+    :rtype: LinkState
+    """
+    return LinkState(link_has_carrier(interface), _carrier_changes(interface))
+
+
+def link_settled(interface: str, had_carrier: Optional[bool]) -> bool:
+    """
+    Return True once ``interface`` is back to its carrier state.
+
+    Only suited to changes that do not reset the link: a link that has not
+    gone down yet passes as well. Use :class:`LinkReset` otherwise.
+
+    Interfaces that had no carrier before the change are considered
+    settled immediately; there is nothing to wait for.
+    """
+    if not had_carrier:
+        return True
+    return link_has_carrier(interface) is True
+
+
+class LinkReset:
+    """
+    Settle probe for a change that makes the NIC reset its link.
+
+    Reports the interface as settled once its link went down and came back
+    up since ``before``. Interfaces that had no carrier before the change
+    are settled immediately; there is nothing to wait for.
+    """
+
+    def __init__(self, interface: str, before: LinkState):
+        """
+        :param str interface: Network interface name
+        :param LinkState before: Link state taken before the change
+        """
+        self.interface = interface
+        self.before = before
+        self.went_down = False
+
+    def __call__(self) -> bool:
+        """Return True once the link went down and is up again."""
+        if not self.before.carrier:
+            return True
+        now = link_state(self.interface)
+        if now.carrier is False:
+            self.went_down = True
+        elif (
+            now.carrier_changes is not None
+            and self.before.carrier_changes is not None
+            and now.carrier_changes > self.before.carrier_changes
+        ):
+            self.went_down = True
+        return self.went_down and now.carrier is True
+
+
+def wait_for_settle(
+    probe: Callable[[], bool],
+    timeout: float = DEFAULT_SETTLE_TIMEOUT,
+    poll_interval: float = SETTLE_POLL_INTERVAL,
+) -> float:
+    """
+    Poll ``probe`` until it returns True or ``timeout`` expires.
+
+    :param probe: Callable returning True once the interface has settled.
+    :type probe: Callable[[], bool]
+    :param timeout: Upper bound in seconds.
+    :type timeout: float
+    :param poll_interval: Delay between two probes in seconds.
+    :type poll_interval: float
+    :return: Seconds actually waited.
+    :rtype: float
+    """
+    start = time.monotonic()
+    deadline = start + timeout
+
+    while True:
+        try:
+            if probe():
+                break
+        except Exception as exc:
+            # A failing probe (e.g. device briefly gone) means "not yet"
+            logger.debug(f"Settle probe failed: {exc}")
+
+        now = time.monotonic()
+        if now >= deadline:
+            logger.warning(f"Interface did not settle within {timeout:.3f}s")
+            break
+        time.sleep(min(poll_interval, deadline - now))
+
+    return time.monotonic() - start
@@ -0,0 +1,144 @@
+# File: tc_state.py
+"""
+tc_state
+========
+
+Interface state snapshots and teardown planning.
+
+A :class:`InterfaceState` is read once per interface through a tc backend
+and every decision (what to delete, in which order) is derived from it,
+instead of re-querying the kernel before each step.
+
+Example
+-------
+
+.. code-block:: python
+
+    from tc_backend import get_tc_backend
+    from tc_state import plan_interface_reset, snapshot_interface
+
+    backend = get_tc_backend()
+    states = [snapshot_interface(backend, i) for i in ("enp1s0", "enp2s0")]
+    plan = [step for state in states for step in plan_interface_reset(state)]
+    result = backend.execute_teardown(plan)
+"""
+
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional
+
+from .tc_backend import Qdisc, TCBackend, TCFilter
+
+__all__ = [
+    "InterfaceState",
+    "TeardownStep",
+    "snapshot_interface",
+    "snapshot_interfaces",
+    "plan_interface_reset",
+]
+
+
+@dataclass
+class InterfaceState:
+    """tc state of one interface, read in a single snapshot."""
+
+    interface: str
+    qdiscs: List[Qdisc] = field(default_factory=list)
+    filters: List[TCFilter] = field(default_factory=list)
+
+    @property
+    def root(self) -> Optional[Qdisc]:
+        """The root qdisc, if any."""
+        return next((q for q in self.qdiscs if q.is_root), None)
+
+    @property
+    def has_configured_root(self) -> bool:
+        """True if the root qdisc was installed by someone (handle is not 0:).
+
+        Default root qdiscs (mq, pfifo_fast, noqueue) cannot be deleted.
+        """
+        root = self.root
+        return root is not None and root.handle != "0:"
+
+    @property
+    def has_clsact(self) -> bool:
+        """True if a clsact qdisc is attached."""
+        return any(q.kind == "clsact" for q in self.qdiscs)
+
+    @property
+    def is_reset(self) -> bool:
+        """True if nothing is left to tear down."""
+        return not self.has_clsact and not self.has_configured_root
+
+
+@dataclass(frozen=True)
+class TeardownStep:
+    """Deletion of one qdisc (``root`` or ``clsact``) on one interface."""
+
+    interface: str
+    parent: str
+
+    @property
+    def command(self) -> str:
+        """Equivalent ``tc`` command line."""
+        return f"tc qdisc del dev {self.interface} {self.parent}"
+
+
+def snapshot_interface(backend: TCBackend, interface: str) -> InterfaceState:
+    """
+    Read the tc state of ``interface`` once.
+
+    Egress filters can only exist under a ``clsact`` qdisc, so filters are
+    only dumped when one is attached.
+
+    :param backend: Backend used to query the kernel.
+    :type backend: TCBackend
+    :param interface: Network interface name.
+    :type interface: str
+    :return: Snapshot of qdiscs and egress filters.
+    :rtype: InterfaceState
+    """
+    state = InterfaceState(interface, qdiscs=backend.get_qdiscs(interface))
+    if state.has_clsact:
+        state.filters = backend.get_filters(interface)
+    return state
+
+
+def snapshot_interfaces(
+    backend: TCBackend, interfaces: Iterable[str]
+) -> Dict[str, InterfaceState]:
+    """
+    Read the tc state of several interfaces, once each.
+
+    :param backend: Backend used to query the kernel.
+    :type backend: TCBackend
+    :param interfaces: Network interface names; duplicates are read once.
+    :type interfaces: Iterable[str]
+    :return: Snapshot per interface.
+    :rtype: Dict[str, InterfaceState]
+    """
+    states: Dict[str, InterfaceState] = {}
+    for interface in interfaces:
+        if interface not in states:
+            states[interface] = snapshot_interface(backend, interface)
+    return states
+
+
+def plan_interface_reset(state: InterfaceState) -> List[TeardownStep]:
+    """
+    Derive the minimal ordered teardown plan for a snapshot.
+
+    Deleting the ``clsact`` qdisc also destroys every egress filter
+    attached to it, and deleting the root qdisc destroys its children
+    (e.g. the etf qdiscs under taprio), so at most two steps are needed.
+
+    :param state: Snapshot from :func:`snapshot_interface`.
+    :type state: InterfaceState
+    :return: Steps to execute, in order.
+    :rtype: List[TeardownStep]
+    """
+    steps: List[TeardownStep] = []
+    if state.has_clsact:
+        steps.append(TeardownStep(state.interface, "clsact"))
+    if state.has_configured_root:
+        steps.append(TeardownStep(state.interface, "root"))
+    return steps
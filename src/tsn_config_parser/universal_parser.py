@@ -4,7 +4,9 @@ Universal Parser
 
 Delegates parsing of files to either XMLParser or YAMLParser based on file extension.
 Provides unified helpers (e.g., has_chronos_domain, find_value) that work regardless of format,
-with caching to avoid reparsing unless explicitly refreshed.
+with caching to avoid reparsing unless explicitly refreshed: parsed files are kept in the
+process-wide :data:`~tsn_config_parser.parse_cache.parse_cache`, keyed by path and validated
+against the file's (mtime, size) and content hash.
 
 Example usage:
     >>> parser = UniversalParser()
@@ -22,9 +24,11 @@ Dependencies:
 import json
 import os
 import sys
+from typing import Optional
 
 # from json_parser import JSONParser
 from .GE_dictionary import GE_Dictionary
+from .parse_cache import CacheEntry, Fingerprint, ParseCache, parse_cache
 from .xml_parser import XMLParser
 from .yaml_parser import YAMLParser
 
@@ -41,7 +45,12 @@ class UniversalParser:
     Delegates parsing to the correct specialized parser based on file extension.
     """
 
-    def __init__(self):
+    def __init__(self, cache: Optional[ParseCache] = parse_cache):
+        """
+        :param cache: Cache of parsed files; None disables caching
+        :type cache: ParseCache, optional
+        """
+        self.cache = cache
         self.parsers = {
             ".xml": XMLParser(),
             ".yaml": YAMLParser(),
@@ -50,11 +59,15 @@ class UniversalParser:
         }
         self.current_parser = None
         self.documents = []
+        self._entry: Optional[CacheEntry] = None
 
     def parse(self, file_path: str):
         """
         Parse a file using the appropriate parser.
 
+        An unchanged file that is in the cache is not parsed again; the
+        returned documents are then shared and must not be modified.
+
         :param file_path: Path to the file
         :return: List of parsed documents
         :raises ValueError: If file extension is not supported
@@ -65,7 +78,23 @@ class UniversalParser:
             raise ValueError(f"Unsupported file extension: {ext}")
 
         self.current_parser = parser
-        self.documents = parser.parse(file_path)
+        self._entry = None
+        if self.cache is None:
+            self.documents = parser.parse(file_path)
+            return self.documents
+
+        # Fingerprint and hash before parsing: a file rewritten meanwhile is
+        # a miss next time instead of being cached under its new identity
+        fingerprint = Fingerprint(file_path)
+        self._entry = self.cache.get(file_path, fingerprint)
+        if self._entry is None:
+            fingerprint.compute_digest()
+            documents = parser.parse(file_path)
+            self._entry = self.cache.put(
+                file_path, fingerprint, documents, parser.has_chronos_domain()
+            )
+
+        self.documents = self._entry.documents
         return self.documents
 
     def get_parser(self):
@@ -82,6 +111,8 @@ class UniversalParser:
 
         :return: True if found, False otherwise
         """
+        if self._entry is not None:
+            return self._entry.has_chronos
         if self.current_parser is None:
             return False
         return self.current_parser.has_chronos_domain()
@@ -92,6 +123,8 @@ class UniversalParser:
 
         :param file_path: Path to the file
         """
+        if self.cache is not None:
+            self.cache.invalidate(file_path)
         return self.parse(file_path)
 
     def get_dictionary_helper(self):
@@ -100,9 +133,14 @@ class UniversalParser:
 
         :return: GE_Dictionary if chronos-domain is found, else None
         """
-        if self.has_chronos_domain():
+        if not self.has_chronos_domain():
+            return None
+        if self._entry is None:
             return GE_Dictionary(self.documents)
-        return None
+        # Shared with the cache entry so its index is only built once
+        if self._entry.ge_dictionary is None:
+            self._entry.ge_dictionary = GE_Dictionary(self._entry.documents)
+        return self._entry.ge_dictionary
 
     def find_all_by_key(self, key: str):
         """
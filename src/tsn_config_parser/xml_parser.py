@@ -2,36 +2,110 @@
 """
 XML Parser with namespace stripping and helpers.
 
+By default the file is read in chunks and parsed with an incremental
+(``iterparse``-style) pull parser: every element is converted to a
+dictionary as soon as it is closed and then cleared, so memory stays
+proportional to one document rather than to the whole file. Pass
+``streaming=False`` to build the full ElementTree first.
+
 Usage:
     python xml_parser.py path/to/file.xml
 """
 
 import xml.etree.ElementTree as ET
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Tuple
 import sys
 
+CHRONOS_DOMAIN = "chronos-domain"
+READ_CHUNK_SIZE = 64 * 1024  # characters fed to the pull parser at once
+
+# Multiple root elements are parsed inside this synthetic wrapper
+_WRAPPER_OPEN = "<root>"
+_WRAPPER_CLOSE = "</root>"
+
 
 class XMLParser:
     """XML parser that handles multiple root elements and strips namespaces."""
 
-    def __init__(self):
+    def __init__(self, streaming: bool = True):
+        """
+        :param bool streaming: Convert elements while the file is read
+                               (default) instead of building a full tree
+        """
+        self.streaming = streaming
         self.documents: List[Dict[str, Any]] = []
+        # Set while the elements are converted, see _note_chronos()
+        self._chronos_found = False
 
     def parse(self, file_path: str) -> List[Dict[str, Any]]:
         """Parse an XML file into multiple documents."""
         self.documents = []
+        self._chronos_found = False
 
+        if self.streaming:
+            self._parse_streaming(file_path)
+        else:
+            self._parse_tree(file_path)
+
+        return self.documents
+
+    def _parse_tree(self, file_path: str) -> None:
+        """Parse the whole file into an ElementTree, then convert it."""
         with open(file_path, "r", encoding="utf-8") as f:
-            content = f.read()
+            content = _strip_xml_declaration(f.read())
 
         # Wrap multiple roots
-        wrapped = f"<root>{content}</root>"
-        root = ET.fromstring(wrapped)
+        root = ET.fromstring(f"{_WRAPPER_OPEN}{content}{_WRAPPER_CLOSE}")
 
         for child in root:
             self.documents.append(self._element_to_dict(child))
 
-        return self.documents
+    def _parse_streaming(self, file_path: str) -> None:
+        """Parse the file chunk by chunk, converting elements as they close."""
+        parser = ET.XMLPullParser(events=("start", "end"))
+        # Dictionary under construction for every open element; the first
+        # one belongs to the wrapper
+        frames: List[Dict[str, Any]] = []
+
+        # Multiple roots: the wrapper is fed around the content, no copy
+        parser.feed(_WRAPPER_OPEN)
+        with open(file_path, "r", encoding="utf-8") as f:
+            chunk = f.read(READ_CHUNK_SIZE)
+            # The XML declaration must be complete before it can be dropped
+            while chunk.lstrip().startswith("<?xml") and "?>" not in chunk:
+                more = f.read(READ_CHUNK_SIZE)
+                if not more:
+                    break
+                chunk += more
+            chunk = _strip_xml_declaration(chunk)
+            while chunk:
+                parser.feed(chunk)
+                self._consume_events(parser, frames)
+                chunk = f.read(READ_CHUNK_SIZE)
+        parser.feed(_WRAPPER_CLOSE)
+        parser.close()
+        self._consume_events(parser, frames)
+
+    def _consume_events(
+        self, parser: ET.XMLPullParser, frames: List[Dict[str, Any]]
+    ) -> None:
+        """Convert the elements closed since the last call."""
+        for event, element in parser.read_events():
+            if event == "start":
+                frames.append({f"@{k}": v for k, v in element.attrib.items()})
+                continue
+
+            node = frames.pop()
+            if not frames:
+                continue  # End of the wrapper
+
+            tag, value = self._finish_element(element, node)
+            if len(frames) == 1:
+                self.documents.append({tag: value})
+            else:
+                _add_child(frames[-1], tag, value)
+            # Converted: drop children, text and attributes
+            element.clear()
 
     def _strip_namespace(self, tag: str) -> str:
         """Remove XML namespace from a tag."""
@@ -39,56 +113,80 @@ class XMLParser:
 
     def _element_to_dict(self, element: ET.Element) -> Dict[str, Any]:
         """Convert an XML element to a dictionary with namespace stripped."""
-        node: Dict[str, Any] = {}
-        tag = self._strip_namespace(element.tag)
+        tag, value = self._element_to_item(element)
+        return {tag: value}
 
+    def _element_to_item(self, element: ET.Element) -> Tuple[str, Any]:
+        """Convert an XML element (recursively) to its tag and value."""
         # Attributes
-        if element.attrib:
-            node.update({f"@{k}": v for k, v in element.attrib.items()})
+        node: Dict[str, Any] = {f"@{k}": v for k, v in element.attrib.items()}
 
         # Children
-        children = list(element)
-        if children:
-            for child in children:
-                child_dict = self._element_to_dict(child)
-                child_tag = list(child_dict.keys())[0]
-                child_value = child_dict[child_tag]
-
-                if child_tag in node:
-                    if not isinstance(node[child_tag], list):
-                        node[child_tag] = [node[child_tag]]
-                    node[child_tag].append(child_value)
-                else:
-                    node[child_tag] = child_value
+        for child in element:
+            _add_child(node, *self._element_to_item(child))
+
+        return self._finish_element(element, node)
+
+    def _finish_element(
+        self, element: ET.Element, node: Dict[str, Any]
+    ) -> Tuple[str, Any]:
+        """
+        Complete the conversion of an element whose attributes and children
+        are already in ``node``.
+
+        :return: Tag without namespace, and the element's value
+        """
+        tag = self._strip_namespace(element.tag)
+        if not self._chronos_found:
+            self._note_chronos(element)
 
         # Text
         text = element.text.strip() if element.text else ""
         if text:
-            if children or element.attrib:
+            if node:
                 node["#text"] = text
             else:
-                return {tag: text}
+                return tag, text
 
-        return {tag: node} if node else {tag: None}
+        return tag, (node if node else None)
 
     def has_chronos_domain(self) -> bool:
-        """Check if any document contains 'chronos-domain'."""
-        return any(self._contains_chronos(doc) for doc in self.documents)
-
-    def _contains_chronos(self, node: Any) -> bool:
-        """Recursive search for 'chronos-domain'."""
-        if isinstance(node, dict):
-            for k, v in node.items():
-                if (
-                    "chronos-domain" in str(k).lower()
-                    or "chronos-domain" in str(v).lower()
-                ):
-                    return True
-                if self._contains_chronos(v):
-                    return True
-        elif isinstance(node, list):
-            return any(self._contains_chronos(item) for item in node)
-        return False
+        """Check if any document contains 'chronos-domain'.
+
+        Detection happens while the file is parsed, so this is a flag read.
+        """
+        return self._chronos_found
+
+    def _note_chronos(self, element: ET.Element) -> None:
+        """Flag a 'chronos-domain' hit in the tag, attributes or text.
+
+        The tag still carries its namespace here, so a hit in the namespace
+        URI counts as well.
+        """
+        leaves = [element.tag, element.text or ""]
+        for k, v in element.attrib.items():
+            leaves.extend((k, v))
+        self._chronos_found = any(CHRONOS_DOMAIN in leaf.lower() for leaf in leaves)
+
+
+def _add_child(node: Dict[str, Any], tag: str, value: Any) -> None:
+    """Add a child value; repeated tags become a list."""
+    if tag in node:
+        if not isinstance(node[tag], list):
+            node[tag] = [node[tag]]
+        node[tag].append(value)
+    else:
+        node[tag] = value
+
+
+def _strip_xml_declaration(content: str) -> str:
+    """Drop a leading ``<?xml ...?>`` declaration, which cannot be wrapped."""
+    stripped = content.lstrip()
+    if stripped.startswith("<?xml"):
+        end = stripped.find("?>")
+        if end != -1:
+            return stripped[end + 2 :]
+    return content
 
 
 # -----------------------------
@@ -16,7 +16,9 @@ Example usage
 """
 
 import yaml
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
+
+CHRONOS_DOMAIN = "chronos-domain"
 
 
 class YAMLParser:
@@ -27,6 +29,7 @@ class YAMLParser:
 
     def __init__(self) -> None:
         self.documents: List[Dict[str, Any]] = []
+        self._chronos_found: Optional[bool] = None
 
     def parse(self, file_path: str) -> List[Dict[str, Any]]:
         """
@@ -36,6 +39,7 @@ class YAMLParser:
         :return: List of parsed YAML documents (dicts)
         """
         self.documents = []
+        self._chronos_found = None
 
         with open(file_path, "r", encoding="utf-8") as f:
             docs = list(yaml.safe_load_all(f))
@@ -50,25 +54,33 @@ class YAMLParser:
         self.parse(file_path)
 
     def has_chronos_domain(self) -> bool:
-        """Check if any document contains 'chronos-domain'."""
-        for doc in self.documents:
-            if self._contains_chronos(doc):
-                return True
-        return False
+        """Check if any document contains 'chronos-domain'.
+
+        The result is computed once per parse.
+        """
+        if self._chronos_found is None:
+            self._chronos_found = any(
+                self._contains_chronos(doc) for doc in self.documents
+            )
+        return self._chronos_found
 
     def _contains_chronos(self, node: Any) -> bool:
-        """Recursive helper to search for 'chronos-domain'."""
-        if isinstance(node, dict):
-            for k, v in node.items():
-                if (
-                    "chronos-domain" in str(k).lower()
-                    or "chronos-domain" in str(v).lower()
-                ):
-                    return True
-                if self._contains_chronos(v):
-                    return True
-        elif isinstance(node, list):
-            return any(self._contains_chronos(item) for item in node)
+        """Search keys and scalar leaves for 'chronos-domain'.
+
+        Every node is visited once; containers are never stringified.
+        """
+        stack = [node]
+        while stack:
+            item = stack.pop()
+            if isinstance(item, dict):
+                for k, v in item.items():
+                    if CHRONOS_DOMAIN in str(k).lower():
+                        return True
+                    stack.append(v)
+            elif isinstance(item, list):
+                stack.extend(item)
+            elif CHRONOS_DOMAIN in str(item).lower():
+                return True
         return False
 
     def find_all_by_key(self, key: str) -> List[Any]:
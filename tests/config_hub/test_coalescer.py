@@ -0,0 +1,59 @@
+import threading
+import time
+
+from time_config_hub.coalescer import EventCoalescer
+
+
+class _Recorder:
+    def __init__(self):
+        self.calls = []
+        self.fired = threading.Event()
+
+    def __call__(self, path, event_type):
+        self.calls.append((path, event_type, time.monotonic()))
+        self.fired.set()
+
+
+def test_burst_fires_once_after_quiet_period():
+    recorder = _Recorder()
+    coalescer = EventCoalescer(recorder, interval=0.05, max_delay=5)
+
+    start = time.monotonic()
+    coalescer.add("/a.xml", "created")
+    for _ in range(5):
+        time.sleep(0.01)
+        coalescer.add("/a.xml", "modified")
+    last = time.monotonic()
+
+    assert recorder.fired.wait(2)
+    coalescer.close()
+
+    assert [c[:2] for c in recorder.calls] == [("/a.xml", "modified")]
+    assert recorder.calls[0][2] >= last + 0.04
+    assert coalescer.pending == 0
+    assert recorder.calls[0][2] - start < 2
+
+
+def test_max_delay_bounds_a_continuous_burst():
+    recorder = _Recorder()
+    coalescer = EventCoalescer(recorder, interval=0.05, max_delay=0.15)
+
+    start = time.monotonic()
+    while not recorder.fired.is_set() and time.monotonic() - start < 2:
+        coalescer.add("/a.xml", "modified")
+        time.sleep(0.01)
+    coalescer.close(flush=False)
+
+    assert recorder.calls[0][2] - start < 0.5
+
+
+def test_discard_and_flush_on_close():
+    recorder = _Recorder()
+    coalescer = EventCoalescer(recorder, interval=10, max_delay=10)
+
+    coalescer.add("/a.xml", "modified")
+    coalescer.add("/b.xml", "created")
+    assert coalescer.discard("/a.xml")
+    coalescer.close(flush=True)
+
+    assert [c[:2] for c in recorder.calls] == [("/b.xml", "created")]
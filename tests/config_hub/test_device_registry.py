@@ -0,0 +1,33 @@
+import pytest
+
+from time_config_hub.devices import Device, device
+
+
+@pytest.fixture
+def registry():
+    saved = dict(device._registry)
+    yield device._registry
+    device._registry.clear()
+    device._registry.update(saved)
+
+
+def test_manifest_device_resolved_by_normalized_id():
+    assert Device._get_device_class_by_pci_id("0x8086:0x125b").__name__ == "IntelI226"
+
+
+def test_subclass_registers_at_definition(registry):
+    class TestNic(Device):
+        VALID_PCI_IDS = ["abcd:0001"]
+
+    assert registry["ABCD:0001"] is TestNic
+    assert Device._get_device_class_by_pci_id("ABCD:0001") is TestNic
+
+    with pytest.raises(ValueError):
+
+        class OtherNic(Device):
+            VALID_PCI_IDS = ["ABCD:0001"]
+
+
+def test_unknown_pci_id():
+    with pytest.raises(NameError):
+        Device._get_device_class_by_pci_id("FFFF:FFFF")
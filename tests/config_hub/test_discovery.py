@@ -0,0 +1,101 @@
+import os
+from unittest.mock import patch
+
+import pytest
+
+from time_config_hub.core import TIMEConfigHub
+from time_config_hub.devices import Device
+from time_config_hub.utils.discovery import DeviceDiscovery
+from time_config_hub.utils.pci_utils import PCIUtils
+
+
+def _add_nic(root, name, bus=None, vendor="0x8086", device="0x125b", queues=4):
+    iface = root / "class" / "net" / name
+    for i in range(queues):
+        (iface / "queues" / f"tx-{i}").mkdir(parents=True)
+        (iface / "queues" / f"rx-{i}").mkdir(parents=True)
+    if bus is None:
+        return
+    pci = root / "devices" / "pci0000:00" / bus
+    pci.mkdir(parents=True)
+    (pci / "vendor").write_text(f"{vendor}\n")
+    (pci / "device").write_text(f"{device}\n")
+    os.symlink(root / "bus" / "pci", pci / "subsystem")
+    os.symlink(root / "bus" / "pci" / "drivers" / "igc", pci / "driver")
+    os.symlink(pci, iface / "device")
+
+
+def test_scan_reads_pci_identity_and_queues(tmp_path):
+    _add_nic(tmp_path, "enp1s0", "0000:01:00.0")
+    _add_nic(tmp_path, "lo", queues=1)
+    discovery = DeviceDiscovery(sysfs_root=str(tmp_path))
+
+    info = discovery.get("enp1s0")
+    assert info.pci_id == "8086:125B"
+    assert (info.bus_address, info.driver) == ("0000:01:00.0", "igc")
+    assert (info.num_tx_queues, info.num_rx_queues) == (4, 4)
+    assert discovery.get("lo").pci_id is None
+    assert discovery.by_bus_address("0000:01:00.0").interface == "enp1s0"
+
+
+def test_scans_once_until_ttl_or_unknown_interface(tmp_path):
+    _add_nic(tmp_path, "enp1s0", "0000:01:00.0")
+    discovery = DeviceDiscovery(ttl=60, sysfs_root=str(tmp_path))
+
+    with patch.object(discovery, "_scan", wraps=discovery._scan) as scan:
+        for _ in range(3):
+            discovery.get("enp1s0")
+        assert scan.call_count == 1
+
+        _add_nic(tmp_path, "enp2s0", "0000:02:00.0")
+        assert discovery.get("enp2s0").bus_address == "0000:02:00.0"
+        assert scan.call_count == 2
+
+
+def test_device_from_interface_uses_discovery(tmp_path):
+    _add_nic(tmp_path, "enp1s0", "0000:01:00.0")
+    discovery = DeviceDiscovery(sysfs_root=str(tmp_path))
+
+    with patch("time_config_hub.devices.device.device_discovery", discovery), patch(
+        "subprocess.run"
+    ) as run:
+        device = Device.from_bus_address("0000:01:00.0")
+        assert device.bus_info == "0000:01:00.0"
+
+    run.assert_not_called()
+    assert type(device).__name__ == "IntelI226"
+
+
+def test_hub_validates_and_sizes_interfaces_from_discovery(tmp_path):
+    _add_nic(tmp_path, "enp3s0", queues=8)
+    _add_nic(tmp_path, "lo", queues=1)
+    discovery = DeviceDiscovery(sysfs_root=str(tmp_path))
+    hub = TIMEConfigHub({"General": {"ConfigDirectory": str(tmp_path)}})
+
+    with patch("time_config_hub.core.device_discovery", discovery), patch(
+        "time_config_hub.devices.device.device_discovery", discovery
+    ):
+        assert hub._validate_interface("enp3s0")
+        assert not hub._validate_interface("lo")
+        assert not hub._validate_interface("enp9s0")
+        # Unknown NIC: one class per real transmit queue, not the 4 default
+        layout = hub._qdisc_layout("enp3s0", ["sched-entry S 80 500000"])
+
+    assert layout.num_tc == 8
+    assert layout.etf_classes == list(range(1, 9))
+
+
+def test_deprecated_pci_utils_delegate_to_discovery(tmp_path):
+    _add_nic(tmp_path, "enp1s0", "0000:01:00.0")
+    discovery = DeviceDiscovery(sysfs_root=str(tmp_path))
+
+    with patch("time_config_hub.utils.pci_utils.device_discovery", discovery), patch(
+        "subprocess.run"
+    ) as run, pytest.warns(DeprecationWarning):
+        assert PCIUtils.get_bus_address("enp1s0") == "0000:01:00.0"
+        assert PCIUtils.get_pci_id("enp1s0") == "8086:125B"
+        assert PCIUtils.get_interface_by_bus_address("0000:01:00.0") == "enp1s0"
+        with pytest.raises(RuntimeError):
+            PCIUtils.get_vendor_id("enp9s0")
+
+    run.assert_not_called()
@@ -0,0 +1,93 @@
+import threading
+import time
+
+from time_config_hub.event_pipeline import EventPipeline
+from time_config_hub.metrics import metrics
+
+
+def test_same_key_runs_serialized_in_order():
+    pipeline = EventPipeline(workers=4)
+    order = []
+    active = []
+
+    def job(i):
+        active.append(i)
+        assert len(active) == 1
+        time.sleep(0.01)
+        order.append(i)
+        active.remove(i)
+
+    for i in range(5):
+        pipeline.submit(["file:/a.xml"], job, i)
+    assert pipeline.shutdown(timeout=5)
+
+    assert order == [0, 1, 2, 3, 4]
+
+
+def test_disjoint_keys_run_in_parallel():
+    pipeline = EventPipeline(workers=2)
+    barrier = threading.Barrier(2, timeout=2)
+    results = []
+
+    for path in ("file:/a.xml", "file:/b.xml"):
+        pipeline.submit([path], lambda: results.append(barrier.wait()))
+    assert pipeline.shutdown(timeout=5)
+
+    assert sorted(results) == [0, 1]
+
+
+def test_shared_interface_serializes_different_files():
+    pipeline = EventPipeline(workers=2)
+    running = threading.Event()
+    overlap = []
+
+    def job():
+        overlap.append(running.is_set())
+        running.set()
+        time.sleep(0.02)
+        running.clear()
+
+    pipeline.submit(["file:/a.xml", "iface:enp1s0"], job)
+    pipeline.submit(["file:/b.xml", "iface:enp1s0"], job)
+    assert pipeline.shutdown(timeout=5)
+
+    assert overlap == [False, False]
+
+
+def test_full_queue_drops_and_reports_backlog():
+    metrics.reset()
+    release = threading.Event()
+    pipeline = EventPipeline(workers=1, max_queue=1)
+
+    assert pipeline.submit(["file:/a.xml"], release.wait)
+    while pipeline.backlog:  # wait until the worker picked it up
+        time.sleep(0.001)
+    assert pipeline.submit(["file:/a.xml"], lambda: None)
+    assert not pipeline.submit(["file:/b.xml"], lambda: None)
+
+    assert metrics.get("watch_queue_backlog") == 1
+    assert metrics.get("watch_events_dropped") == 1
+    release.set()
+    assert pipeline.shutdown(timeout=5)
+    assert metrics.get("watch_queue_backlog") == 0
+
+
+def test_newer_event_supersedes_queued_job_of_same_path():
+    metrics.reset()
+    release = threading.Event()
+    pipeline = EventPipeline(workers=1)
+    applied = []
+
+    pipeline.submit(["file:/a.xml"], release.wait, supersede="/a.xml")
+    while pipeline.backlog:  # the running job is never superseded
+        time.sleep(0.001)
+    for i in range(3):
+        pipeline.submit(["file:/a.xml"], applied.append, i, supersede="/a.xml")
+    pipeline.submit(["file:/b.xml"], applied.append, "b", supersede="/b.xml")
+
+    assert pipeline.backlog == 2
+    release.set()
+    assert pipeline.shutdown(timeout=5)
+
+    assert applied == [2, "b"]
+    assert metrics.get("watch_events_superseded") == 2
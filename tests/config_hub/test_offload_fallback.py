@@ -0,0 +1,157 @@
+import time
+from unittest.mock import MagicMock, patch
+
+from time_config_hub.core import TIMEConfigHub, _resets_offload
+from time_config_hub.devices.intel_i226 import IntelI226
+from tsn_config_parser.tc_backend import Qdisc, TCFilter
+from tsn_config_parser.tc_command import create_tc_qdisc_gcl_command
+from tsn_config_parser.tc_filters import compile_filters
+from tsn_config_parser.tc_layout import OffloadCapabilities, plan_qdisc_layout
+from tsn_config_parser.tc_reconcile import desired_from_commands
+from tsn_config_parser.tc_settle import LinkState
+from tsn_config_parser.tc_state import InterfaceState
+
+GCL = ["sched-entry S 0F 500000"]
+
+
+def _hub(tmp_path):
+    hub = TIMEConfigHub(
+        {"General": {"ConfigDirectory": str(tmp_path), "TCBackend": "cli"}}
+    )
+    hub.tc_backend = MagicMock()
+    hub.tc_backend.get_qdiscs.return_value = []
+    hub.tc_backend.get_filters.return_value = []
+    hub._settle_timeouts = {"eth0": 0.01}
+    return hub
+
+
+def _reject_full_offload(commands):
+    failures = [
+        {"line": i, "command": cmd, "stderr": "Operation not supported"}
+        for i, cmd in enumerate(commands, start=1)
+        if "flags 0x2" in cmd
+    ]
+    return {
+        "stdout": "",
+        "stderr": "",
+        "returncode": int(bool(failures)),
+        "failures": failures,
+    }
+
+
+def test_rejected_full_offload_falls_back_to_txtime_assist(tmp_path):
+    hub = _hub(tmp_path)
+    hub.tc_backend.run_batch.side_effect = _reject_full_offload
+    caps = OffloadCapabilities(
+        4, taprio_full_offload=True, etf_offload=True, launch_time_queues=(0, 1, 2, 3)
+    )
+    layout = plan_qdisc_layout(caps, GCL)
+    primary = create_tc_qdisc_gcl_command(["eth0"], GCL, **layout.command_args())
+    fallback = create_tc_qdisc_gcl_command(
+        ["eth0"], GCL, **layout.fallback.command_args()
+    )
+
+    plan, errors = hub._apply_interface(
+        desired_from_commands(primary, [])["eth0"], None, False, False, fallback
+    )
+
+    assert errors == {}
+    assert "flags 0x1" in hub.tc_backend.run_batch.call_args.args[0][0]
+    assert plan.record.offload_fallback
+    assert (
+        plan.record.layout_key == desired_from_commands(fallback, [])["eth0"].layout_key
+    )
+    assert hub._no_full_offload == {"eth0"}
+
+
+def test_status_reports_offload_mode(tmp_path):
+    hub = _hub(tmp_path)
+    hub.tc_backend.get_qdiscs.return_value = [
+        Qdisc("taprio", "100:", "root", options={"flags": 2})
+    ]
+
+    assert hub.get_status("eth0")["offload_mode"] == "full-offload"
+
+
+def _reject_skip_sw(commands):
+    failures = [
+        {"line": i, "command": cmd, "stderr": "TC offload is disabled on net device"}
+        for i, cmd in enumerate(commands, start=1)
+        if " skip_sw " in cmd and " add " in cmd
+    ]
+    return {"stdout": "", "stderr": "", "returncode": 0, "failures": failures[1:]}
+
+
+def test_rejected_skip_sw_filters_fall_back_to_software(tmp_path):
+    hub = _hub(tmp_path)
+    # Only the second rule is rejected: both move to software
+    hub.tc_backend.run_batch.side_effect = _reject_skip_sw
+    talkers = {
+        f"s{i}": [
+            {
+                "interface_name": "eth0",
+                "destination_ip": f"10.0.0.{i}",
+                "vlan_id": 10 + i,
+                "vlan_priority": 3,
+            }
+        ]
+        for i in range(2)
+    }
+    rules = compile_filters(talkers, hw_offload=["eth0"])
+    desired = desired_from_commands([], [r.command() for r in rules])["eth0"]
+
+    plan, errors = hub._apply_interface(desired, None, False, False)
+
+    assert errors == {}
+    fallback = hub.tc_backend.run_batch.call_args.args[0]
+    assert fallback[0].startswith("tc filter del dev eth0 egress protocol ip pref 1")
+    assert not any("skip_sw" in cmd for cmd in fallback)
+    assert sorted(plan.record.filters.values()) == [1, 2]
+    assert not any("skip_sw" in rule for rule in plan.record.filters)
+    assert plan.record.filter_offload_fallback
+    assert hub._no_filter_offload == {"eth0"}
+
+
+def test_status_reports_filter_offload(tmp_path):
+    hub = _hub(tmp_path)
+    hub.tc_backend.get_filters.return_value = [
+        TCFilter("flower", 1, "ip", 1, options={"in_hw": True}),
+        TCFilter("flower", 2, "ip", 1, chain=1, options={"not_in_hw": True}),
+    ]
+
+    assert hub.get_status("eth0")["filter_offload"] == (
+        "chain 0 pref 1: in_hw\nchain 1 pref 2: not_in_hw"
+    )
+
+
+def test_clsact_only_reset_on_link_resetting_nic_does_not_wait(tmp_path):
+    """Only offload changes bounce the I226 link; clsact alone settles at once."""
+    hub = _hub(tmp_path)
+    hub._settle_timeouts = {"eth0": 5.0}
+    hub._device_classes["eth0"] = IntelI226
+    hub.tc_backend.get_qdiscs.side_effect = [
+        [Qdisc("mq", "0:", "root"), Qdisc("clsact", "ffff:", "ffff:fff1")],
+        [Qdisc("mq", "0:", "root")],
+    ]
+    hub.tc_backend.execute_teardown.return_value = {"failures": []}
+
+    started = time.monotonic()
+    with patch(
+        "time_config_hub.core.link_state", return_value=LinkState(True, 3)
+    ), patch("tsn_config_parser.tc_settle.link_has_carrier", return_value=True):
+        assert hub._reset_interface("eth0") == []
+
+    assert time.monotonic() - started < 1.0
+
+
+def test_only_root_taprio_and_offload_changes_reset_the_link():
+    taprio = "tc qdisc replace dev eth0 parent root handle 100 taprio num_tc 4"
+    offloaded = InterfaceState(
+        "eth0", [Qdisc("taprio", "100:", "root", options={"flags": "0x2"})]
+    )
+
+    assert not _resets_offload(offloaded, ["tc qdisc add dev eth0 clsact"])
+    assert not _resets_offload(offloaded, [f"{taprio} flags 0x2"])
+    assert _resets_offload(offloaded, [f"{taprio} flags 0x1"])
+    assert _resets_offload(offloaded, ["tc qdisc del dev eth0 root"])
+    assert _resets_offload(InterfaceState("eth0"), [f"{taprio} flags 0x2"])
@@ -0,0 +1,52 @@
+import threading
+from unittest.mock import MagicMock
+
+import pytest
+
+from time_config_hub.core import TIMEConfigHub
+from time_config_hub.exceptions import TCCommandError
+from time_config_hub.scheduler import InterfaceScheduler
+from tsn_config_parser.tc_backend import Qdisc
+
+
+def test_interfaces_run_concurrently():
+    """Every job must be running at the same time to pass the barrier."""
+    barrier = threading.Barrier(3, timeout=2)
+    scheduler = InterfaceScheduler(max_workers=3)
+
+    outcomes = scheduler.run({f"eth{i}": barrier.wait for i in range(3)})
+
+    assert all(o.ok for o in outcomes.values())
+    assert list(outcomes) == ["eth0", "eth1", "eth2"]
+
+
+def test_failures_are_collected_per_interface():
+    def boom():
+        raise RuntimeError("device busy")
+
+    outcomes = InterfaceScheduler(2).run({"eth0": lambda: 1, "eth1": boom})
+
+    assert outcomes["eth0"].value == 1
+    assert not outcomes["eth1"].ok
+    assert str(outcomes["eth1"].error) == "device busy"
+
+
+def test_reset_failures_aggregated_per_interface(tmp_path):
+    hub = TIMEConfigHub(
+        {"General": {"ConfigDirectory": str(tmp_path), "TCBackend": "cli"}}
+    )
+    hub.tc_backend = MagicMock()
+    hub._settle_timeouts = {"eth0": 0.01}
+    hub.tc_backend.get_qdiscs.return_value = [Qdisc("taprio", "100:", "root")]
+    hub.tc_backend.execute_teardown.side_effect = lambda plan: {
+        "failures": [
+            {"line": 1, "command": plan[0].command, "stderr": "busy"}
+            for step in plan
+            if step.interface == "eth1"
+        ]
+    }
+
+    with pytest.raises(TCCommandError) as excinfo:
+        hub._reset_interfaces(["eth0", "eth1"])
+
+    assert excinfo.value.failures == {"eth1": ["tc qdisc del dev eth1 root: busy"]}
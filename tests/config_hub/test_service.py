@@ -0,0 +1,58 @@
+import os
+import signal
+import threading
+import time
+from unittest.mock import patch
+
+from time_config_hub.service import Service
+
+
+def _config(tmp_path, folder):
+    return {
+        "General": {
+            "ConfigDirectory": str(tmp_path / "configs"),
+            "ListeningFolder": [str(folder)],
+            "TCBackend": "cli",
+        }
+    }
+
+
+def _watched(service):
+    return sorted(w.path for w in service._watches)
+
+
+def test_sighup_reloads_watches_and_sigterm_stops(tmp_path):
+    old, new = tmp_path / "old", tmp_path / "new"
+    old.mkdir()
+    new.mkdir()
+    service = Service(_config(tmp_path, old))
+    service.start()
+    assert _watched(service) == [str(old)]
+
+    reloaded = threading.Event()
+    seen = []
+
+    def reload():
+        Service.reload(service)
+        seen.append(_watched(service))
+        reloaded.set()
+
+    def send_signals():
+        while signal.getsignal(signal.SIGHUP) != service._handle_signal:
+            time.sleep(0.001)
+        os.kill(os.getpid(), signal.SIGHUP)
+        reloaded.wait(5)
+        os.kill(os.getpid(), signal.SIGTERM)
+
+    before = signal.getsignal(signal.SIGTERM)
+    with patch(
+        "time_config_hub.service.load_app_config",
+        return_value=_config(tmp_path, new),
+    ), patch.object(service, "reload", reload):
+        threading.Thread(target=send_signals).start()
+        service.run_forever()
+
+    assert seen == [[str(new)]]
+    assert not service.observer.is_alive()
+    assert service.hub is None and service.handler is None
+    assert signal.getsignal(signal.SIGTERM) is before
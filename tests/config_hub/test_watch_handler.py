@@ -0,0 +1,19 @@
+from unittest.mock import MagicMock, patch
+
+from time_config_hub.watch_handler import WatchHandler
+
+
+def test_events_share_the_service_hub(tmp_path):
+    hub = MagicMock()
+    handler = WatchHandler({"General": {}}, hub)
+
+    with patch("time_config_hub.watch_handler.TIMEConfigHub") as hub_cls:
+        for name in ("a.xml", "b.yaml"):
+            handler._submit("modified", str(tmp_path / name))
+        assert handler.close(timeout=5)
+
+    hub_cls.assert_not_called()
+    assert sorted(c.args[1] for c in hub.file_event_handler.call_args_list) == [
+        str(tmp_path / "a.xml"),
+        str(tmp_path / "b.yaml"),
+    ]
@@ -0,0 +1,59 @@
+import pytest
+
+from tsn_config_parser import UniversalParser, XMLParser, YAMLParser
+
+XML_DOC = """<cnc-config xmlns="urn:example:cnc">
+  <domain><domain-id>{domain}</domain-id><cuc><cuc-id>A</cuc-id></cuc></domain>
+</cnc-config>
+<interfaces><interface><name>enp1s0</name></interface></interfaces>
+"""
+
+YAML_DOC = """cnc-config:
+  domain:
+    - domain-id: {domain}
+      cuc: [{{cuc-id: A}}]
+---
+interfaces: {{interface: [{{name: enp1s0}}]}}
+"""
+
+
+@pytest.mark.parametrize(
+    "suffix, template, parser_cls",
+    [(".xml", XML_DOC, XMLParser), (".yaml", YAML_DOC, YAMLParser)],
+)
+@pytest.mark.parametrize(
+    "domain, expected", [("chronos-domain", True), ("other-domain", False)]
+)
+def test_detects_chronos_domain_in_leaves(
+    tmp_path, suffix, template, parser_cls, domain, expected
+):
+    path = tmp_path / f"config{suffix}"
+    path.write_text(template.format(domain=domain))
+
+    parser = parser_cls()
+    parser.parse(str(path))
+
+    assert parser.has_chronos_domain() is expected
+
+
+def test_xml_namespace_hit(tmp_path):
+    path = tmp_path / "config.xml"
+    path.write_text('<cnc-config xmlns="urn:example:chronos-domain"/>')
+
+    uparser = UniversalParser()
+    uparser.parse(str(path))
+
+    assert uparser.has_chronos_domain()
+
+
+def test_reparse_resets_detection(tmp_path):
+    hit = tmp_path / "hit.xml"
+    hit.write_text(XML_DOC.format(domain="chronos-domain"))
+    miss = tmp_path / "miss.xml"
+    miss.write_text(XML_DOC.format(domain="other-domain"))
+
+    parser = XMLParser()
+    parser.parse(str(hit))
+    parser.parse(str(miss))
+
+    assert not parser.has_chronos_domain()
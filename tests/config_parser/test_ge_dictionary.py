@@ -0,0 +1,85 @@
+from unittest.mock import patch
+
+from tsn_config_parser.GE_dictionary import GE_Dictionary
+
+
+def _doc(n_streams):
+    streams = [
+        {
+            "stream-id": f"aa-bb-cc-dd-ee-01:00-{i:02x}",
+            "talker": {
+                "end-station-interfaces": {"mac-address": "AA-BB-CC-DD-EE-01"},
+                "interface-configuration": {
+                    "interface-list": {
+                        "interface-name": "enp1s0",
+                        "config-list": [
+                            {
+                                "ieee802-vlan-tag": {
+                                    "vlan-id": "3",
+                                    "priority-code-point": "5",
+                                }
+                            },
+                            {"time-aware-offset": str(1000 * (i + 1))},
+                        ],
+                    }
+                },
+            },
+        }
+        for i in range(n_streams)
+    ]
+    return {
+        "cnc-config": {
+            "domain": {"domain-id": "chronos-domain", "cuc": {"stream": streams}}
+        },
+        "interfaces": {
+            "interface": {
+                "name": "enp1s0",
+                "gate-parameter-table": {
+                    "admin-control-list": {
+                        "gate-control-entry": [
+                            {
+                                "operation-name": "sched:set-gate-states",
+                                "gate-states-value": "1",
+                                "time-interval-value": "500000",
+                            }
+                        ]
+                    }
+                },
+            }
+        },
+    }
+
+
+def test_getters_use_single_index():
+    ge = GE_Dictionary([_doc(200)])
+
+    with patch.object(ge, "_scan", wraps=ge._scan) as scan:
+        assert ge.get_interface_names() == ["enp1s0"]
+        assert len(ge.get_stream_ids()) == 200
+        assert len(ge.get_talker_vlan_info()) == 200
+        assert ge.get_gate_control_entries_formatted() == ["sched-entry S 01 500000"]
+        assert ge.get_time_aware_offsets_by_stream_id("aa-bb-cc-dd-ee-01:00-02") == [
+            "3000"
+        ]
+
+    assert scan.call_count == 1
+
+
+def test_talker_vlan_info_by_stream():
+    ge = GE_Dictionary([_doc(2)])
+
+    assert ge.get_talker_vlan_info_by_stream("aa-bb-cc-dd-ee-01:00-01") == [
+        "MAC: AA-BB-CC-DD-EE-01, IF: enp1s0, VLAN: 3, PCP: 5"
+    ]
+    assert ge.get_talker_vlan_info_by_stream("unknown") == [
+        "Stream ID 'unknown' not found."
+    ]
+
+
+def test_new_documents_rebuild_index():
+    ge = GE_Dictionary([_doc(1)])
+    assert len(ge.get_stream_ids()) == 1
+
+    ge.documents = [_doc(3)]
+
+    assert len(ge.get_stream_ids()) == 3
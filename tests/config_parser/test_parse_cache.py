@@ -0,0 +1,106 @@
+import os
+
+from tsn_config_parser import UniversalParser
+from tsn_config_parser.parse_cache import Fingerprint, ParseCache
+
+YAML_DOC = """cnc-config:
+  domain: {{domain-id: chronos-domain}}
+interfaces: {{interface: {{name: {name}}}}}
+"""
+
+
+def _write(path, name="enp1s0"):
+    path.write_text(YAML_DOC.format(name=name))
+    return str(path)
+
+
+def test_unchanged_file_is_not_reparsed(tmp_path):
+    path = _write(tmp_path / "config.yaml")
+    cache = ParseCache()
+
+    first = UniversalParser(cache=cache)
+    first.parse(path)
+    ge = first.get_dictionary_helper()
+
+    second = UniversalParser(cache=cache)
+    assert second.parse(path) is first.documents
+    assert second.has_chronos_domain()
+    assert second.get_dictionary_helper() is ge
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_touched_file_with_same_content_is_a_hit(tmp_path):
+    path = _write(tmp_path / "config.yaml")
+    cache = ParseCache()
+    UniversalParser(cache=cache).parse(path)
+
+    st = os.stat(path)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+    UniversalParser(cache=cache).parse(path)
+
+    assert cache.hits == 1
+
+
+def test_changed_content_is_reparsed(tmp_path):
+    path = _write(tmp_path / "config.yaml")
+    cache = ParseCache()
+    UniversalParser(cache=cache).parse(path)
+
+    _write(tmp_path / "config.yaml", name="enp2s0")
+    parser = UniversalParser(cache=cache)
+    parser.parse(path)
+
+    assert parser.get_dictionary_helper().get_interface_names() == ["enp2s0"]
+    assert cache.hits == 0
+
+
+def test_lru_eviction_by_byte_budget(tmp_path):
+    paths = [_write(tmp_path / f"config{i}.yaml") for i in range(3)]
+    cache = ParseCache(max_bytes=2 * os.path.getsize(paths[0]))
+
+    for path in paths:
+        UniversalParser(cache=cache).parse(path)
+
+    UniversalParser(cache=cache).parse(paths[0])
+    UniversalParser(cache=cache).parse(paths[2])
+
+    # config0 was least recently used when config2 was added
+    assert (cache.hits, cache.misses) == (1, 4)
+
+
+def test_file_rewritten_before_put_is_not_cached_as_new(tmp_path):
+    path = _write(tmp_path / "config.yaml")
+    cache = ParseCache()
+    fingerprint = Fingerprint(path)
+    old = UniversalParser(cache=None).parse(path)
+
+    _write(tmp_path / "config.yaml", name="enp2s0")
+    cache.put(path, fingerprint, old, True)
+    parser = UniversalParser(cache=cache)
+    parser.parse(path)
+
+    assert parser.get_dictionary_helper().get_interface_names() == ["enp2s0"]
+    assert cache.hits == 0
+
+
+def test_file_rewritten_during_parse_is_reparsed(tmp_path, monkeypatch):
+    path = _write(tmp_path / "config.yaml")
+    cache = ParseCache()
+    parser = UniversalParser(cache=cache)
+    yaml_parser = parser.parsers[".yaml"]
+    parse = yaml_parser.parse
+
+    def parse_then_rewrite(file_path):
+        documents = parse(file_path)
+        _write(tmp_path / "config.yaml", name="enp2s0")
+        return documents
+
+    monkeypatch.setattr(yaml_parser, "parse", parse_then_rewrite)
+    parser.parse(path)
+    monkeypatch.setattr(yaml_parser, "parse", parse)
+
+    second = UniversalParser(cache=cache)
+    second.parse(path)
+
+    assert second.get_dictionary_helper().get_interface_names() == ["enp2s0"]
+    assert (cache.hits, cache.misses) == (0, 2)
@@ -0,0 +1,284 @@
+import json
+import os
+import shutil
+import struct
+import subprocess
+import sys
+import uuid
+from pathlib import Path
+
+import pytest
+
+from tsn_config_parser.tc_backend import CLIBackend, NetlinkBackend, _format_handle
+from tsn_config_parser.tc_command import create_tc_qdisc_gcl_command
+from tsn_config_parser.tc_filters import FlowRule
+from tsn_config_parser.tc_netlink import (
+    RTM_NEWQDISC,
+    RTM_NEWTFILTER,
+    TC_H_EGRESS,
+    TC_H_ROOT,
+    _TCMSG,
+    NetlinkError,
+    NetlinkSocket,
+    _decode_tcmsg,
+    _pack_attr,
+)
+
+SRC_DIR = Path(__file__).resolve().parents[2] / "src"
+
+
+def _taprio_message() -> bytes:
+    """Build an RTM_NEWQDISC body for a two-entry taprio schedule."""
+    entries = b""
+    for gate_mask, interval in ((0x0F, 500000), (0x0E, 300000)):
+        entry = (
+            _pack_attr(2, struct.pack("=B", 0))
+            + _pack_attr(3, struct.pack("=I", gate_mask))
+            + _pack_attr(4, struct.pack("=I", interval))
+        )
+        entries += _pack_attr(1, entry)
+
+    options = (
+        _pack_attr(2, entries)
+        + _pack_attr(3, struct.pack("=q", 1000))
+        + _pack_attr(8, struct.pack("=q", 800000))
+        + _pack_attr(10, struct.pack("=I", 0x1))
+        + _pack_attr(11, struct.pack("=I", 200000))
+        + _pack_attr(
+            16,
+            _pack_attr(2, entries)
+            + _pack_attr(3, struct.pack("=q", 2000))
+            + _pack_attr(8, struct.pack("=q", 900000)),
+        )
+    )
+    return (
+        _TCMSG.pack(0, 3, 0x01000000, TC_H_ROOT, 0)
+        + _pack_attr(1, b"taprio\0")
+        + _pack_attr(2 | 0x8000, options)
+    )
+
+
+def test_decode_taprio_qdisc():
+    """taprio options are decoded into a structured schedule, pending ones too."""
+
+    msg = _decode_tcmsg(_taprio_message())
+
+    assert msg["kind"] == "taprio"
+    assert _format_handle(msg["handle"]) == "100:"
+    assert _format_handle(msg["parent"]) == "root"
+    assert msg["options"]["flags"] == 0x1
+    assert msg["options"]["txtime_delay"] == 200000
+    assert msg["options"]["cycle_time"] == 800000
+    assert msg["options"]["schedule"] == [
+        {"cmd": 0, "gate_mask": 0x0F, "interval": 500000},
+        {"cmd": 0, "gate_mask": 0x0E, "interval": 300000},
+    ]
+    admin = msg["options"]["admin"]
+    assert (admin["base_time"], admin["cycle_time"]) == (2000, 900000)
+    assert admin["schedule"] == msg["options"]["schedule"]
+
+
+def test_decode_etf_qdisc():
+    """etf parameters expose the offload flag."""
+
+    body = (
+        _TCMSG.pack(0, 3, 0, 0x01000001, 0)
+        + _pack_attr(1, b"etf\0")
+        + _pack_attr(2, _pack_attr(1, struct.pack("=iiI", 175000, 11, 0b110)))
+    )
+    msg = _decode_tcmsg(body)
+
+    assert _format_handle(msg["parent"]) == "100:1"
+    assert msg["options"] == {
+        "delta": 175000,
+        "clockid": 11,
+        "offload": True,
+        "deadline_mode": False,
+        "skip_sock_check": True,
+    }
+
+
+def test_cli_backend_parses_json(monkeypatch):
+    """The CLI backend returns the same structured objects from tc -j."""
+
+    outputs = {
+        "qdisc": [
+            {"kind": "taprio", "handle": "100:", "root": True, "options": {}},
+            {"kind": "clsact", "handle": "ffff:", "parent": "ffff:fff1"},
+        ],
+        "filter": [
+            {"protocol": "ip", "pref": 49152, "kind": "flower", "chain": 0},
+            {
+                "protocol": "ip",
+                "pref": 49152,
+                "kind": "flower",
+                "chain": 0,
+                "options": {"handle": 1, "not_in_hw": True},
+            },
+            {
+                "protocol": "ip",
+                "pref": 1,
+                "kind": "flower",
+                "chain": 1,
+                "options": {"handle": "0x1", "in_hw": True},
+            },
+        ],
+    }
+
+    def fake_run(argv, **kwargs):
+        return subprocess.CompletedProcess(
+            argv, 0, stdout=json.dumps(outputs[argv[2]]), stderr=""
+        )
+
+    monkeypatch.setattr("subprocess.run", fake_run)
+    backend = CLIBackend()
+
+    qdiscs = backend.get_qdiscs("eth0")
+    assert [(q.kind, q.handle, q.is_root) for q in qdiscs] == [
+        ("taprio", "100:", True),
+        ("clsact", "ffff:", False),
+    ]
+
+    filters = backend.get_filters("eth0")
+    assert [(f.handle, f.chain, f.in_hw) for f in filters] == [
+        (1, 0, False),
+        (1, 1, True),
+    ]
+
+
+class RecordingSocket(NetlinkSocket):
+    """Netlink socket recording requests instead of sending them."""
+
+    def __init__(self, fail=None):
+        super().__init__()
+        self.requests = []
+        self.fail = fail or {}
+
+    def _request(self, msg_type, flags, body):
+        self.requests.append((msg_type, body))
+        error = self.fail.get(len(self.requests))
+        if error:
+            raise NetlinkError(error, os.strerror(error))
+        return []
+
+
+def _netlink_backend(nl):
+    backend = NetlinkBackend()
+    backend._nl.close()
+    backend._nl = nl
+    return backend
+
+
+def test_netlink_backend_programs_taprio_and_flower(monkeypatch):
+    """Generated taprio and flower commands are sent as netlink requests."""
+
+    monkeypatch.setattr(
+        "tsn_config_parser.tc_backend.run_tc_batch",
+        lambda commands: pytest.fail("tc -batch was used"),
+    )
+    taprio = create_tc_qdisc_gcl_command(
+        ["lo"],
+        ["sched-entry S 0F 500000", "sched-entry S 0E 300000"],
+        base_time=1000,
+        etf_classes=[],
+        cycle_time=800000,
+    )
+    rule = FlowRule("lo", "dst_ip 10.0.0.1 ip_proto udp dst_port 5000", "", 0, True)
+    flower = rule.command() + " action goto chain 1"
+    nl = RecordingSocket()
+
+    result = _netlink_backend(nl).run_batch(taprio + [flower])
+
+    assert result["returncode"] == 0
+    (qdisc_type, qdisc), (filter_type, rule_msg) = nl.requests
+    assert (qdisc_type, filter_type) == (RTM_NEWQDISC, RTM_NEWTFILTER)
+    qdisc = _decode_tcmsg(qdisc)
+    assert (qdisc["kind"], qdisc["handle"], qdisc["parent"]) == (
+        "taprio",
+        0x01000000,
+        TC_H_ROOT,
+    )
+    assert qdisc["options"]["schedule"] == [
+        {"cmd": 0, "gate_mask": 0x0F, "interval": 500000},
+        {"cmd": 0, "gate_mask": 0x0E, "interval": 300000},
+    ]
+    assert qdisc["options"]["cycle_time"] == 800000
+    rule_msg = _decode_tcmsg(rule_msg)
+    assert (rule_msg["kind"], rule_msg["parent"]) == ("flower", TC_H_EGRESS)
+    assert rule_msg["options"]["skip_sw"] is True
+
+
+def test_netlink_backend_hands_over_to_tc(monkeypatch):
+    """Unknown commands and EPERM answers go to tc -batch, keeping lines."""
+
+    batches = []
+
+    def fake_batch(commands):
+        batches.append(commands)
+        return {
+            "stdout": "",
+            "stderr": "boom",
+            "returncode": 1,
+            "failures": [{"line": 1, "command": commands[0], "stderr": "boom"}],
+        }
+
+    monkeypatch.setattr("tsn_config_parser.tc_backend.run_tc_batch", fake_batch)
+    clsact = "tc qdisc add dev lo clsact"
+    delete = "tc qdisc del dev lo root"
+
+    _netlink_backend(RecordingSocket()).run_batch(
+        [clsact, "tc qdisc add dev lo ingress"]
+    )
+    result = _netlink_backend(RecordingSocket(fail={2: 1})).run_batch(
+        [clsact, delete, clsact]
+    )
+
+    assert batches == [[clsact, "tc qdisc add dev lo ingress"], [delete, clsact]]
+    assert result["failures"] == [{"line": 2, "command": delete, "stderr": "boom"}]
+
+
+@pytest.fixture
+def netns():
+    """Create a throw-away network namespace with ``lo`` up."""
+    if os.geteuid() != 0 or not shutil.which("ip"):
+        pytest.skip("network namespaces require root and iproute2")
+
+    name = f"tch-test-{uuid.uuid4().hex[:8]}"
+    if subprocess.run(["ip", "netns", "add", name], capture_output=True).returncode:
+        pytest.skip("cannot create network namespace")
+    subprocess.run(["ip", "netns", "exec", name, "ip", "link", "set", "lo", "up"])
+    yield name
+    subprocess.run(["ip", "netns", "del", name], capture_output=True)
+
+
+def test_netlink_backend_in_namespace(netns):
+    """Program, list and delete qdiscs over netlink on a namespaced loopback."""
+
+    script = """
+import json, subprocess
+from tsn_config_parser.tc_backend import NetlinkBackend
+b = NetlinkBackend()
+added = b.run_batch(["tc qdisc add dev lo clsact", "tc qdisc add dev lo clsact"])
+subprocess.run(["tc", "qdisc", "add", "dev", "lo", "root", "handle", "100:", "pfifo"])
+before = [(q.kind, q.handle, q.parent) for q in b.get_qdiscs("lo")]
+results = [b.delete_filters("lo"), b.delete_qdisc("lo", "clsact"),
+           b.delete_qdisc("lo", "root")]
+after = [(q.kind, q.handle) for q in b.get_qdiscs("lo")]
+print(json.dumps({"before": before, "after": after,
+                  "rc": [r["returncode"] for r in results],
+                  "failed": [f["line"] for f in added["failures"]]}))
+"""
+    proc = subprocess.run(
+        ["ip", "netns", "exec", netns, sys.executable, "-c", script],
+        capture_output=True,
+        text=True,
+        env={**os.environ, "PYTHONPATH": str(SRC_DIR)},
+    )
+    assert proc.returncode == 0, proc.stderr
+    result = json.loads(proc.stdout)
+
+    assert ["pfifo", "100:", "root"] in result["before"]
+    assert ["clsact", "ffff:", "ffff:fff1"] in result["before"]
+    assert result["rc"] == [0, 0, 0]
+    assert result["failed"] == [2]  # the second clsact already exists
+    assert result["after"] == [["noqueue", "0:"]]
@@ -0,0 +1,44 @@
+import os
+import time
+
+from tsn_config_parser.tc_basetime import (
+    CLOCK_PHC,
+    align_base_time,
+    phc_device,
+    read_clock_ns,
+)
+
+CYCLE = 1_000_000
+
+
+def test_base_time_is_next_cycle_boundary_after_lead():
+    base = align_base_time(10_250_000, CYCLE, lead=2_000_000)
+
+    assert base == 13_000_000
+    # Already on a boundary: not pushed by a full cycle
+    assert align_base_time(12_000_000, CYCLE, lead=1_000_000) == 13_000_000
+
+
+def test_reapplies_keep_the_phase():
+    phase = 300_000
+    first = align_base_time(5_123_456, CYCLE, lead=1_000_000, phase=phase)
+    later = align_base_time(987_654_321, CYCLE, lead=1_000_000, phase=phase)
+
+    assert first % CYCLE == later % CYCLE == phase
+    assert first >= 6_123_456
+
+
+def test_phc_device_from_sysfs(tmp_path):
+    os.makedirs(tmp_path / "class/net/enp1s0/device/ptp/ptp1")
+    os.makedirs(tmp_path / "class/net/lo")
+
+    assert phc_device("enp1s0", sysfs_root=str(tmp_path)) == "/dev/ptp1"
+    assert phc_device("lo", sysfs_root=str(tmp_path)) is None
+
+
+def test_missing_phc_falls_back_to_tai():
+    before = time.clock_gettime_ns(time.CLOCK_TAI)
+
+    now = read_clock_ns(CLOCK_PHC, "no-such-interface")
+
+    assert before <= now <= time.clock_gettime_ns(time.CLOCK_TAI)
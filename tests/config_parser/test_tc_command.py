@@ -6,7 +6,11 @@ from tsn_config_parser.tc_command import (
     _clsact_exists,
     create_tc_filter_commands_for_non_time_aware_talkers,
     create_tc_filter_commands_for_time_aware_talkers,
+    reset_qdisc_interface,
+    run_tc_batch,
 )
+from tsn_config_parser.tc_backend import Qdisc
+from tsn_config_parser.tc_state import InterfaceState
 
 
 @pytest.fixture
@@ -66,13 +70,16 @@ def test_clsact_exists_false(monkeypatch):
     assert _clsact_exists("enp170s0") is False
 
 
-@patch("tsn_config_parser.tc_command._clsact_exists", return_value=False)
-def test_generate_tc_filter_commands_adds_clsact(
-    mock_clsact, sample_vlan_time_aware_info
-):
-    """Ensure clsact is added when missing."""
+@patch("tsn_config_parser.tc_command.subprocess.run")
+def test_generate_tc_filter_commands_adds_clsact(mock_run, sample_vlan_time_aware_info):
+    """Ensure clsact is added when missing, without running any command."""
 
-    cmds = create_tc_filter_commands_for_time_aware_talkers(sample_vlan_time_aware_info)
+    cmds = create_tc_filter_commands_for_time_aware_talkers(
+        sample_vlan_time_aware_info,
+        {"enp170s0": InterfaceState("enp170s0")},
+    )
+
+    mock_run.assert_not_called()
 
     # Should contain two clsact commands (one per interface)
     clsact_cmds = [c for c in cmds if "clsact" in c]
@@ -86,13 +93,16 @@ def test_generate_tc_filter_commands_adds_clsact(
     assert any("enp170s0" in c for c in cmds)
 
 
-@patch("tsn_config_parser.tc_command._clsact_exists", return_value=True)
-def test_generate_tc_filter_commands_skips_clsact(
-    mock_clsact, sample_vlan_time_aware_info
-):
-    """Ensure clsact is not added if it already exists."""
+def test_generate_tc_filter_commands_skips_clsact(sample_vlan_time_aware_info):
+    """Ensure clsact is not added if the snapshot shows one."""
+    states = {
+        iface: InterfaceState(iface, qdiscs=[Qdisc("clsact", "ffff:", "ffff:fff1")])
+        for iface in ("enp170s0", "enp170s1")
+    }
 
-    cmds = create_tc_filter_commands_for_time_aware_talkers(sample_vlan_time_aware_info)
+    cmds = create_tc_filter_commands_for_time_aware_talkers(
+        sample_vlan_time_aware_info, states
+    )
 
     # No clsact commands should be generated
     assert not any("clsact" in c for c in cmds)
@@ -191,3 +201,76 @@ def test_non_time_aware_vlan_handles_missing_fields():
     # Ensure it doesn't include empty fields
     assert "src_mac None" not in cmd
     assert "dst_mac None" not in cmd
+
+
+def test_run_tc_batch_single_process_and_line_numbers(monkeypatch):
+    """All commands go through one tc -batch process; failures keep line numbers."""
+
+    mock_run = MagicMock()
+    mock_run.return_value.returncode = 1
+    mock_run.return_value.stdout = ""
+    mock_run.return_value.stderr = (
+        'Cannot find device "eth9"\nCommand failed -:2\n'
+        "Error: Exclusivity flag on, cannot modify.\n"
+        "We have an error talking to the kernel\nCommand failed -:3\n"
+    )
+    monkeypatch.setattr("subprocess.run", mock_run)
+
+    cmds = [
+        "tc qdisc add dev eth0 clsact",
+        "tc qdisc add dev eth9 clsact",
+        "tc filter add dev eth0 egress protocol ip flower action pass",
+    ]
+    result = run_tc_batch(cmds)
+
+    mock_run.assert_called_once()
+    argv = mock_run.call_args.args[0]
+    assert argv[-3:] == ["-force", "-batch", "-"]
+    assert mock_run.call_args.kwargs["input"] == (
+        "qdisc add dev eth0 clsact\n"
+        "qdisc add dev eth9 clsact\n"
+        "filter add dev eth0 egress protocol ip flower action pass\n"
+    )
+
+    assert [f["line"] for f in result["failures"]] == [2, 3]
+    assert result["failures"][0]["command"] == cmds[1]
+    assert result["failures"][0]["stderr"] == 'Cannot find device "eth9"'
+    assert "talking to the kernel" in result["failures"][1]["stderr"]
+
+
+def test_run_tc_batch_empty_does_not_spawn(monkeypatch):
+    """An empty batch must not start a tc process."""
+
+    mock_run = MagicMock()
+    monkeypatch.setattr("subprocess.run", mock_run)
+
+    assert run_tc_batch([])["failures"] == []
+    mock_run.assert_not_called()
+
+
+def test_reset_reads_the_root_again_when_qdiscs_could_not_be_shown(monkeypatch):
+    """A failed qdisc listing is retried for the root step, not a NameError."""
+    shown = iter([RuntimeError("tc busy"), {"stdout": "qdisc taprio 100: root"}])
+
+    def show_qdisc(interface):
+        answer = next(shown)
+        if isinstance(answer, Exception):
+            raise answer
+        return answer
+
+    commands = []
+    ok = {"stdout": "", "stderr": "", "returncode": 0}
+    monkeypatch.setattr(
+        "tsn_config_parser.tc_command.show_tc_egress_filters", lambda i: {}
+    )
+    monkeypatch.setattr("tsn_config_parser.tc_command.show_qdisc", show_qdisc)
+    monkeypatch.setattr(
+        "tsn_config_parser.tc_command.run_tc_command",
+        lambda cmd: commands.append(cmd) or ok,
+    )
+
+    results = reset_qdisc_interface("eth0")
+
+    assert results["clsact"]["stderr"] == "tc busy"
+    assert results["root"] == ok
+    assert commands == ["tc qdisc del dev eth0 root"]
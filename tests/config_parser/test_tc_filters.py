@@ -0,0 +1,107 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from tsn_config_parser.tc_filters import ChainAllocator, compile_filters
+from tsn_config_parser.tc_reconcile import desired_from_commands, plan_reconcile
+from tsn_config_parser.tc_state import InterfaceState
+
+
+def _talker(dst_ip, vlan_id=10, pcp=3, interface="enp1s0"):
+    return {
+        "interface_name": interface,
+        "destination_ip": dst_ip,
+        "vlan_id": vlan_id,
+        "vlan_priority": pcp,
+    }
+
+
+def test_talkers_sharing_a_tag_share_an_action_chain():
+    rules = compile_filters(
+        {
+            "s1": [_talker("10.0.0.1")],
+            "s2": [_talker("10.0.0.2")],
+            "s3": [_talker("10.0.0.3", vlan_id=20, pcp=2)],
+        }
+    )
+
+    assert [r.command() for r in rules] == [
+        "tc filter add dev enp1s0 egress chain 1 protocol ip flower "
+        "action vlan push id 10 protocol 802.1Q priority 3 pipe "
+        "action skbedit priority 3",
+        "tc filter add dev enp1s0 egress protocol ip flower dst_ip 10.0.0.1 "
+        "action goto chain 1",
+        "tc filter add dev enp1s0 egress protocol ip flower dst_ip 10.0.0.2 "
+        "action goto chain 1",
+        "tc filter add dev enp1s0 egress protocol ip flower dst_ip 10.0.0.3 "
+        "action vlan push id 20 protocol 802.1Q priority 2 pipe "
+        "action skbedit priority 2",
+    ]
+
+
+def test_duplicate_matches_are_dropped():
+    time_aware = {"s1": [_talker("10.0.0.1")]}
+    non_time_aware = {"s2": [_talker("10.0.0.1"), _talker("10.0.0.1", vlan_id=30)]}
+
+    rules = compile_filters(time_aware, non_time_aware)
+
+    assert len(rules) == 1
+    assert "push id 10 " in rules[0].actions
+
+
+def test_chain_numbers_do_not_depend_on_stream_order():
+    streams = {
+        "a": [_talker("10.0.0.1", vlan_id=20)],
+        "b": [_talker("10.0.0.2", vlan_id=20)],
+        "c": [_talker("10.0.0.3", vlan_id=10)],
+        "d": [_talker("10.0.0.4", vlan_id=10)],
+        "e": [_talker("10.0.0.5", vlan_id=10, interface="enp2s0")],
+        "f": [_talker("10.0.0.6", vlan_id=10, interface="enp2s0")],
+    }
+    chains = {(r.interface, r.match): r.actions for r in compile_filters(streams)}
+    reversed_chains = {
+        (r.interface, r.match): r.actions
+        for r in compile_filters(dict(reversed(list(streams.items()))))
+    }
+
+    assert chains == reversed_chains
+    assert chains[("enp1s0", "dst_ip 10.0.0.3")] == "action goto chain 1"
+    assert chains[("enp2s0", "dst_ip 10.0.0.5")] == "action goto chain 1"
+
+
+def test_reconcile_programs_chain_rules():
+    rules = compile_filters({"s1": [_talker("10.0.0.1"), _talker("10.0.0.2")]})
+    desired = desired_from_commands([], [r.command() for r in rules])["enp1s0"]
+
+    plan = plan_reconcile(desired, InterfaceState("enp1s0"))
+
+    assert plan.filter_commands[0].startswith(
+        "tc filter add dev enp1s0 egress chain 1 protocol ip pref 1 handle 0x1 "
+        "flower action vlan push"
+    )
+    assert plan.filter_commands[1].endswith("dst_ip 10.0.0.1 action goto chain 1")
+
+
+def test_allocator_numbers_chains_per_interface():
+    allocator = ChainAllocator()
+
+    assert allocator.allocate("enp1s0", (10, 3)) == 1
+    assert allocator.allocate("enp1s0", (20, 2)) == 2
+    assert allocator.allocate("enp1s0", (10, 3)) == 1
+    assert allocator.allocate("enp2s0", (20, 2)) == 1
+    assert allocator.chains("enp1s0") == {(10, 3): 1, (20, 2): 2}
+
+
+def test_compilation_is_reentrant():
+    streams = {
+        f"s{i}": [_talker(f"10.0.{i % 4}.{i}", vlan_id=10 + i % 3, pcp=i % 2)]
+        for i in range(40)
+    }
+    expected = [r.command() for r in compile_filters(streams)]
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        results = list(
+            pool.map(
+                lambda _: [r.command() for r in compile_filters(streams)], range(32)
+            )
+        )
+
+    assert all(result == expected for result in results)
@@ -0,0 +1,140 @@
+import pytest
+
+from tsn_config_parser.GE_dictionary import GE_Dictionary
+from tsn_config_parser.tc_command import create_tc_qdisc_gcl_command
+from tsn_config_parser.tc_gcl import GCLError, GCLLimits, compile_gcl
+
+
+def _entry(mask, interval, op="sched:set-gate-states"):
+    return {
+        "operation-name": op,
+        "gate-states-value": str(mask),
+        "time-interval-value": str(interval),
+    }
+
+
+def test_adjacent_identical_entries_are_merged():
+    schedule = compile_gcl(
+        [_entry(8, 100000), _entry(8, 200000), _entry(4, 300000), _entry(8, 400000)]
+    )
+
+    assert schedule.sched_entries == [
+        "sched-entry S 08 300000",
+        "sched-entry S 04 300000",
+        "sched-entry S 08 400000",
+    ]
+    assert schedule.merged == 1
+    assert schedule.cycle_time == 1000000
+
+
+def test_entries_are_not_merged_past_the_interval_limit():
+    # A long closed gate split into entries of supported-interval-max
+    limits = GCLLimits(max_interval=1048568)
+    schedule = compile_gcl(
+        [_entry(1, 100000)]
+        + [_entry(0, 1048568)] * 9
+        + [_entry(2, 600000), _entry(2, 400000)],
+        limits=limits,
+    )
+
+    assert schedule.sched_entries == (
+        ["sched-entry S 01 100000"]
+        + ["sched-entry S 00 1048568"] * 9
+        + ["sched-entry S 02 1000000"]
+    )
+    assert schedule.merged == 1
+    schedule.validate(limits)
+
+
+@pytest.mark.parametrize(
+    "entry",
+    [
+        _entry(8, 100000, op="sched:unknown"),
+        _entry(8, 0),
+        _entry(256, 100000),
+        _entry("x", 100000),
+    ],
+)
+def test_malformed_entries_are_rejected(entry):
+    with pytest.raises(GCLError):
+        compile_gcl([_entry(1, 100000), entry])
+
+
+def test_cycle_time_must_cover_the_entries():
+    with pytest.raises(GCLError):
+        compile_gcl([_entry(1, 600000), _entry(2, 600000)], cycle_time=1000000)
+
+
+def test_validate_against_limits():
+    schedule = compile_gcl([_entry(1, 500), _entry(2, 500000)])
+
+    schedule.validate(GCLLimits(max_entries=2, min_interval=500))
+    with pytest.raises(GCLError, match="at most 1"):
+        schedule.validate(GCLLimits(max_entries=1))
+    with pytest.raises(GCLError, match="shorter than"):
+        schedule.validate(GCLLimits(min_interval=1000))
+    assert GCLLimits(max_entries=4, min_interval=100).merge(
+        GCLLimits(max_entries=8, min_interval=1000)
+    ) == GCLLimits(max_entries=4, min_interval=1000)
+
+
+def test_schedule_from_gate_parameter_table():
+    ge = GE_Dictionary(
+        [
+            {
+                "interfaces": {
+                    "interface": {
+                        "name": "enp1s0",
+                        "gate-parameter-table": {
+                            "admin-control-list": {
+                                "gate-control-entry": [
+                                    _entry(1, 500000),
+                                    _entry(2, 500000),
+                                ]
+                            },
+                            "admin-cycle-time": {
+                                "numerator": "2",
+                                "denominator": "1000",
+                            },
+                            "admin-cycle-time-extension": "10000",
+                            "supported-list-max": "256",
+                        },
+                    }
+                }
+            }
+        ]
+    )
+    schedule = ge.get_gate_schedule()
+
+    assert schedule.cycle_time == 2000000
+    assert ge.get_gcl_limits().max_entries == 256
+    cmd = create_tc_qdisc_gcl_command(
+        ["enp1s0"], schedule.sched_entries, base_time=0, **schedule.command_args()
+    )[0]
+    assert "cycle-time 2000000 cycle-time-extension 10000" in cmd
+
+
+def test_split_entries_of_a_gate_parameter_table_stay_valid():
+    ge = GE_Dictionary(
+        [
+            {
+                "interfaces": {
+                    "interface": {
+                        "name": "enp1s0",
+                        "gate-parameter-table": {
+                            "admin-control-list": {
+                                "gate-control-entry": (
+                                    [_entry(1, 100000)] + [_entry(0, 1048568)] * 9
+                                )
+                            },
+                            "supported-interval-max": "1048568",
+                        },
+                    }
+                }
+            }
+        ]
+    )
+    schedule = ge.get_gate_schedule()
+
+    assert len(schedule.entries) == 10
+    schedule.validate(ge.get_gcl_limits())
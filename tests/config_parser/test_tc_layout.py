@@ -0,0 +1,53 @@
+import pytest
+
+from tsn_config_parser.tc_command import create_tc_qdisc_gcl_command
+from tsn_config_parser.tc_layout import (
+    DEFAULT_CAPABILITIES,
+    MODE_FULL_OFFLOAD,
+    MODE_TXTIME_ASSIST,
+    LayoutError,
+    OffloadCapabilities,
+    plan_qdisc_layout,
+)
+
+GCL = ["sched-entry S 0F 500000", "sched-entry S 01 500000"]
+
+
+def test_default_capabilities_keep_historical_template():
+    layout = plan_qdisc_layout(DEFAULT_CAPABILITIES, GCL)
+    args = dict(
+        num_tc=4,
+        map_str="0 0 0 0 1 1 2 3 0 0 0 0 0 0 0 0",
+        queues_str="1@0 1@1 1@2 1@3",
+    )
+
+    assert layout.mode == MODE_TXTIME_ASSIST
+    assert create_tc_qdisc_gcl_command(
+        ["eth0"], GCL, base_time=0, **layout.command_args()
+    ) == create_tc_qdisc_gcl_command(["eth0"], GCL, base_time=0, **args)
+
+
+def test_full_offload_uses_every_queue_and_launch_time_queues():
+    caps = OffloadCapabilities(
+        num_tx_queues=8,
+        taprio_full_offload=True,
+        etf_offload=True,
+        launch_time_queues=(0, 1),
+    )
+    layout = plan_qdisc_layout(caps, GCL)
+    cmds = create_tc_qdisc_gcl_command(["eth0"], GCL, **layout.command_args())
+
+    assert layout.mode == MODE_FULL_OFFLOAD
+    assert layout.map_str.startswith("0 1 2 3 4 5 6 7 0")
+    assert "flags 0x2" in cmds[0] and "txtime-delay" not in cmds[0]
+    assert [c.split()[6] for c in cmds[1:]] == ["100:1", "100:2"]
+
+
+def test_refuses_what_the_nic_cannot_offload():
+    no_launch_time = OffloadCapabilities(num_tx_queues=4, etf_offload=False)
+    with pytest.raises(LayoutError):
+        plan_qdisc_layout(no_launch_time, GCL)
+
+    two_queues = OffloadCapabilities(num_tx_queues=2, taprio_full_offload=True)
+    with pytest.raises(LayoutError):
+        plan_qdisc_layout(two_queues, GCL)
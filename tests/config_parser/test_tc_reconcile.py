@@ -0,0 +1,240 @@
+from tsn_config_parser.tc_backend import Qdisc, TCFilter
+from tsn_config_parser.tc_reconcile import (
+    AppliedRecord,
+    desired_from_commands,
+    plan_reconcile,
+    plan_software_filters,
+)
+from tsn_config_parser.tc_state import InterfaceState
+
+TAPRIO = (
+    "tc qdisc replace dev enp1s0 parent root handle 100 taprio num_tc 4 "
+    "map 0 0 0 0 1 1 2 3 0 0 0 0 0 0 0 0 queues 1@0 1@1 1@2 1@3 "
+    "base-time {base} sched-entry S 01 {t0} sched-entry S 02 {t1} "
+    "flags 0x1 txtime-delay 500000 clockid CLOCK_TAI"
+)
+ETF = (
+    "tc qdisc replace dev enp1s0 parent 100:1 etf clockid CLOCK_TAI "
+    "delta 500000 offload"
+)
+RULE_A = (
+    "tc filter add dev enp1s0 egress protocol ip flower dst_ip 10.0.0.1 "
+    "action skbedit priority 3"
+)
+VLAN_CHAIN = (
+    "tc filter add dev enp1s0 egress chain 1 protocol ip flower skip_sw "
+    "action vlan push id {vid} action skbedit priority 3"
+)
+JUMPER = (
+    "tc filter add dev enp1s0 egress protocol ip flower skip_sw dst_ip 10.0.0.1 "
+    "action goto chain 1"
+)
+RULE_B = (
+    "tc filter add dev enp1s0 egress protocol ip flower dst_ip 10.0.0.2 "
+    "action skbedit priority 2"
+)
+
+
+def _desired(t0=300000, t1=700000, base=1000, filters=(RULE_A,)):
+    qdiscs = [TAPRIO.format(base=base, t0=t0, t1=t1), ETF]
+    return desired_from_commands(
+        qdiscs, ["tc qdisc add dev enp1s0 clsact"] + list(filters)
+    )["enp1s0"]
+
+
+def _taprio_options(t0=300000, t1=700000):
+    """Options of the installed taprio, as printed by ``tc -j qdisc show``."""
+    return {
+        "base_time": 1000,
+        "cycle_time": t0 + t1,
+        "cycle_time_extension": 0,
+        "schedule": [
+            {"index": 0, "cmd": "S", "gatemask": "0x1", "interval": t0},
+            {"index": 1, "cmd": "S", "gatemask": "0x2", "interval": t1},
+        ],
+    }
+
+
+def _installed(filters=1, taprio=None):
+    return InterfaceState(
+        "enp1s0",
+        qdiscs=[
+            Qdisc(
+                "taprio",
+                "100:",
+                "root",
+                _taprio_options() if taprio is None else taprio,
+            ),
+            Qdisc("etf", "8001:", "100:1"),
+            Qdisc("clsact", "ffff:", "ffff:fff1"),
+        ],
+        filters=[TCFilter("flower", p, "ip", 1) for p in range(1, filters + 1)],
+    )
+
+
+def _applied(desired):
+    """Record as stored after a successful first apply."""
+    return plan_reconcile(desired, InterfaceState("enp1s0")).record
+
+
+def test_first_apply_programs_everything():
+    desired = _desired()
+    plan = plan_reconcile(desired, InterfaceState("enp1s0"))
+
+    assert plan.qdisc_commands == desired.qdisc_commands + [
+        "tc qdisc add dev enp1s0 clsact"
+    ]
+    assert plan.filter_commands == [
+        "tc filter add dev enp1s0 egress protocol ip pref 1 handle 0x1 flower "
+        "dst_ip 10.0.0.1 action skbedit priority 3"
+    ]
+    assert plan.record.filters == {"ip dst_ip 10.0.0.1 action skbedit priority 3": 1}
+
+
+def test_unchanged_config_is_empty_plan():
+    """A new base-time alone does not cause any change."""
+    record = _applied(_desired())
+
+    plan = plan_reconcile(_desired(base=2000), _installed(), record)
+
+    assert plan.is_empty
+
+
+def test_gcl_change_replaces_taprio_only():
+    record = _applied(_desired())
+    desired = _desired(t0=400000, t1=600000)
+
+    plan = plan_reconcile(desired, _installed(), record)
+
+    assert plan.qdisc_commands == [desired.taprio_command]
+    assert plan.filter_commands == []
+
+
+def test_schedule_is_compared_with_the_live_one():
+    """A schedule changed behind our back is reprogrammed, despite the record."""
+    desired = _desired()
+    record = _applied(desired)
+
+    drifted = plan_reconcile(desired, _installed(taprio=_taprio_options(t0=1)), record)
+    unreadable = plan_reconcile(desired, _installed(taprio={}), record)
+
+    assert drifted.qdisc_commands == [desired.taprio_command]
+    assert unreadable.qdisc_commands == [desired.taprio_command]
+
+
+def test_pending_admin_schedule_supersedes_the_operational_one():
+    """A replaced schedule waiting for its base-time is already installed."""
+    desired = _desired(t0=400000, t1=600000)
+    pending = dict(_taprio_options(), admin=_taprio_options(400000, 600000))
+    netlink = {
+        "cycle_time": 1000000,
+        "schedule": [
+            {"cmd": 0, "gate_mask": 1, "interval": 400000},
+            {"cmd": 0, "gate_mask": 2, "interval": 600000},
+        ],
+    }
+
+    for options in (pending, netlink):
+        plan = plan_reconcile(desired, _installed(taprio=options), _applied(desired))
+        assert plan.is_empty
+
+
+def test_layout_change_rebuilds_qdisc_tree():
+    record = _applied(_desired())
+    desired = _desired()
+    desired.qdisc_commands[1] = desired.qdisc_commands[1].replace("500000", "400000")
+
+    plan = plan_reconcile(desired, _installed(), record)
+
+    assert plan.qdisc_commands == ["tc qdisc del dev enp1s0 root"] + (
+        desired.qdisc_commands
+    )
+
+
+def test_filters_added_and_deleted_by_pref():
+    record = _applied(_desired())
+
+    plan = plan_reconcile(_desired(filters=(RULE_B,)), _installed(), record)
+
+    assert plan.qdisc_commands == []
+    assert plan.filter_commands == [
+        "tc filter del dev enp1s0 egress protocol ip pref 1 handle 0x1 flower",
+        "tc filter add dev enp1s0 egress protocol ip pref 1 handle 0x1 flower "
+        "dst_ip 10.0.0.2 action skbedit priority 2",
+    ]
+
+
+def _steps(commands):
+    """``(action, pref)`` of filter commands."""
+    return [(c.split()[2], int(c.split(" pref ")[1].split()[0])) for c in commands]
+
+
+def test_chain_rules_outlive_the_rules_jumping_to_them():
+    """Jumpers are deleted first and old chain rules once replaced."""
+    record = _applied(_desired(filters=(VLAN_CHAIN.format(vid=10), JUMPER)))
+    installed = _installed(filters=2)
+
+    replaced = plan_reconcile(
+        _desired(filters=(VLAN_CHAIN.format(vid=20), JUMPER)), installed, record
+    )
+    removed = plan_reconcile(_desired(filters=()), installed, record)
+
+    # The new chain rule takes a free pref, the jumper is kept
+    assert _steps(replaced.filter_commands) == [("add", 3), ("del", 1)]
+    assert removed.filter_commands == [
+        "tc filter del dev enp1s0 egress protocol ip pref 2 handle 0x1 flower",
+        "tc filter del dev enp1s0 egress chain 1 protocol ip pref 1 handle 0x1 "
+        "flower",
+    ]
+
+
+def test_software_filters_replace_chains_while_nothing_jumps():
+    record = _applied(_desired(filters=(VLAN_CHAIN.format(vid=10), JUMPER)))
+
+    commands, software = plan_software_filters("enp1s0", record.filters, [])
+
+    assert _steps(commands) == [("del", 2), ("del", 1), ("add", 1), ("add", 2)]
+    assert not any("skip_sw" in rule for rule in software)
+
+
+def test_inserted_rule_keeps_the_desired_precedence():
+    """Prefs follow the rule order, like a first apply, so rules after an
+    inserted one are added again behind it."""
+    rule_c = RULE_B.replace("10.0.0.2", "10.0.0.3")
+    record = _applied(_desired(filters=(RULE_A, RULE_B)))
+    desired = _desired(filters=(RULE_A, rule_c, RULE_B))
+
+    plan = plan_reconcile(desired, _installed(filters=2), record)
+
+    assert _steps(plan.filter_commands) == [("del", 2), ("add", 3), ("add", 4)]
+    assert "10.0.0.3" in plan.filter_commands[1]
+    prefs = [plan.record.filters[rule] for rule in desired.filter_rules]
+    assert prefs == sorted(prefs) == [1, 3, 4]
+
+
+def test_unknown_filters_rebuild_clsact():
+    """Filters not in the record are foreign: clsact is recreated."""
+    record = _applied(_desired())
+
+    plan = plan_reconcile(_desired(), _installed(filters=2), record)
+
+    assert plan.qdisc_commands == [
+        "tc qdisc del dev enp1s0 clsact",
+        "tc qdisc add dev enp1s0 clsact",
+    ]
+    assert len(plan.filter_commands) == 1
+
+
+def test_missing_record_reprograms_interface():
+    desired = _desired()
+
+    plan = plan_reconcile(desired, _installed(), None)
+
+    assert plan.qdisc_commands[0] == "tc qdisc del dev enp1s0 root"
+    assert "tc qdisc del dev enp1s0 clsact" in plan.qdisc_commands
+
+
+def test_record_round_trip():
+    record = _applied(_desired())
+
+    assert AppliedRecord.from_dict(record.to_dict()) == record
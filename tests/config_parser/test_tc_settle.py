@@ -0,0 +1,70 @@
+from unittest.mock import patch
+
+from tsn_config_parser.tc_settle import (
+    LinkReset,
+    LinkState,
+    link_settled,
+    wait_for_settle,
+)
+
+
+def test_wait_for_settle_returns_immediately_when_settled():
+    """No time is spent when the probe already reports a settled interface."""
+
+    waited = wait_for_settle(lambda: True, timeout=5.0)
+    assert waited < 0.5
+
+
+def test_wait_for_settle_polls_until_probe_succeeds():
+    """The wait ends on the first successful probe, not at the timeout."""
+
+    answers = iter([False, False, True])
+    waited = wait_for_settle(lambda: next(answers), timeout=5.0, poll_interval=0.001)
+    assert waited < 0.5
+
+
+def test_wait_for_settle_is_bounded():
+    """A probe that never succeeds (or raises) is bounded by the timeout."""
+
+    def probe():
+        raise OSError("device busy")
+
+    waited = wait_for_settle(probe, timeout=0.05, poll_interval=0.01)
+    assert 0.05 <= waited < 0.5
+
+
+@patch("tsn_config_parser.tc_settle.link_has_carrier", return_value=False)
+def test_link_settled_waits_for_carrier(mock_carrier):
+    """Links that were up must regain carrier; links that were down do not wait."""
+
+    assert link_settled("eth0", had_carrier=True) is False
+    assert link_settled("eth0", had_carrier=False) is True
+    assert link_settled("eth0", had_carrier=None) is True
+
+
+def test_link_reset_waits_for_the_link_to_go_down_first():
+    """A carrier still up right after the change is not settled yet."""
+
+    states = iter(
+        [
+            LinkState(True, 4),  # reset not started
+            LinkState(False, 5),  # link dropped
+            LinkState(True, 6),  # back up
+        ]
+    )
+    probe = LinkReset("eth0", LinkState(True, 4))
+
+    with patch("tsn_config_parser.tc_settle.link_state", lambda _: next(states)):
+        assert [probe(), probe(), probe()] == [False, False, True]
+
+
+def test_link_reset_sees_a_bounce_between_polls():
+    """A down/up shorter than a poll shows as a carrier_changes bump."""
+
+    probe = LinkReset("eth0", LinkState(True, 4))
+
+    with patch(
+        "tsn_config_parser.tc_settle.link_state", return_value=LinkState(True, 6)
+    ):
+        assert probe() is True
+    assert LinkReset("eth0", LinkState(False, 4))() is True
@@ -0,0 +1,63 @@
+from unittest.mock import MagicMock
+
+from tsn_config_parser.tc_backend import Qdisc, TCFilter
+from tsn_config_parser.tc_state import (
+    InterfaceState,
+    TeardownStep,
+    plan_interface_reset,
+    snapshot_interface,
+)
+
+
+def _configured_state():
+    return InterfaceState(
+        "enp1s0",
+        qdiscs=[
+            Qdisc("taprio", "100:", "root"),
+            Qdisc("etf", "8001:", "100:1"),
+            Qdisc("clsact", "ffff:", "ffff:fff1"),
+        ],
+        filters=[TCFilter("flower", 49152, "ip", 1)],
+    )
+
+
+def test_plan_reset_configured_interface():
+    """clsact (with its filters) goes first, then the root qdisc."""
+
+    plan = plan_interface_reset(_configured_state())
+
+    assert plan == [TeardownStep("enp1s0", "clsact"), TeardownStep("enp1s0", "root")]
+    assert [s.command for s in plan] == [
+        "tc qdisc del dev enp1s0 clsact",
+        "tc qdisc del dev enp1s0 root",
+    ]
+
+
+def test_plan_reset_default_interface_is_empty():
+    """Default root qdiscs cannot be deleted and need no teardown."""
+
+    state = InterfaceState("enp1s0", qdiscs=[Qdisc("mq", "0:", "root")])
+
+    assert state.is_reset
+    assert plan_interface_reset(state) == []
+
+
+def test_snapshot_reads_filters_only_with_clsact():
+    """Filters are only dumped when a clsact qdisc can hold them."""
+
+    backend = MagicMock()
+    backend.get_qdiscs.return_value = [Qdisc("mq", "0:", "root")]
+
+    state = snapshot_interface(backend, "enp1s0")
+
+    backend.get_qdiscs.assert_called_once_with("enp1s0")
+    backend.get_filters.assert_not_called()
+    assert state.filters == []
+
+    backend.get_qdiscs.return_value = _configured_state().qdiscs
+    backend.get_filters.return_value = _configured_state().filters
+
+    state = snapshot_interface(backend, "enp1s0")
+
+    backend.get_filters.assert_called_once_with("enp1s0")
+    assert len(state.filters) == 1
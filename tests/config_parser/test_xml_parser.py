@@ -0,0 +1,54 @@
+import xml.etree.ElementTree as ET
+
+import pytest
+
+from tsn_config_parser import xml_parser
+from tsn_config_parser.xml_parser import XMLParser
+
+CONTENT = """<?xml version="1.0" encoding="UTF-8"?>
+<cnc-config xmlns="urn:example:cnc">
+  <domain>
+    <domain-id>chronos-domain</domain-id>
+    <stream><stream-id>s1</stream-id></stream>
+    <stream><stream-id kind="vlan">s2</stream-id></stream>
+    <empty/>
+  </domain>
+</cnc-config>
+<interfaces><interface><name>enp1s0</name></interface></interfaces>
+"""
+
+
+def test_streaming_matches_tree_mode(tmp_path, monkeypatch):
+    path = tmp_path / "config.xml"
+    path.write_text(CONTENT)
+    # Tiny chunks: elements and text are split across feeds
+    monkeypatch.setattr(xml_parser, "READ_CHUNK_SIZE", 7)
+
+    streaming = XMLParser()
+    tree = XMLParser(streaming=False)
+
+    assert streaming.parse(str(path)) == tree.parse(str(path))
+    assert streaming.documents == [
+        {
+            "cnc-config": {
+                "domain": {
+                    "domain-id": "chronos-domain",
+                    "stream": [
+                        {"stream-id": "s1"},
+                        {"stream-id": {"@kind": "vlan", "#text": "s2"}},
+                    ],
+                    "empty": None,
+                }
+            }
+        },
+        {"interfaces": {"interface": {"name": "enp1s0"}}},
+    ]
+    assert streaming.has_chronos_domain()
+
+
+def test_streaming_reports_malformed_xml(tmp_path):
+    path = tmp_path / "broken.xml"
+    path.write_text("<cnc-config><domain></cnc-config>")
+
+    with pytest.raises(ET.ParseError):
+        XMLParser().parse(str(path))